@@ -2,7 +2,10 @@
 Custom authentication backends.
 """
 
+from apps.authentication.cache import principal_cache
+from apps.authentication.revocation import revocation_table
 from apps.platforms.models import Platform, UserPlatform
+from django.conf import settings
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
 
@@ -25,24 +28,66 @@ class PlatformJWTAuthentication(JWTAuthentication):
         """
         Returns the user_platform instance based on the token.
         Ensures Django user-like attributes are set.
+        Active principals are served from the in-process principal cache and
+        loaded with a single query on a miss.
         """
         try:
             user_id = validated_token["user_id"]
             platform_id = validated_token["platform_id"]
+        except KeyError as e:
+            raise AuthenticationFailed("Invalid token or user not found") from e
+
+        if getattr(settings, "AUTH_TRUSTED_CLAIMS", False) and "iat" in validated_token:
+            return self.get_principal_from_claims(validated_token)
 
-            platform = Platform.objects.get(id=platform_id, is_active=True)
+        user_platform = principal_cache.get(user_id, platform_id)
+        if user_platform is not None:
+            return user_platform
 
-            user_platform = UserPlatform.objects.get(
+        generation = principal_cache.generation
+        try:
+            user_platform = UserPlatform.objects.select_related("platform").get(
                 id=user_id,
-                platform=platform,
+                platform_id=platform_id,
                 is_active=True,
+                platform__is_active=True,
             )
+        except UserPlatform.DoesNotExist as e:
+            raise AuthenticationFailed("Invalid token or user not found") from e
 
-            if not hasattr(user_platform, "is_authenticated"):
-                user_platform.is_authenticated = True
-            if not hasattr(user_platform, "is_anonymous"):
-                user_platform.is_anonymous = False
+        if not hasattr(user_platform, "is_authenticated"):
+            user_platform.is_authenticated = True
+        if not hasattr(user_platform, "is_anonymous"):
+            user_platform.is_anonymous = False
 
-            return user_platform
-        except (Platform.DoesNotExist, UserPlatform.DoesNotExist, KeyError) as e:
-            raise AuthenticationFailed("Invalid token or user not found") from e
+        principal_cache.set(user_id, platform_id, user_platform, generation=generation)
+        return user_platform
+
+    def get_principal_from_claims(self, validated_token):
+        """
+        Builds the user_platform straight from the token claims, without a
+        database lookup. Revocation is checked against the in-memory epoch table.
+        Only the id, email, platform id and platform name of the principal are
+        populated; the platform's other fields are deferred. Device writes
+        read unique_device_ips from the platform row, not from the principal.
+        """
+        user_id = validated_token["user_id"]
+        platform_id = validated_token["platform_id"]
+
+        if revocation_table.is_revoked(user_id, platform_id, validated_token["iat"]):
+            raise AuthenticationFailed("Token has been revoked")
+
+        platform = Platform.from_db(
+            "default",
+            ["id", "name", "is_active"],
+            [platform_id, validated_token.get("platform_name", ""), True],
+        )
+        user_platform = UserPlatform(
+            id=user_id,
+            email=validated_token.get("email", ""),
+            platform=platform,
+            is_active=True,
+        )
+        user_platform._state.adding = False
+        user_platform._state.db = "default"
+        return user_platform
@@ -0,0 +1,133 @@
+"""
+In-process cache for authenticated principals.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class PrincipalCache:
+    """
+    TTL + LRU cache of UserPlatform instances keyed by (user_id, platform_id).
+
+    The cache lives in the memory of each worker process. Local invalidation is
+    driven by model signals (see apps.authentication.signals); the TTL bounds how
+    long another process may keep serving a stale principal.
+    """
+
+    def __init__(self, ttl=None, max_size=None):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, "AUTH_PRINCIPAL_CACHE_TTL", 60)
+
+    @property
+    def max_size(self):
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, "AUTH_PRINCIPAL_CACHE_MAX_SIZE", 10000)
+
+    @property
+    def generation(self):
+        """
+        Counter bumped on every invalidation.
+        Read it before loading a principal and pass it to set() so that a load
+        racing with an invalidation is not cached.
+        """
+        return self._generation
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_size > 0
+
+    def get(self, user_id, platform_id):
+        """
+        Return a copy of the cached principal, or None on miss/expiry.
+        """
+        key = (user_id, platform_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Views may mutate the principal; never hand out the shared instance.
+        return copy.copy(principal)
+
+    def set(self, user_id, platform_id, principal, generation=None):
+        """
+        Store a principal, evicting the least recently used entries if needed.
+        """
+        if not self.enabled:
+            return
+        key = (user_id, platform_id)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, copy.copy(principal))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id):
+        """
+        Drop every entry belonging to the given UserPlatform id.
+        """
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def invalidate_platform(self, platform_id):
+        """
+        Drop every entry belonging to the given Platform id.
+        """
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if key[1] == platform_id]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Drop all entries and reset the counters.
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Return hit/miss counters and the current size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,194 @@
+"""
+Bounded worker pool for password hashing.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+
+class HashingUnavailable(APIException):
+    """
+    Raised when the hashing pool cannot admit more work.
+    """
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Servicio de autenticación saturado, intente de nuevo más tarde."
+    default_code = "hashing_unavailable"
+
+    def __init__(self, wait=None, detail=None, code=None):
+        super().__init__(detail, code)
+        self.wait = wait
+
+
+def _init_worker(settings_module):
+    """
+    Configure Django in a freshly spawned worker process.
+    """
+    if settings_module:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+
+    django.setup()
+
+
+class HashingPool:
+    """
+    Size-limited process pool running PBKDF2 outside the request workers.
+
+    At most `max_pending` hashes may be queued or running at once; further
+    requests fail fast with HashingUnavailable (503 + Retry-After) instead of
+    piling up behind a login burst. With `workers` set to 0 the hashes run in
+    the calling thread, still subject to admission control.
+    """
+
+    def __init__(self, workers=None, max_pending=None):
+        self._workers = workers
+        self._max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    @property
+    def workers(self):
+        if self._workers is not None:
+            return self._workers
+        return getattr(settings, "AUTH_HASHING_WORKERS", 2)
+
+    @property
+    def max_pending(self):
+        if self._max_pending is not None:
+            return self._max_pending
+        return getattr(settings, "AUTH_HASHING_MAX_PENDING", 16)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(os.environ.get("DJANGO_SETTINGS_MODULE"),),
+                )
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, func, *args):
+        """
+        Run a hashing function in the pool and wait for its result.
+
+        A hash stays pending until it finishes, even after its caller gave
+        up waiting for it, so admission control sees the real pool load.
+        """
+        retry_after = getattr(settings, "AUTH_HASHING_RETRY_AFTER", 1)
+        with self._lock:
+            admitted = self.pending < self.max_pending
+            if admitted:
+                self.pending += 1
+            else:
+                self.rejected += 1
+        if not admitted:
+            logger.warning("Hashing pool full, rejecting request (pending=%s)", self.pending)
+            raise HashingUnavailable(wait=retry_after)
+
+        started = time.monotonic()
+        if self.workers <= 0:
+            try:
+                return func(*args)
+            finally:
+                self._finish(started, completed=True)
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BrokenProcessPool as e:
+            self._finish(started, completed=False)
+            logger.exception("Hashing pool broken, restarting it")
+            self._reset_executor()
+            raise HashingUnavailable(wait=retry_after) from e
+        future.add_done_callback(
+            lambda done: self._finish(
+                started, completed=not done.cancelled() and done.exception() is None
+            )
+        )
+        try:
+            return future.result(timeout=getattr(settings, "AUTH_HASHING_TIMEOUT", 10))
+        except FutureTimeoutError as e:
+            with self._lock:
+                self.timed_out += 1
+            raise HashingUnavailable(wait=retry_after) from e
+        except BrokenProcessPool as e:
+            logger.exception("Hashing pool broken, restarting it")
+            self._reset_executor()
+            raise HashingUnavailable(wait=retry_after) from e
+
+    def _finish(self, started, completed):
+        """
+        Release the admission slot of a hash that finished or never started.
+        """
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.pending -= 1
+            if completed:
+                self.completed += 1
+                self.latency_total += elapsed
+                self.latency_max = max(self.latency_max, elapsed)
+
+    def check_password(self, password, encoded):
+        """
+        Check a raw password against an encoded one in the pool.
+        """
+        return self.run(hashers.check_password, password, encoded)
+
+    def make_password(self, password):
+        """
+        Hash a raw password in the pool.
+        """
+        return self.run(hashers.make_password, password)
+
+    def stats(self):
+        """
+        Return queue depth and hash latency metrics.
+        """
+        with self._lock:
+            return {
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "latency_avg": self.latency_total / self.completed if self.completed else 0.0,
+                "latency_max": self.latency_max,
+            }
+
+    def shutdown(self):
+        """
+        Stop the worker processes.
+        """
+        self._reset_executor()
+
+
+hashing_pool = HashingPool()
+atexit.register(hashing_pool.shutdown)
@@ -0,0 +1,128 @@
+"""
+Write-behind recorder for UserPlatform.last_login.
+"""
+
+import atexit
+import logging
+import threading
+
+from apps.platforms.models import UserPlatform
+from django.conf import settings
+from django.db import DatabaseError, connection, models
+from django.db.models import Case, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginRecorder:
+    """
+    Buffers last_login timestamps in memory and writes them in batches.
+
+    Logins only touch a dict; a background thread flushes the buffer every
+    flush interval with one UPDATE per batch of users. Repeated logins of the
+    same user between flushes coalesce into a single row update. The buffer is
+    also flushed at interpreter shutdown. A flush interval of 0 disables the
+    buffering and writes each login immediately.
+    """
+
+    def __init__(self, flush_interval=None, batch_size=None):
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, "AUTH_LAST_LOGIN_FLUSH_INTERVAL", 5)
+
+    @property
+    def batch_size(self):
+        if self._batch_size is not None:
+            return self._batch_size
+        return getattr(settings, "AUTH_LAST_LOGIN_BATCH_SIZE", 500)
+
+    def record(self, user_id, when=None):
+        """
+        Record a login of the given UserPlatform id.
+        """
+        when = when or timezone.now()
+        if self.flush_interval <= 0:
+            UserPlatform.objects.filter(pk=user_id).update(last_login=when)
+            return
+
+        self._merge({user_id: when})
+        self._ensure_thread()
+
+    def _merge(self, entries):
+        with self._lock:
+            for user_id, when in entries.items():
+                current = self._pending.get(user_id)
+                if current is None or when > current:
+                    self._pending[user_id] = when
+
+    def flush(self):
+        """
+        Write the buffered timestamps. Returns the number of users written.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        items = list(pending.items())
+        written = 0
+        try:
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start : start + self.batch_size]
+                UserPlatform.objects.filter(pk__in=[user_id for user_id, _ in batch]).update(
+                    last_login=Case(
+                        *[When(pk=user_id, then=Value(when)) for user_id, when in batch],
+                        output_field=models.DateTimeField(),
+                    )
+                )
+                written += len(batch)
+        except DatabaseError:
+            logger.exception("Could not flush last_login updates, retrying later")
+            self._merge(dict(items[written:]))
+        return written
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="last-login-recorder", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Unexpected error flushing last_login updates")
+            finally:
+                connection.close()
+
+    def stop(self):
+        """
+        Stop the background thread and flush what is left in the buffer.
+        """
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+        self.flush()
+
+
+last_login_recorder = LastLoginRecorder()
+atexit.register(last_login_recorder.stop)
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="RevocationEpoch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[("user", "Usuario de Plataforma"), ("platform", "Plataforma")],
+                        max_length=10,
+                        verbose_name="Ámbito",
+                    ),
+                ),
+                ("subject_id", models.BigIntegerField(verbose_name="ID del sujeto")),
+                ("epoch", models.BigIntegerField(verbose_name="Época de revocación")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización"),
+                ),
+            ],
+            options={
+                "verbose_name": "Época de revocación",
+                "verbose_name_plural": "Épocas de revocación",
+                "indexes": [models.Index(fields=["epoch"], name="authenticat_epoch_063407_idx")],
+                "unique_together": {("scope", "subject_id")},
+            },
+        ),
+    ]
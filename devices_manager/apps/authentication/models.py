@@ -0,0 +1,35 @@
+"""
+Authentication models.
+"""
+
+from django.db import models
+
+
+class RevocationEpoch(models.Model):
+    """
+    Revocation epoch of a UserPlatform or a Platform.
+    Tokens issued before the epoch are rejected in trusted claims mode.
+    """
+
+    SCOPE_USER = "user"
+    SCOPE_PLATFORM = "platform"
+    SCOPE_CHOICES = [
+        (SCOPE_USER, "Usuario de Plataforma"),
+        (SCOPE_PLATFORM, "Plataforma"),
+    ]
+
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES, verbose_name="Ámbito")
+    subject_id = models.BigIntegerField(verbose_name="ID del sujeto")
+    epoch = models.BigIntegerField(verbose_name="Época de revocación")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
+
+    class Meta:
+        verbose_name = "Época de revocación"
+        verbose_name_plural = "Épocas de revocación"
+        unique_together = [["scope", "subject_id"]]
+        indexes = [
+            models.Index(fields=["epoch"]),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.subject_id} @ {self.epoch}"
@@ -0,0 +1,99 @@
+"""
+Revocation epochs for trusted claims authentication.
+"""
+
+import threading
+import time
+
+from apps.authentication.models import RevocationEpoch
+from django.conf import settings
+
+
+class RevocationTable:
+    """
+    In-memory copy of the RevocationEpoch table.
+
+    The table is reloaded at most once per refresh interval, so revocations
+    issued by other processes propagate within that bounded window. Only
+    epochs younger than the access token lifetime are kept: older epochs
+    cannot affect a token that is still valid.
+    """
+
+    def __init__(self, refresh_interval=None):
+        self._refresh_interval = refresh_interval
+        self._epochs = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def refresh_interval(self):
+        if self._refresh_interval is not None:
+            return self._refresh_interval
+        return getattr(settings, "AUTH_REVOCATION_REFRESH_INTERVAL", 30)
+
+    def horizon(self):
+        """
+        Return the oldest epoch that can still revoke a live token.
+        """
+        lifetime = settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"]
+        return int(time.time() - lifetime.total_seconds())
+
+    def refresh(self):
+        """
+        Reload the epochs from the database.
+        """
+        rows = RevocationEpoch.objects.filter(epoch__gte=self.horizon()).values_list(
+            "scope", "subject_id", "epoch"
+        )
+        epochs = {(scope, subject_id): epoch for scope, subject_id, epoch in rows}
+        self._epochs = epochs
+        self._loaded_at = time.monotonic()
+
+    def _refresh_if_stale(self):
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at < self.refresh_interval:
+            return
+        # Only one thread reloads; the others keep using the current copy.
+        if not self._lock.acquire(blocking=loaded_at is None):
+            return
+        try:
+            if self._loaded_at is loaded_at:
+                self.refresh()
+        finally:
+            self._lock.release()
+
+    def is_revoked(self, user_id, platform_id, issued_at):
+        """
+        Return True if a token issued at `issued_at` has been revoked.
+        """
+        self._refresh_if_stale()
+        epochs = self._epochs
+        epoch = max(
+            epochs.get((RevocationEpoch.SCOPE_USER, user_id), 0),
+            epochs.get((RevocationEpoch.SCOPE_PLATFORM, platform_id), 0),
+        )
+        return issued_at < epoch
+
+    def revoke(self, scope, subject_id):
+        """
+        Revoke every token of a subject issued up to now.
+        """
+        # Tokens carry whole-second iat claims; round up so that a token issued
+        # earlier within the current second is revoked as well.
+        epoch = int(time.time()) + 1
+        RevocationEpoch.objects.update_or_create(
+            scope=scope, subject_id=subject_id, defaults={"epoch": epoch}
+        )
+        epochs = dict(self._epochs)
+        epochs[(scope, subject_id)] = epoch
+        self._epochs = epochs
+
+    def clear(self):
+        """
+        Forget the local copy; the next lookup reloads it.
+        """
+        self._epochs = {}
+        self._loaded_at = None
+
+
+revocation_table = RevocationTable()
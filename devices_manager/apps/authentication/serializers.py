@@ -2,6 +2,8 @@
 Authentication serializers.
 """
 
+from apps.authentication.hashing import hashing_pool
+from apps.authentication.last_login import last_login_recorder
 from apps.platforms.models import Platform, UserPlatform
 from django.contrib.auth.password_validation import validate_password
 from django.utils import timezone
@@ -76,8 +78,6 @@ class RegisterSerializer(serializers.Serializer):
         """
         Create a new UserPlatform instance.
         """
-        from django.contrib.auth.hashers import make_password
-
         email = validated_data["email"]
         password = validated_data["password"]
         platform_id = validated_data["platform_id"]
@@ -92,7 +92,7 @@ class RegisterSerializer(serializers.Serializer):
         user_platform = UserPlatform.objects.create(
             email=email,
             platform=platform,
-            password=make_password(password),
+            password=hashing_pool.make_password(password),
             is_active=True,
         )
 
@@ -135,13 +135,11 @@ class PlatformTokenObtainPairSerializer(serializers.Serializer):
                 {"email": "Credenciales inválidas o usuario inactivo."}
             )
 
-        from django.contrib.auth.hashers import check_password
-
-        if not check_password(password, user_platform.password):
+        if not hashing_pool.check_password(password, user_platform.password):
             raise serializers.ValidationError({"password": "Credenciales inválidas."})
 
         user_platform.last_login = timezone.now()
-        user_platform.save(update_fields=["last_login"])
+        last_login_recorder.record(user_platform.id, user_platform.last_login)
 
         from rest_framework_simplejwt.tokens import RefreshToken
 
@@ -149,11 +147,13 @@ class PlatformTokenObtainPairSerializer(serializers.Serializer):
         refresh["user_id"] = user_platform.id
         refresh["platform_id"] = platform_id
         refresh["email"] = user_platform.email
+        refresh["platform_name"] = platform.name
 
         access = refresh.access_token
         access["user_id"] = user_platform.id
         access["platform_id"] = platform_id
         access["email"] = user_platform.email
+        access["platform_name"] = platform.name
 
         data = {
             "refresh": str(refresh),
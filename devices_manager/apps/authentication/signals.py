@@ -0,0 +1,60 @@
+"""
+Signal handlers keeping authentication caches consistent.
+"""
+
+from apps.authentication.cache import principal_cache
+from apps.authentication.models import RevocationEpoch
+from apps.authentication.revocation import revocation_table
+from apps.platforms.models import Platform, UserPlatform
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver([post_save, post_delete], sender=UserPlatform)
+def invalidate_user_platform(sender, instance, **kwargs):
+    """
+    Evict a UserPlatform from the principal cache when it changes.
+    """
+    principal_cache.invalidate_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Platform)
+def invalidate_platform(sender, instance, **kwargs):
+    """
+    Evict every principal of a Platform when the platform changes.
+    """
+    principal_cache.invalidate_platform(instance.pk)
+
+
+@receiver(post_save, sender=UserPlatform)
+def revoke_inactive_user_platform(sender, instance, created, **kwargs):
+    """
+    Revoke the tokens of a deactivated UserPlatform.
+    """
+    if not created and not instance.is_active:
+        revocation_table.revoke(RevocationEpoch.SCOPE_USER, instance.pk)
+
+
+@receiver(post_save, sender=Platform)
+def revoke_inactive_platform(sender, instance, created, **kwargs):
+    """
+    Revoke the tokens of every user of a deactivated Platform.
+    """
+    if not created and not instance.is_active:
+        revocation_table.revoke(RevocationEpoch.SCOPE_PLATFORM, instance.pk)
+
+
+@receiver(post_delete, sender=UserPlatform)
+def revoke_deleted_user_platform(sender, instance, **kwargs):
+    """
+    Revoke the tokens of a deleted UserPlatform.
+    """
+    revocation_table.revoke(RevocationEpoch.SCOPE_USER, instance.pk)
+
+
+@receiver(post_delete, sender=Platform)
+def revoke_deleted_platform(sender, instance, **kwargs):
+    """
+    Revoke the tokens of every user of a deleted Platform.
+    """
+    revocation_table.revoke(RevocationEpoch.SCOPE_PLATFORM, instance.pk)
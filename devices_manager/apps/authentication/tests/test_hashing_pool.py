@@ -0,0 +1,129 @@
+"""
+Unit tests for the password hashing pool.
+"""
+
+import time
+
+from apps.authentication.hashing import HashingPool, HashingUnavailable
+from apps.platforms.models import Platform, UserPlatform
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class HashingPoolTest(TestCase):
+    """
+    Test HashingPool admission control and metrics.
+    """
+
+    def test_inline_roundtrip(self):
+        """
+        Test hashing in the calling thread.
+        """
+        pool = HashingPool(workers=0, max_pending=1)
+        encoded = pool.make_password("secreto123")
+
+        self.assertTrue(pool.check_password("secreto123", encoded))
+        self.assertFalse(pool.check_password("otro", encoded))
+        self.assertEqual(pool.stats()["completed"], 3)
+        self.assertEqual(pool.stats()["pending"], 0)
+
+    def test_process_roundtrip(self):
+        """
+        Test hashing in a worker process.
+        """
+        pool = HashingPool(workers=1, max_pending=1)
+        try:
+            encoded = pool.make_password("secreto123")
+            self.assertTrue(pool.check_password("secreto123", encoded))
+        finally:
+            pool.shutdown()
+
+    @override_settings(AUTH_HASHING_TIMEOUT=0.2)
+    def test_timed_out_hash_stays_pending(self):
+        """
+        Test that a hash its caller stopped waiting for keeps its slot until
+        it finishes and is counted as timed out, not completed.
+        """
+        pool = HashingPool(workers=1, max_pending=1)
+        try:
+            with self.assertRaises(HashingUnavailable):
+                pool.run(time.sleep, 2)
+            stats = pool.stats()
+            self.assertEqual((stats["pending"], stats["timed_out"]), (1, 1))
+            self.assertEqual(stats["completed"], 0)
+
+            with self.assertRaises(HashingUnavailable):
+                pool.make_password("secreto123")
+            self.assertEqual(pool.stats()["rejected"], 1)
+
+            deadline = time.monotonic() + 30
+            while pool.stats()["pending"] and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertEqual(pool.stats()["pending"], 0)
+            self.assertEqual(pool.stats()["completed"], 1)
+        finally:
+            pool.shutdown()
+
+    def test_full_pool_rejects(self):
+        """
+        Test that work beyond max_pending fails fast.
+        """
+        pool = HashingPool(workers=0, max_pending=0)
+
+        with self.assertRaises(HashingUnavailable) as context:
+            pool.make_password("secreto123")
+
+        self.assertEqual(context.exception.wait, 1)
+        self.assertEqual(pool.stats()["rejected"], 1)
+
+
+@override_settings(AUTH_HASHING_WORKERS=0, AUTH_HASHING_MAX_PENDING=0)
+class HashingPoolEndpointTest(TestCase):
+    """
+    Test login and register when the hashing pool is saturated.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password=make_password("testpass123"),
+            is_active=True,
+        )
+
+    def test_login_returns_503_with_retry_after(self):
+        """
+        Test that login fails fast while the pool is full.
+        """
+        data = {
+            "email": "test@example.com",
+            "password": "testpass123",
+            "platform_id": self.platform.id,
+        }
+
+        response = self.client.post("/api/auth/login/", data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_register_returns_503_with_retry_after(self):
+        """
+        Test that registration fails fast while the pool is full.
+        """
+        data = {
+            "email": "nuevo@example.com",
+            "password": "Clave-segura-123",
+            "platform_id": self.platform.id,
+        }
+
+        response = self.client.post("/api/auth/register/", data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(UserPlatform.objects.filter(email="nuevo@example.com").exists())
@@ -0,0 +1,103 @@
+"""
+Unit tests for the last_login write-behind recorder.
+"""
+
+from datetime import timedelta
+
+from apps.authentication.last_login import LastLoginRecorder
+from apps.platforms.models import Platform, UserPlatform
+from django.test import TestCase
+from django.utils import timezone
+
+
+class LastLoginRecorderTest(TestCase):
+    """
+    Test LastLoginRecorder buffering and flushing.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.users = [
+            UserPlatform.objects.create(
+                email=f"user{i}@example.com",
+                platform=self.platform,
+                password="hashed_password",
+            )
+            for i in range(3)
+        ]
+        self.recorder = LastLoginRecorder(flush_interval=3600)
+
+    def tearDown(self):
+        self.recorder.stop()
+
+    def test_logins_are_buffered_until_flush(self):
+        """
+        Test that recording a login does not write to the database.
+        """
+        with self.assertNumQueries(0):
+            self.recorder.record(self.users[0].id)
+
+        self.users[0].refresh_from_db()
+        self.assertIsNone(self.users[0].last_login)
+
+    def test_flush_writes_batch_in_one_update(self):
+        """
+        Test that a flush issues a single UPDATE for all buffered users.
+        """
+        now = timezone.now()
+        for offset, user in enumerate(self.users):
+            self.recorder.record(user.id, now + timedelta(seconds=offset))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.recorder.flush(), 3)
+
+        for offset, user in enumerate(self.users):
+            user.refresh_from_db()
+            self.assertEqual(user.last_login, now + timedelta(seconds=offset))
+
+    def test_repeated_logins_coalesce(self):
+        """
+        Test that only the latest login per user is written.
+        """
+        now = timezone.now()
+        self.recorder.record(self.users[0].id, now)
+        self.recorder.record(self.users[0].id, now + timedelta(seconds=5))
+        self.recorder.record(self.users[0].id, now + timedelta(seconds=1))
+
+        self.assertEqual(self.recorder.flush(), 1)
+        self.users[0].refresh_from_db()
+        self.assertEqual(self.users[0].last_login, now + timedelta(seconds=5))
+
+    def test_batches_are_split(self):
+        """
+        Test that large buffers are written in several statements.
+        """
+        recorder = LastLoginRecorder(flush_interval=3600, batch_size=2)
+        for user in self.users:
+            recorder._merge({user.id: timezone.now()})
+
+        with self.assertNumQueries(2):
+            recorder.flush()
+
+    def test_stop_flushes_pending(self):
+        """
+        Test that stopping the recorder writes what is left in the buffer.
+        """
+        self.recorder.record(self.users[0].id)
+        self.recorder.stop()
+
+        self.users[0].refresh_from_db()
+        self.assertIsNotNone(self.users[0].last_login)
+
+    def test_zero_interval_writes_immediately(self):
+        """
+        Test that a flush interval of 0 disables buffering.
+        """
+        recorder = LastLoginRecorder(flush_interval=0)
+        recorder.record(self.users[0].id)
+
+        self.users[0].refresh_from_db()
+        self.assertIsNotNone(self.users[0].last_login)
@@ -0,0 +1,139 @@
+"""
+Unit tests for the authenticated principal cache.
+"""
+
+from unittest.mock import patch
+
+from apps.authentication.backends import PlatformJWTAuthentication
+from apps.authentication.cache import PrincipalCache, principal_cache
+from apps.platforms.models import Platform, UserPlatform
+from django.test import TestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class PrincipalCacheTest(TestCase):
+    """
+    Test PrincipalCache eviction, expiry and counters.
+    """
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used entry is evicted first.
+        """
+        cache = PrincipalCache(ttl=60, max_size=2)
+        cache.set(1, 1, "a")
+        cache.set(2, 1, "b")
+        cache.get(1, 1)
+        cache.set(3, 1, "c")
+
+        self.assertEqual(cache.get(1, 1), "a")
+        self.assertIsNone(cache.get(2, 1))
+        self.assertEqual(cache.get(3, 1), "c")
+
+    def test_ttl_expiry(self):
+        """
+        Test that expired entries are treated as misses.
+        """
+        cache = PrincipalCache(ttl=10, max_size=10)
+        with patch("apps.authentication.cache.time.monotonic", return_value=100.0):
+            cache.set(1, 1, "a")
+        with patch("apps.authentication.cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get(1, 1))
+
+    def test_stale_generation_is_not_stored(self):
+        """
+        Test that a load racing with an invalidation is discarded.
+        """
+        cache = PrincipalCache(ttl=60, max_size=10)
+        generation = cache.generation
+        cache.invalidate_user(1)
+        cache.set(1, 1, "a", generation=generation)
+
+        self.assertIsNone(cache.get(1, 1))
+
+    def test_stats(self):
+        """
+        Test hit/miss counters.
+        """
+        cache = PrincipalCache(ttl=60, max_size=10)
+        cache.get(1, 1)
+        cache.set(1, 1, "a")
+        cache.get(1, 1)
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["size"], 1)
+
+
+class PlatformJWTAuthenticationCacheTest(TestCase):
+    """
+    Test PlatformJWTAuthentication with the principal cache.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        principal_cache.clear()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.token = AccessToken()
+        self.token["user_id"] = self.user_platform.id
+        self.token["platform_id"] = self.platform.id
+        self.authentication = PlatformJWTAuthentication()
+
+    def tearDown(self):
+        principal_cache.clear()
+
+    def test_second_lookup_is_served_from_cache(self):
+        """
+        Test that repeated authentication does not hit the database.
+        """
+        with self.assertNumQueries(1):
+            first = self.authentication.get_user(self.token)
+        with self.assertNumQueries(0):
+            second = self.authentication.get_user(self.token)
+
+        self.assertEqual(first, self.user_platform)
+        self.assertEqual(second, self.user_platform)
+        self.assertEqual(second.platform, self.platform)
+        self.assertIsNot(first, second)
+
+    def test_deactivated_user_is_rejected_immediately(self):
+        """
+        Test that deactivating a user invalidates the cached principal.
+        """
+        self.authentication.get_user(self.token)
+        self.user_platform.is_active = False
+        self.user_platform.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
+
+    def test_deactivated_platform_is_rejected_immediately(self):
+        """
+        Test that deactivating a platform invalidates its cached principals.
+        """
+        self.authentication.get_user(self.token)
+        self.platform.is_active = False
+        self.platform.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
+
+    def test_deleted_user_is_rejected_immediately(self):
+        """
+        Test that deleting a user invalidates the cached principal.
+        """
+        self.authentication.get_user(self.token)
+        self.user_platform.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
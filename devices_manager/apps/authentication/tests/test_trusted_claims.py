@@ -0,0 +1,164 @@
+"""
+Unit tests for trusted claims authentication.
+"""
+
+import time
+
+from apps.authentication.backends import PlatformJWTAuthentication
+from apps.authentication.models import RevocationEpoch
+from apps.authentication.revocation import revocation_table
+from apps.devices.ip_conflicts import DUPLICATE_IP_ERROR, set_unique_device_ips
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@override_settings(AUTH_TRUSTED_CLAIMS=True)
+class TrustedClaimsAuthenticationTest(TestCase):
+    """
+    Test PlatformJWTAuthentication in trusted claims mode.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        revocation_table.clear()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.token = self.make_token()
+        self.authentication = PlatformJWTAuthentication()
+
+    def tearDown(self):
+        revocation_table.clear()
+
+    def make_token(self, iat=None):
+        token = AccessToken()
+        token["user_id"] = self.user_platform.id
+        token["platform_id"] = self.platform.id
+        token["email"] = self.user_platform.email
+        if iat is not None:
+            token["iat"] = iat
+        return token
+
+    def test_principal_is_built_from_claims(self):
+        """
+        Test that the principal needs no query once the epoch table is loaded.
+        """
+        revocation_table.refresh()
+        with self.assertNumQueries(0):
+            user_platform = self.authentication.get_user(self.token)
+
+        self.assertIsInstance(user_platform, UserPlatform)
+        self.assertEqual(user_platform.pk, self.user_platform.pk)
+        self.assertEqual(user_platform.email, "test@example.com")
+        self.assertEqual(user_platform.platform_id, self.platform.pk)
+        self.assertTrue(user_platform.is_authenticated)
+
+    def test_local_deactivation_revokes_immediately(self):
+        """
+        Test that deactivating a user in this process revokes its tokens.
+        """
+        self.user_platform.is_active = False
+        self.user_platform.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
+
+    def test_platform_deactivation_revokes_immediately(self):
+        """
+        Test that deactivating a platform revokes the tokens of its users.
+        """
+        self.platform.is_active = False
+        self.platform.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
+
+    def test_remote_revocation_propagates_after_refresh(self):
+        """
+        Test that epochs written by another process apply after a refresh.
+        """
+        revocation_table.refresh()
+        RevocationEpoch.objects.create(
+            scope=RevocationEpoch.SCOPE_USER,
+            subject_id=self.user_platform.pk,
+            epoch=int(time.time()) + 1,
+        )
+        self.authentication.get_user(self.token)
+
+        revocation_table.refresh()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
+
+    def test_token_issued_after_epoch_is_accepted(self):
+        """
+        Test that tokens issued after a revocation remain valid.
+        """
+        self.user_platform.is_active = False
+        self.user_platform.save()
+        epoch = RevocationEpoch.objects.get(subject_id=self.user_platform.pk).epoch
+
+        user_platform = self.authentication.get_user(self.make_token(iat=epoch))
+
+        self.assertEqual(user_platform.pk, self.user_platform.pk)
+
+    def test_device_list_with_trusted_principal(self):
+        """
+        Test that the device endpoints work with a claims-only principal.
+        """
+        Device.objects.create(
+            name="Dispositivo 1", ip_address="192.168.1.1", user_platform=self.user_platform
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+        response = client.get("/api/devices/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_create_with_trusted_principal(self):
+        """
+        Test that creating a device with a claims-only principal stays within
+        the endpoint's query budget.
+        """
+        set_unique_device_ips(self.platform)
+        revocation_table.refresh()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+        response = client.post(
+            "/api/devices/", {"name": "Router", "ip_address": "192.168.1.1"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Device.objects.get(pk=response.data["id"]).ip_unique)
+
+    def test_unique_ips_with_trusted_principal(self):
+        """
+        Test that a claims-only principal reads unique_device_ips from the database.
+        """
+        Device.objects.create(
+            name="Dispositivo 1", ip_address="192.168.1.1", user_platform=self.user_platform
+        )
+        set_unique_device_ips(self.platform)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+        response = client.post(
+            "/api/devices/", {"name": "Copia", "ip_address": "192.168.1.1"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["ip_address"], [DUPLICATE_IP_ERROR])
@@ -0,0 +1,111 @@
+"""
+Sparse fieldsets: ?fields= and ?omit= for read endpoints.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer mixin accepting `fields` (fields to keep) and `omit` (fields
+    to drop) keyword arguments.
+    """
+
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+
+class SparseFieldsetMixin:
+    """
+    View mixin reading ?fields=id,name and ?omit=created_at on safe methods.
+
+    The serializer only renders the selected fields, and prune_queryset()
+    restricts the query to the columns behind them with only(), keeping
+    select_related() joins only for relations a selected field goes through.
+    """
+
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+
+    def get_sparse_fieldset(self):
+        """
+        Return the validated (fields, omit) lists of the request, or None for
+        parameters that were not given.
+        """
+        if hasattr(self, "_sparse_fieldset"):
+            return self._sparse_fieldset
+
+        fields = omit = None
+        request = getattr(self, "request", None)
+        if request is not None and request.method in SAFE_METHODS:
+            available = set(self.get_serializer_class()().fields)
+            fields = self._parse_fieldset(request, self.fields_query_param, available)
+            omit = self._parse_fieldset(request, self.omit_query_param, available)
+        self._sparse_fieldset = (fields, omit)
+        return self._sparse_fieldset
+
+    def _parse_fieldset(self, request, param, available):
+        value = request.query_params.get(param)
+        if value is None:
+            return None
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError({param: [f"Campos no válidos: {', '.join(unknown)}."]})
+        return names
+
+    def get_serializer(self, *args, **kwargs):
+        fields, omit = self.get_sparse_fieldset()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        if omit is not None:
+            kwargs.setdefault("omit", omit)
+        return super().get_serializer(*args, **kwargs)
+
+    def prune_queryset(self, queryset, extra=()):
+        """
+        Restrict a queryset to the columns rendered by the sparse serializer,
+        plus `extra` model fields. Returned unchanged when no fieldset was
+        requested or a field is not backed by a model column. Relations the
+        queryset attaches from known instances (for_user_platform()) are
+        never joined.
+        """
+        if self.get_sparse_fieldset() == (None, None):
+            return queryset
+
+        model = queryset.model
+        # Known related objects are attached by foreign key value, so their
+        # columns are always fetched.
+        known = {field.name for field in queryset._known_related_objects}
+        columns = {model._meta.pk.name, *extra, *known}
+        related = set()
+        for field in self.get_serializer().fields.values():
+            if field.source == "*":
+                return queryset
+            current = model
+            path = []
+            for attr in field.source_attrs:
+                try:
+                    model_field = current._meta.get_field(attr)
+                except FieldDoesNotExist:
+                    return queryset
+                path.append(attr)
+                if current is model and attr in known:
+                    break
+                if model_field.is_relation and model_field.related_model is not None:
+                    related.add("__".join(path))
+                    columns.add("__".join(path))
+                    current = model_field.related_model
+            columns.add("__".join(path))
+
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
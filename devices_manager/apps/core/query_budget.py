@@ -0,0 +1,101 @@
+"""
+Query budget guard for views.
+"""
+
+import functools
+import logging
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Transaction control, whose count depends on whether the caller already
+# holds a transaction (tests, atomic blocks) rather than on the view.
+UNCOUNTED_STATEMENTS = ("BEGIN", "SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised in strict mode when a block runs more queries than its budget.
+    """
+
+
+class QueryBudget:
+    """
+    Context manager counting the queries run on the default connection,
+    transaction control statements aside.
+
+    When the block exceeds `limit` queries it raises QueryBudgetExceeded if
+    strict (QUERY_BUDGET_STRICT, on in development and tests) and logs a
+    warning otherwise, so production traffic is never failed by the guard.
+    """
+
+    def __init__(self, limit, label=None, strict=None):
+        self.limit = limit
+        self.label = label or "block"
+        self.strict = strict
+        self.queries = []
+
+    def __enter__(self):
+        self.queries = []
+        self._wrapper = connection.execute_wrapper(self._record)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            self.check()
+        return False
+
+    def _record(self, execute, sql, params, many, context):
+        if not sql.startswith(UNCOUNTED_STATEMENTS):
+            self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def check(self):
+        """
+        Enforce the budget on the queries recorded so far.
+        """
+        if self.count <= self.limit:
+            return
+        message = f"{self.label} ran {self.count} queries (budget {self.limit})"
+        strict = self.strict
+        if strict is None:
+            strict = getattr(settings, "QUERY_BUDGET_STRICT", False)
+        if strict:
+            raise QueryBudgetExceeded(message + ":\n" + "\n".join(self.queries))
+        logger.warning(message)
+
+
+def query_budget(limit):
+    """
+    Decorator declaring the maximum number of queries a view method may run.
+    Authentication runs before the handler and is not counted.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            label = f"{type(self).__name__}.{func.__name__}"
+            with QueryBudget(limit, label=label):
+                return func(self, request, *args, **kwargs)
+
+        wrapper.query_budget = limit
+        return wrapper
+
+    return decorator
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin asserting that a block stays within a query budget.
+    """
+
+    def assertQueryBudget(self, limit, label=None):
+        return QueryBudget(limit, label=label, strict=True)
@@ -0,0 +1,60 @@
+"""
+Query plan checks for tests.
+"""
+
+import re
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Plan steps reading a whole table or index, or sorting rows outside an
+# index. Full-text MATCH lookups are reported as a SCAN of the FTS virtual
+# table and are not full scans.
+UNINDEXED_STEP = re.compile(r"^(SCAN (?!\S+ VIRTUAL TABLE)|USE TEMP B-TREE)")
+
+CHECKED_STATEMENTS = ("SELECT", "UPDATE", "DELETE")
+
+
+def explain_query_plan(sql):
+    """
+    Return the step details of SQLite's EXPLAIN QUERY PLAN for a statement.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def unindexed_steps(sql):
+    """
+    Return the plan steps of a statement that scan or sort outside an index.
+    """
+    return [step for step in explain_query_plan(sql) if UNINDEXED_STEP.match(step)]
+
+
+class QueryPlanTestMixin:
+    """
+    TestCase mixin asserting that every query of a block is answered from
+    indexes, without full scans or temporary sort B-trees. SQLite only.
+    """
+
+    @contextmanager
+    def assertIndexedQueries(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN checks run on SQLite")
+        with CaptureQueriesContext(connection) as context:
+            yield context
+
+        failures = []
+        statements = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith(CHECKED_STATEMENTS)
+        ]
+        for sql in statements:
+            steps = unindexed_steps(sql)
+            if steps:
+                failures.append(f"{sql}\n    " + "\n    ".join(steps))
+        self.assertTrue(statements, "The block ran no query to check")
+        if failures:
+            self.fail("Queries not answered from indexes:\n" + "\n".join(failures))
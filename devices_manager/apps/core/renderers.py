@@ -0,0 +1,82 @@
+"""
+Fast JSON and MessagePack renderers.
+"""
+
+import ipaddress
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """
+    Encode the types orjson and msgpack do not handle natively, exactly as
+    DRF's JSONEncoder does (datetimes as ISO 8601 with "Z" for UTC, lazy
+    strings, decimals, querysets...). IP address objects become strings.
+    """
+    if isinstance(obj, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+        return str(obj)
+    return _encoder.default(obj)
+
+
+if orjson is not None:
+    # Datetimes go through encode_default so they match DRF's format.
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def orjson_dumps(data):
+    """
+    Encode data as compact UTF-8 JSON with orjson, byte-identical to DRF's
+    JSONRenderer with its default settings (COMPACT_JSON, UNICODE_JSON).
+    """
+    output = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+    if b"\xe2\x80" in output:
+        # JSONRenderer escapes U+2028/U+2029 so the output is valid JavaScript.
+        output = output.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return output
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson when it is installed.
+    Falls back to the stdlib encoder without orjson, or when the client asks
+    for indented output (`Accept: application/json; indent=4`).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson_dumps(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer, selected with `Accept: application/msgpack`.
+    Values are encoded like the JSON output: datetimes as ISO 8601 strings.
+    Requires the msgpack package.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
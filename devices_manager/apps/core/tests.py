@@ -1,10 +1,28 @@
 """
-Tests for core models.
+Tests for core models and utilities.
 """
 
+import io
+import uuid
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from ipaddress import IPv4Address
+from unittest import skipUnless
+from zoneinfo import ZoneInfo
+
+from apps.core import renderers
 from apps.core.models import BaseModel
+from apps.core.parsers import ORJSONParser
+from apps.core.query_budget import QueryBudget, QueryBudgetExceeded
+from apps.core.renderers import MessagePackRenderer, ORJSONRenderer
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
 
 
 class BaseModelTest(TestCase):
@@ -17,3 +35,125 @@ class BaseModelTest(TestCase):
         Test that BaseModel is abstract.
         """
         self.assertTrue(BaseModel._meta.abstract)
+
+
+class QueryBudgetTest(TestCase):
+    """
+    Test QueryBudget guard.
+    """
+
+    def test_within_budget(self):
+        """
+        Test that a block within its budget passes.
+        """
+        with QueryBudget(1, strict=True) as budget:
+            get_user_model().objects.count()
+        self.assertEqual(budget.count, 1)
+
+    def test_over_budget_strict(self):
+        """
+        Test that strict mode raises when the budget is exceeded.
+        """
+        with self.assertRaises(QueryBudgetExceeded):
+            with QueryBudget(1, strict=True):
+                get_user_model().objects.count()
+                get_user_model().objects.count()
+
+    def test_savepoints_not_counted(self):
+        """
+        Test that savepoints do not count against the budget.
+        """
+        with QueryBudget(1, strict=True) as budget:
+            with transaction.atomic():
+                get_user_model().objects.count()
+        self.assertEqual(budget.count, 1)
+
+    def test_over_budget_lenient(self):
+        """
+        Test that lenient mode only logs when the budget is exceeded.
+        """
+        with self.assertLogs("apps.core.query_budget", level="WARNING"):
+            with QueryBudget(0, strict=False):
+                get_user_model().objects.count()
+
+
+SAMPLE_PAYLOAD = {
+    "count": 2,
+    "results": [
+        {
+            "id": 1,
+            "name": 'Cámara 📷 \u2028 "comillas"',
+            "ip_address": "10.0.0.1",
+            "is_active": True,
+            "created_at": datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=dt_timezone.utc),
+            "updated_at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=ZoneInfo("America/Bogota")),
+        },
+        {"id": 2, "naive": datetime(2024, 1, 2, 3, 4), "date": date(2024, 1, 2)},
+    ],
+    "misc": {
+        1: time(3, 4, 5, 600),
+        "decimal": Decimal("1.10"),
+        "uuid": uuid.UUID(int=1),
+        "lazy": gettext_lazy("Activo"),
+        "error": ErrorDetail("Inválido", code="invalid"),
+        "timedelta": timedelta(seconds=90),
+        "null": None,
+        "float": 0.5,
+    },
+}
+
+
+@skipUnless(renderers.orjson, "orjson is not installed")
+class ORJSONCodecTest(SimpleTestCase):
+    """
+    Test the orjson renderer and parser against DRF's JSON codec.
+    """
+
+    def test_render_matches_json_renderer(self):
+        """
+        Test that the rendered bytes are identical to JSONRenderer.
+        """
+        self.assertEqual(
+            ORJSONRenderer().render(SAMPLE_PAYLOAD), JSONRenderer().render(SAMPLE_PAYLOAD)
+        )
+        data = ReturnDict({"detail": ErrorDetail("No encontrado.")}, serializer=None)
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_render_ip_addresses_and_indent(self):
+        """
+        Test that IP objects become strings and indented output is honoured.
+        """
+        self.assertEqual(
+            ORJSONRenderer().render({"ip": IPv4Address("10.0.0.1")}), b'{"ip":"10.0.0.1"}'
+        )
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=2")
+        self.assertEqual(rendered, JSONRenderer().render({"a": 1}, "application/json; indent=2"))
+
+    def test_parse(self):
+        """
+        Test that the parser decodes bodies and rejects invalid or non-strict JSON.
+        """
+        parser = ORJSONParser()
+        self.assertEqual(
+            parser.parse(io.BytesIO('{"name": "Cámara"}'.encode())), {"name": "Cámara"}
+        )
+        for body in (b"{", b'{"value": NaN}'):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(body))
+
+
+@skipUnless(renderers.msgpack, "msgpack is not installed")
+class MessagePackRendererTest(SimpleTestCase):
+    """
+    Test the MessagePack renderer.
+    """
+
+    def test_render(self):
+        """
+        Test that values round-trip with datetimes encoded as in JSON.
+        """
+        import msgpack
+
+        data = {"created_at": datetime(2024, 1, 2, tzinfo=dt_timezone.utc), "ids": [1, 2]}
+        decoded = msgpack.unpackb(MessagePackRenderer().render(data))
+        self.assertEqual(decoded, {"created_at": "2024-01-02T00:00:00Z", "ids": [1, 2]})
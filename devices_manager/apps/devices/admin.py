@@ -12,7 +12,22 @@ class DeviceAdmin(admin.ModelAdmin):
     Admin configuration for Device model.
     """
 
-    list_display = ["name", "ip_address", "is_active", "user_platform", "created_at"]
-    list_filter = ["is_active", "created_at", "user_platform__platform"]
+    list_display = [
+        "name",
+        "ip_address",
+        "is_active",
+        "reachable",
+        "last_seen",
+        "user_platform",
+        "created_at",
+    ]
+    list_filter = ["is_active", "reachable", "created_at", "platform"]
     search_fields = ["name", "ip_address", "user_platform__email"]
-    readonly_fields = ["created_at", "updated_at", "created_by", "updated_by"]
+    readonly_fields = [
+        "reachable",
+        "last_seen",
+        "created_at",
+        "updated_at",
+        "created_by",
+        "updated_by",
+    ]
@@ -8,3 +8,6 @@ from django.apps import AppConfig
 class DevicesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.devices"
+
+    def ready(self):
+        from apps.devices import signals  # noqa: F401
@@ -0,0 +1,146 @@
+"""
+Bulk device operations.
+"""
+
+from apps.devices.ip_conflicts import (
+    enforces_unique_ips,
+    ip_conflict_errors,
+    unique_ip_errors,
+)
+from apps.devices.models import Device
+from apps.devices.serializers import DeviceSerializer
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+NOT_FOUND_ERROR = "Dispositivo no encontrado."
+INVALID_ID_ERROR = "Se requiere un id válido."
+
+
+def _parse_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _raise_if_errors(errors):
+    if any(errors):
+        raise serializers.ValidationError(errors)
+
+
+def bulk_create_devices(user_platform, items, context=None):
+    """
+    Validate every item and insert them with bulk_create in one transaction.
+    Errors are reported per item, aligned with the input, and nothing is
+    written if any item is invalid.
+    """
+    validated = []
+    errors = []
+    for item in items:
+        serializer = DeviceSerializer(data=item, context=context)
+        if serializer.is_valid():
+            validated.append(serializer.validated_data)
+            errors.append({})
+        else:
+            errors.append(serializer.errors)
+    _raise_if_errors(errors)
+
+    enforced = enforces_unique_ips(user_platform.platform_id)
+    if enforced:
+        _raise_if_errors(
+            ip_conflict_errors(
+                user_platform.platform_id,
+                [(data["ip_address"], ("new", i)) for i, data in enumerate(validated)],
+            )
+        )
+
+    devices = [
+        Device(
+            user_platform=user_platform,
+            created_by=user_platform,
+            updated_by=user_platform,
+            **data,
+        )
+        for data in validated
+    ]
+    with unique_ip_errors(enforced), transaction.atomic():
+        Device.objects.bulk_create(devices)
+    return devices
+
+
+def bulk_update_devices(queryset, user_platform, items, context=None):
+    """
+    Apply partial updates, keyed by each item's `id`, with bulk_update.
+    Devices outside `queryset` are reported as not found.
+    """
+    with transaction.atomic():
+        ids = [_parse_id(item.get("id")) if isinstance(item, dict) else None for item in items]
+        instances = queryset.select_for_update(of=("self",)).in_bulk(
+            [pk for pk in ids if pk is not None]
+        )
+
+        errors = []
+        fields = set()
+        for pk, item in zip(ids, items):
+            if pk is None:
+                errors.append({"id": [INVALID_ID_ERROR]})
+                continue
+            instance = instances.get(pk)
+            if instance is None:
+                errors.append({"id": [NOT_FOUND_ERROR]})
+                continue
+            serializer = DeviceSerializer(instance, data=item, partial=True, context=context)
+            if not serializer.is_valid():
+                errors.append(serializer.errors)
+                continue
+            for attr, value in serializer.validated_data.items():
+                setattr(instance, attr, value)
+                fields.add(attr)
+            errors.append({})
+        _raise_if_errors(errors)
+
+        enforced = enforces_unique_ips(user_platform.platform_id)
+        if enforced and "ip_address" in fields:
+            _raise_if_errors(
+                ip_conflict_errors(
+                    user_platform.platform_id,
+                    [(instances[pk].ip_address, (pk,)) for pk in ids],
+                    owner_fields=["pk"],
+                )
+            )
+
+        devices = list({pk: instances[pk] for pk in ids}.values())
+        now = timezone.now()
+        for device in devices:
+            device.updated_at = now
+            device.updated_by = user_platform
+        with unique_ip_errors(enforced):
+            Device.objects.bulk_update(devices, [*sorted(fields), "updated_at", "updated_by"])
+    return devices
+
+
+def bulk_delete_devices(queryset, ids):
+    """
+    Delete the given devices with a single DELETE statement.
+    Returns the number of deleted devices.
+    """
+    parsed = [_parse_id(pk) for pk in ids]
+    with transaction.atomic():
+        found = set(
+            queryset.filter(pk__in=[pk for pk in parsed if pk is not None]).values_list(
+                "pk", flat=True
+            )
+        )
+        errors = []
+        for pk in parsed:
+            if pk is None:
+                errors.append({"id": [INVALID_ID_ERROR]})
+            elif pk not in found:
+                errors.append({"id": [NOT_FOUND_ERROR]})
+            else:
+                errors.append({})
+        _raise_if_errors(errors)
+
+        deleted, _ = Device.objects.filter(pk__in=found).delete()
+    return deleted
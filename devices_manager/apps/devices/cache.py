@@ -0,0 +1,193 @@
+"""
+Per-user response cache for device collection endpoints.
+"""
+
+import threading
+import time
+
+from apps.devices.conditional import conditional_response, representation_key
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+KEY_PREFIX = "devices:resp"
+
+
+class DeviceResponseCache:
+    """
+    Caches serialized device collections in Django's cache framework.
+
+    Entries are keyed by user_platform, the user's and platform's cache
+    generations, the full request path (filters, ordering, page or cursor)
+    and the accepted media type. Writes invalidate by bumping the generation
+    of the affected users (see apps.devices.signals), so stale entries are
+    never read again and simply expire. Misses are built by a single request
+    per key: concurrent requests wait for its entry (a `cache.add` lock)
+    instead of all hitting the database.
+
+    Use the local-memory backend on a single node and a shared backend
+    (Redis, Memcached) when several nodes serve the API, so invalidations are
+    seen by all of them.
+    """
+
+    def __init__(self, alias=None, timeout=None):
+        self._alias = alias
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+
+    @property
+    def cache(self):
+        return caches[self._alias or getattr(settings, "DEVICES_RESPONSE_CACHE_ALIAS", "default")]
+
+    @property
+    def timeout(self):
+        if self._timeout is not None:
+            return self._timeout
+        return getattr(settings, "DEVICES_RESPONSE_CACHE_TIMEOUT", 60)
+
+    @property
+    def enabled(self):
+        return self.timeout > 0
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def user_generation_key(self, user_platform_id):
+        return f"{KEY_PREFIX}:gen:user:{user_platform_id}"
+
+    def platform_generation_key(self, platform_id):
+        return f"{KEY_PREFIX}:gen:platform:{platform_id}"
+
+    def get_generations(self, keys):
+        """
+        Return the current value of the given generation keys, starting
+        missing ones at a fresh value so old entries can never match again,
+        including when a generation was culled or evicted by the backend.
+        """
+        generations = self.cache.get_many(keys)
+        for key in keys:
+            if key not in generations:
+                self.cache.add(key, time.time_ns(), None)
+                generations[key] = self.cache.get(key)
+        return [generations[key] for key in keys]
+
+    def get_key(self, request, user_platform):
+        """
+        Return the cache key of the response to a request.
+        """
+        user_generation, platform_generation = self.get_generations(
+            [
+                self.user_generation_key(user_platform.pk),
+                self.platform_generation_key(user_platform.platform_id),
+            ]
+        )
+        return (
+            f"{KEY_PREFIX}:{user_platform.pk}:{user_generation}:{platform_generation}:"
+            f"{representation_key(request)}"
+        )
+
+    def respond(self, request, user_platform, build):
+        """
+        Return the cached response for the request, or build and cache it.
+        `build` returns a DRF Response carrying ETag/Last-Modified headers.
+        """
+        if not self.enabled:
+            return build()
+
+        key = self.get_key(request, user_platform)
+        entry = self.cache.get(key)
+        if entry is None:
+            entry, response = self.fill(key, build)
+            if response is not None:
+                response["X-Cache"] = "MISS"
+                return response
+        self._count("hits")
+
+        response = conditional_response(
+            request, entry["etag"], entry["last_modified"], lambda: Response(entry["data"])
+        )
+        response["X-Cache"] = "HIT"
+        return response
+
+    def fill(self, key, build):
+        """
+        Build a missing entry, letting a single request do it per key.
+        Returns (entry, None) when another request built it meanwhile, or
+        (None, response) when this request built the response.
+        """
+        lock_key = f"{key}:lock"
+        lock_timeout = getattr(settings, "DEVICES_RESPONSE_CACHE_LOCK_TIMEOUT", 10)
+        if not self.cache.add(lock_key, 1, lock_timeout):
+            self._count("waits")
+            deadline = time.monotonic() + getattr(settings, "DEVICES_RESPONSE_CACHE_LOCK_WAIT", 2)
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                entry = self.cache.get(key)
+                if entry is not None:
+                    return entry, None
+            lock_key = None
+
+        self._count("misses")
+        try:
+            response = build()
+            self.store(key, response)
+        finally:
+            if lock_key is not None:
+                self.cache.delete(lock_key)
+        return None, response
+
+    def store(self, key, response):
+        """
+        Cache a successful, non-streaming response.
+        """
+        if not isinstance(response, Response) or response.status_code != 200:
+            return
+        if "ETag" not in response:
+            return
+        entry = {
+            "data": response.data,
+            "etag": response["ETag"],
+            "last_modified": parse_http_date_safe(response.get("Last-Modified", "")),
+        }
+        self.cache.set(key, entry, self.timeout)
+
+    def invalidate_users(self, user_platform_ids):
+        """
+        Drop the cached responses of the given users.
+        """
+        for user_platform_id in set(user_platform_ids):
+            self._bump(self.user_generation_key(user_platform_id))
+
+    def invalidate_platform(self, platform_id):
+        """
+        Drop the cached responses of every user of a platform.
+        """
+        self._bump(self.platform_generation_key(platform_id))
+
+    def _bump(self, key):
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # No generation yet: no entry can exist under this key.
+            pass
+
+    def stats(self):
+        """
+        Return hit/miss counters and the hit ratio of this process.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "waits": self.waits,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+device_response_cache = DeviceResponseCache()
@@ -0,0 +1,63 @@
+"""
+Conditional GET support (ETag/Last-Modified) for device endpoints.
+"""
+
+import hashlib
+
+from apps.platforms.models import UserPlatform
+from django.utils.cache import get_conditional_response, patch_vary_headers, quote_etag
+from django.utils.http import http_date
+
+
+def representation_key(request):
+    """
+    Return a short digest of what, besides the data, shapes a response:
+    the absolute URL (scheme and host, which the pagination links embed,
+    filters, ordering, page or cursor) and the media type.
+    """
+    raw = f"{request.build_absolute_uri()}|{request.accepted_media_type}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def collection_validators(request, user_platform):
+    """
+    Return (etag, last_modified) for the device collection of a user.
+    Reads the version stamp with one primary-key lookup; it is bumped by the
+    devices_changed signal after every device write.
+    """
+    version, changed_at = (
+        UserPlatform.objects.filter(pk=user_platform.pk)
+        .values_list("devices_version", "devices_changed_at")
+        .get()
+    )
+    etag = quote_etag(f"c{user_platform.pk}.{version}.{representation_key(request)}")
+    return etag, changed_at
+
+
+def instance_validators(request, device):
+    """
+    Return (etag, last_modified) for a single device.
+    """
+    stamp = int(device.updated_at.timestamp() * 1_000_000)
+    etag = quote_etag(f"d{device.pk}.{stamp}.{representation_key(request)}")
+    return etag, device.updated_at
+
+
+def conditional_response(request, etag, last_modified, build):
+    """
+    Answer If-None-Match/If-Modified-Since with 304 without calling `build`,
+    or call it and add the validators to the response. `last_modified` is a
+    datetime or a Unix timestamp.
+    """
+    timestamp = last_modified
+    if hasattr(last_modified, "timestamp"):
+        timestamp = int(last_modified.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = build()
+    if 200 <= response.status_code < 300 or response.status_code == 304:
+        response.headers["ETag"] = etag
+        if timestamp is not None:
+            response.headers["Last-Modified"] = http_date(timestamp)
+    patch_vary_headers(response, ("Accept", "Authorization"))
+    return response
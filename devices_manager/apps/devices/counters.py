@@ -0,0 +1,116 @@
+"""
+Denormalized device counters of users and platforms.
+"""
+
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+def delta_expression(deltas, index):
+    """
+    Return an expression evaluating, for each UserPlatform row, to element
+    `index` of its (total, active) delta.
+    """
+    values = {user_platform_id: delta[index] for user_platform_id, delta in deltas.items()}
+    if len(set(values.values())) == 1:
+        return Value(next(iter(values.values())))
+    return Case(
+        *[
+            When(pk=user_platform_id, then=Value(value))
+            for user_platform_id, value in values.items()
+        ],
+        default=Value(0),
+    )
+
+
+def user_counter_updates(deltas):
+    """
+    Return the update() keyword arguments applying (total, active) deltas,
+    keyed by user_platform id, to UserPlatform rows.
+    """
+    updates = {}
+    for index, field in enumerate(["devices_total", "devices_active"]):
+        if any(delta[index] for delta in deltas.values()):
+            updates[field] = F(field) + delta_expression(deltas, index)
+    return updates
+
+
+def apply_platform_deltas(deltas):
+    """
+    Apply (total, active) deltas of users to their platforms' counters with
+    one UPDATE, summing the deltas of each platform's users in a subquery.
+    """
+    updates = {}
+    for index, field in enumerate(["devices_total", "devices_active"]):
+        if not any(delta[index] for delta in deltas.values()):
+            continue
+        total = (
+            UserPlatform.objects.filter(platform=OuterRef("pk"), pk__in=list(deltas))
+            .order_by()
+            .values("platform")
+            .annotate(delta=Sum(delta_expression(deltas, index)))
+            .values("delta")
+        )
+        updates[field] = F(field) + Subquery(total)
+    if updates:
+        Platform.objects.filter(user_platforms__pk__in=list(deltas)).update(**updates)
+
+
+def device_count(outer_ref, active=False):
+    """
+    Return a subquery counting the devices (or active devices) related to
+    the outer row through `outer_ref` (a Device lookup).
+    """
+    condition = Q(is_active=True) if active else Q()
+    counts = (
+        Device.objects.filter(condition, **{outer_ref: OuterRef("pk")})
+        .order_by()
+        .values(outer_ref)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def find_drift(queryset, outer_ref):
+    """
+    Return the pks of the rows of `queryset` whose counters differ from the
+    actual device counts.
+    """
+    annotated = queryset.annotate(
+        actual_total=device_count(outer_ref),
+        actual_active=device_count(outer_ref, active=True),
+    )
+    return list(
+        annotated.exclude(
+            devices_total=F("actual_total"), devices_active=F("actual_active")
+        ).values_list("pk", flat=True)
+    )
+
+
+def recount(queryset, outer_ref):
+    """
+    Set the counters of `queryset` to the actual device counts, computed in
+    the same UPDATE statement.
+    """
+    return queryset.update(
+        devices_total=device_count(outer_ref),
+        devices_active=device_count(outer_ref, active=True),
+    )
+
+
+def reconcile_device_counters(dry_run=False):
+    """
+    Repair users and platforms whose counters drifted from the device table.
+    Returns the (user ids, platform ids) that were wrong.
+    """
+    user_ids = find_drift(UserPlatform.objects.all(), "user_platform")
+    platform_ids = find_drift(Platform.objects.all(), "platform")
+    if not dry_run:
+        if user_ids:
+            recount(UserPlatform.objects.filter(pk__in=user_ids), "user_platform")
+        if platform_ids:
+            recount(Platform.objects.filter(pk__in=platform_ids), "platform")
+    return user_ids, platform_ids
@@ -0,0 +1,217 @@
+"""
+Device change events for the Server-Sent Events feed.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+RESYNC_EVENT = {"action": "resync"}
+
+
+class Subscription:
+    """
+    A single SSE connection: a bounded asyncio queue bound to its event loop.
+
+    Events are handed over with call_soon_threadsafe, so they can be
+    published from request threads. When the client falls behind and the
+    queue fills up, pending events are replaced by a single "resync" event
+    telling it to catch up through /api/devices/changes/.
+    """
+
+    def __init__(self, user_platform_id, max_queue):
+        self.user_platform_id = user_platform_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue)
+
+    def put(self, event):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class LocalEventBroker:
+    """
+    In-process broker fanning device events out to the SSE connections of
+    the affected user_platform. Only reaches connections served by this
+    process; use RedisEventBroker when several processes or nodes serve
+    the API.
+    """
+
+    def __init__(self, max_queue=None):
+        self._max_queue = max_queue
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    @property
+    def max_queue(self):
+        if self._max_queue is not None:
+            return self._max_queue
+        return getattr(settings, "DEVICES_EVENTS_MAX_QUEUE", 100)
+
+    def subscribe(self, user_platform_id):
+        """
+        Register a connection of a user; must run inside its event loop.
+        """
+        subscription = Subscription(user_platform_id, self.max_queue)
+        with self._lock:
+            self._subscriptions[user_platform_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_platform_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_platform_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def publish(self, user_platform_id, event):
+        """
+        Publish an event for a user.
+        """
+        self.deliver(user_platform_id, event)
+
+    def deliver(self, user_platform_id, event):
+        """
+        Hand an event to this process's connections of a user.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_platform_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.put(event)
+            except RuntimeError:
+                # The connection's event loop is gone.
+                self.unsubscribe(subscription)
+
+
+class RedisEventBroker(LocalEventBroker):
+    """
+    Broker sharing events between nodes through Redis pub/sub.
+
+    Events are published to DEVICES_EVENTS_REDIS_CHANNEL; each process runs
+    one listener thread delivering them to its own connections. Requires the
+    `redis` package and DEVICES_EVENTS_REDIS_URL.
+    """
+
+    def __init__(self, url=None, channel=None, max_queue=None):
+        super().__init__(max_queue=max_queue)
+        try:
+            import redis
+        except ImportError as e:
+            raise ImproperlyConfigured("RedisEventBroker requires the redis package") from e
+        url = url or getattr(settings, "DEVICES_EVENTS_REDIS_URL", None)
+        if not url:
+            raise ImproperlyConfigured("RedisEventBroker requires DEVICES_EVENTS_REDIS_URL")
+        self.channel = channel or getattr(
+            settings, "DEVICES_EVENTS_REDIS_CHANNEL", "devices:events"
+        )
+        self._client = redis.Redis.from_url(url)
+        self._listener = None
+
+    def subscribe(self, user_platform_id):
+        self._ensure_listener()
+        return super().subscribe(user_platform_id)
+
+    def publish(self, user_platform_id, event):
+        message = json.dumps({"user_platform_id": user_platform_id, "event": event})
+        self._client.publish(self.channel, message)
+
+    def _ensure_listener(self):
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen, name="device-events-listener", daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self):
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        for message in pubsub.listen():
+            try:
+                payload = json.loads(message["data"])
+                self.deliver(payload["user_platform_id"], payload["event"])
+            except Exception:
+                logger.exception("Invalid device event received from Redis")
+
+
+@functools.lru_cache(maxsize=None)
+def get_event_broker():
+    """
+    Return the process-wide broker configured in DEVICES_EVENTS_BROKER.
+    """
+    path = getattr(settings, "DEVICES_EVENTS_BROKER", "apps.devices.events.LocalEventBroker")
+    return import_string(path)()
+
+
+def format_event(event):
+    """
+    Serialize an event in the text/event-stream format.
+    """
+    return f"event: {event['action']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+async def event_stream(broker, user_platform_id, token):
+    """
+    Yield the text/event-stream of a user's device events until the client
+    leaves.
+    Starts with a "ready" event carrying a delta-sync token, so clients can
+    fetch what they missed while disconnected from /api/devices/changes/,
+    and sends a comment line as heartbeat when idle.
+    """
+    heartbeat = getattr(settings, "DEVICES_EVENTS_HEARTBEAT", 15)
+    subscription = broker.subscribe(user_platform_id)
+    try:
+        yield f"retry: {getattr(settings, 'DEVICES_EVENTS_RETRY_MS', 3000)}\n\n"
+        yield format_event({"action": "ready", "token": token})
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def publish_rows(action, rows):
+    """
+    Publish one event per affected user for (device id, user_platform id) rows.
+    """
+    by_user = defaultdict(list)
+    for device_id, user_platform_id in rows:
+        by_user[user_platform_id].append(device_id)
+    broker = get_event_broker()
+    for user_platform_id, device_ids in by_user.items():
+        try:
+            broker.publish(user_platform_id, {"action": action, "ids": device_ids})
+        except Exception:
+            logger.exception("Could not publish device event")
@@ -0,0 +1,113 @@
+"""
+Streaming export of a platform's devices.
+"""
+
+import csv
+import io
+import zlib
+
+from apps.devices.models import Device
+from apps.devices.renderers import dumps_row
+from django.conf import settings
+
+EXPORT_FIELDS = [
+    ("id", "id"),
+    ("name", "name"),
+    ("ip_address", "ip_address"),
+    ("is_active", "is_active"),
+    ("user_platform_id", "user_platform_id"),
+    ("user_platform_email", "user_platform__email"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+]
+
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+}
+
+
+def get_chunk_size(chunk_size=None):
+    return chunk_size or getattr(settings, "DEVICES_EXPORT_CHUNK_SIZE", 2000)
+
+
+def export_rows(platform_id, chunk_size=None):
+    """
+    Yield value tuples for every device of a platform, across all its users.
+    Rows come from iterator(), so PostgreSQL reads them through a server-side
+    cursor and SQLite with fetchmany; nothing is cached on the queryset.
+    Devices are grouped by user in creation order, which is the order of the
+    (platform, user_platform, created_at, id) index, so nothing is sorted.
+    """
+    queryset = (
+        Device.objects.filter(platform_id=platform_id)
+        .order_by("user_platform_id", "created_at", "pk")
+        .values_list(*[lookup for _, lookup in EXPORT_FIELDS])
+    )
+    return queryset.iterator(chunk_size=get_chunk_size(chunk_size))
+
+
+def _chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv(rows, chunk_size=None):
+    """
+    Yield a header line and then one encoded CSV block per chunk of rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in EXPORT_FIELDS])
+    for chunk in _chunks(rows, get_chunk_size(chunk_size)):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def iter_jsonl(rows, chunk_size=None):
+    """
+    Yield one block of JSON lines per chunk of rows.
+    """
+    names = [name for name, _ in EXPORT_FIELDS]
+    for chunk in _chunks(rows, get_chunk_size(chunk_size)):
+        yield b"".join(dumps_row(dict(zip(names, row))) + b"\n" for row in chunk)
+
+
+def iter_gzip(blocks):
+    """
+    Compress a stream of byte blocks into a gzip stream, block by block.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(platform_id, file_format="csv", gzip=False, chunk_size=None):
+    """
+    Return an iterator of byte blocks exporting a platform's devices.
+    Memory use is bounded by the chunk size, whatever the number of rows.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+    rows = export_rows(platform_id, chunk_size)
+    encode = iter_csv if file_format == "csv" else iter_jsonl
+    blocks = encode(rows, chunk_size)
+    return iter_gzip(blocks) if gzip else blocks
+
+
+def export_filename(platform_id, file_format, gzip=False):
+    extension = FORMATS[file_format][1] + (".gz" if gzip else "")
+    return f"platform-{platform_id}-devices.{extension}"
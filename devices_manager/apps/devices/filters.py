@@ -0,0 +1,82 @@
+"""
+Device filter backends.
+"""
+
+import ipaddress
+
+from apps.devices.models import ip_to_int
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+
+class DeviceIPFilter(filters.BaseFilterBackend):
+    """
+    Filter devices by IPv4 network (?cidr=10.2.0.0/16) or by an inclusive
+    address range (?ip_from= / ?ip_to=).
+    Every filter becomes a range on ip_int, so it is answered by the
+    (user_platform, ip_int) index.
+    """
+
+    cidr_param = "cidr"
+    from_param = "ip_from"
+    to_param = "ip_to"
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        lower, upper = None, None
+
+        cidr = params.get(self.cidr_param)
+        if cidr:
+            try:
+                network = ipaddress.IPv4Network(cidr.strip(), strict=False)
+            except ValueError:
+                raise ValidationError({self.cidr_param: ["Red CIDR IPv4 no válida."]})
+            lower = int(network.network_address)
+            upper = int(network.broadcast_address)
+
+        ip_from = self.parse_address(params, self.from_param)
+        if ip_from is not None:
+            lower = ip_from if lower is None else max(lower, ip_from)
+        ip_to = self.parse_address(params, self.to_param)
+        if ip_to is not None:
+            upper = ip_to if upper is None else min(upper, ip_to)
+
+        if lower is not None:
+            queryset = queryset.filter(ip_int__gte=lower)
+        if upper is not None:
+            queryset = queryset.filter(ip_int__lte=upper)
+        return queryset
+
+    def parse_address(self, params, name):
+        """
+        Return the integer form of an IPv4 query parameter, or None if absent.
+        """
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            return ip_to_int(value.strip())
+        except ValueError:
+            raise ValidationError({name: ["Dirección IPv4 no válida."]})
+
+
+class DeviceOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter sorting ?ordering=ip_address numerically through ip_int.
+    """
+
+    aliases = {"ip_address": "ip_int"}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        return [self.resolve_alias(term) for term in ordering]
+
+    def resolve_alias(self, term):
+        """
+        Map a public ordering term to the column it is sorted by.
+        """
+        prefix = "-" if term.startswith("-") else ""
+        name = term.lstrip("-")
+        return prefix + self.aliases.get(name, name)
@@ -0,0 +1,247 @@
+"""
+Streaming bulk import of devices from CSV or JSON lines files.
+"""
+
+import csv
+import gzip
+import io
+import json
+from itertools import islice
+
+from apps.devices.ip_conflicts import (
+    enforces_unique_ips,
+    ip_conflict_errors,
+    unique_ip_errors,
+)
+from apps.devices.models import Device
+from apps.devices.serializers import DeviceSerializer
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.fields import empty
+
+IMPORT_FIELDS = ["name", "ip_address", "is_active"]
+IMPORT_KEYS = ["name", "ip_address"]
+IMPORT_FORMATS = ["csv", "jsonl"]
+
+INVALID_ROW_ERROR = "Fila inválida: se esperaba un objeto JSON."
+
+
+def detect_format(filename):
+    """
+    Return the import format matching a file name, or None.
+    """
+    name = (filename or "").lower().removesuffix(".gz")
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def iter_records(stream, file_format, compressed=False):
+    """
+    Yield (row number, record) pairs parsed lazily from a binary stream,
+    decompressing it on the fly when `compressed` (gzip) is set.
+    The record is a dict, or None when the line could not be parsed.
+    """
+    if compressed:
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if file_format == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield number, record if isinstance(record, dict) else None
+
+
+class RowValidator:
+    """
+    Validate import rows with the field rules of DeviceSerializer.
+
+    One serializer is built for the whole import and each field is run
+    through its own run_validation() and validate_<field>() hook, which is
+    what is_valid() does, without building a serializer per row.
+    """
+
+    def __init__(self, context=None):
+        self.serializer = DeviceSerializer(context=context)
+        self.fields = [(name, self.serializer.fields[name]) for name in IMPORT_FIELDS]
+
+    def validate(self, record):
+        """
+        Return (validated data, errors) for a parsed record.
+        """
+        if record is None:
+            return None, {"non_field_errors": [INVALID_ROW_ERROR]}
+
+        data = {}
+        errors = {}
+        for name, field in self.fields:
+            value = record.get(name, empty)
+            if value in (empty, "", None) and not field.required:
+                # Empty CSV cells leave optional fields at their defaults.
+                continue
+            try:
+                value = field.run_validation(value)
+                validator = getattr(self.serializer, f"validate_{name}", None)
+                if validator is not None:
+                    value = validator(value)
+            except serializers.ValidationError as e:
+                errors[name] = e.detail
+                continue
+            data[name] = value
+        return (None, errors) if errors else (data, None)
+
+
+class ImportReport:
+    """
+    Counters and per-row errors of an import. Only the first `max_errors`
+    errors are kept, so the report stays small on very large files.
+    """
+
+    def __init__(self, max_errors=None):
+        if max_errors is None:
+            max_errors = getattr(settings, "DEVICES_IMPORT_MAX_ERRORS", 1000)
+        self.max_errors = max_errors
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def _upsert_batch(user_platform, rows, key, report):
+    """
+    Create or update one batch of validated rows in one transaction.
+    Existing devices are matched on `key` within the user with one SELECT;
+    when several share the key the oldest one is updated. Inside a batch
+    the last row for a key wins, and the rows it supersedes are counted as
+    updates of the same device, so the totals add up to the rows written.
+    """
+    by_key = {data[key]: data for data in rows}
+    with transaction.atomic():
+        existing = {}
+        matches = (
+            Device.objects.for_user_platform(user_platform)
+            .filter(**{f"{key}__in": list(by_key)})
+            .select_for_update()
+            .order_by("-pk")
+        )
+        for device in matches:
+            existing[getattr(device, key)] = device
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        fields = set()
+        for value, data in by_key.items():
+            device = existing.get(value)
+            if device is None:
+                to_create.append(
+                    Device(
+                        user_platform=user_platform,
+                        created_by=user_platform,
+                        updated_by=user_platform,
+                        **data,
+                    )
+                )
+                continue
+            for attr, field_value in data.items():
+                setattr(device, attr, field_value)
+                fields.add(attr)
+            device.updated_at = now
+            device.updated_by = user_platform
+            to_update.append(device)
+
+        if to_create:
+            Device.objects.bulk_create(to_create)
+        if to_update:
+            Device.objects.bulk_update(
+                to_update, [*sorted(fields - {key}), "updated_at", "updated_by"]
+            )
+    report.created += len(to_create)
+    report.updated += len(to_update) + len(rows) - len(by_key)
+
+
+def import_devices(user_platform, records, key="name", batch_size=None, context=None):
+    """
+    Upsert (row number, record) pairs into the devices of `user_platform`,
+    matching existing devices on `key` (name or ip_address).
+
+    Records are consumed lazily, validated and written in batches of
+    DEVICES_IMPORT_BATCH_SIZE, so memory is bounded by the batch size. Invalid
+    rows are skipped and reported; each batch is committed on its own.
+    Returns an ImportReport.
+    """
+    if key not in IMPORT_KEYS:
+        raise ValueError(f"Unsupported import key: {key}")
+    batch_size = batch_size or getattr(settings, "DEVICES_IMPORT_BATCH_SIZE", 1000)
+    validator = RowValidator(context=context)
+    report = ImportReport()
+
+    enforced = enforces_unique_ips(user_platform.platform_id)
+    records = iter(records)
+    while batch := list(islice(records, batch_size)):
+        numbered = []
+        for number, record in batch:
+            data, errors = validator.validate(record)
+            if errors:
+                report.add_error(number, errors)
+            else:
+                numbered.append((number, data))
+        if enforced and numbered:
+            numbered = _reject_duplicate_ips(user_platform, numbered, key, report)
+        if numbered:
+            try:
+                with unique_ip_errors(enforced):
+                    _upsert_batch(user_platform, [data for _, data in numbered], key, report)
+            except serializers.ValidationError as e:
+                # An address taken since the check; the batch was rolled back.
+                for number, _ in numbered:
+                    report.add_error(number, e.detail)
+    return report
+
+
+def _reject_duplicate_ips(user_platform, numbered, key, report):
+    """
+    Report and drop the (row number, data) pairs whose IP address another
+    device of the platform holds, or an earlier row of the batch claims for
+    another device. A row owns its address when it updates the device
+    holding it, that is the user's device matched on `key`.
+    """
+    errors = ip_conflict_errors(
+        user_platform.platform_id,
+        [(data["ip_address"], (user_platform.pk, data[key])) for _, data in numbered],
+        owner_fields=["user_platform_id", key],
+    )
+    kept = []
+    for (number, data), row_errors in zip(numbered, errors):
+        if row_errors:
+            report.add_error(number, row_errors)
+        else:
+            kept.append((number, data))
+    return kept
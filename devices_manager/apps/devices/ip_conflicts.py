@@ -0,0 +1,191 @@
+"""
+Duplicate device IP detection and per-platform unique IP enforcement.
+
+Platforms with unique_device_ips set copy the flag onto their devices
+(Device.ip_unique), and the devices_unique_ip_per_platform partial unique
+index rejects two flagged devices of a platform sharing an IP address.
+Conflicts are found with GROUP BY queries over the (platform, ip_int) index.
+"""
+
+import ipaddress
+from contextlib import contextmanager, nullcontext
+from operator import itemgetter
+
+from apps.devices.models import Device
+from apps.platforms.models import Platform
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from rest_framework import serializers
+
+DUPLICATE_IP_ERROR = "Ya existe un dispositivo con esta dirección IP en la plataforma."
+CONSTRAINT_NAME = "devices_unique_ip_per_platform"
+
+
+class IPConflictError(Exception):
+    """
+    Raised when a platform cannot enforce unique IP addresses because some
+    of its devices already share one.
+    """
+
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__(f"{len(conflicts)} direcciones IP repetidas en la plataforma")
+
+
+def is_duplicate_ip_error(error):
+    """
+    Return True if an IntegrityError comes from the unique IP index.
+    SQLite names the columns, PostgreSQL the index.
+    """
+    message = str(error)
+    return CONSTRAINT_NAME in message or f"{Device._meta.db_table}.ip_address" in message
+
+
+def enforces_unique_ips(platform_id):
+    """
+    Read a platform's unique_device_ips flag from its row. The principal's
+    cached platform may predate a set_unique_device_ips call.
+    """
+    return bool(
+        Platform.objects.filter(pk=platform_id).values_list("unique_device_ips", flat=True).first()
+    )
+
+
+@contextmanager
+def unique_ip_errors(enforced=True):
+    """
+    Report writes rejected by the unique IP index as a validation error on
+    ip_address. Writes copy the flag from the platform row, so a rejection
+    is reported even when `enforced`, the caller's copy of the flag, is
+    stale. Only writes expected to hit the index pay for the savepoint the
+    failed statement is rolled back to; the others must run in a
+    transaction of their own, which the error rolls back as it leaves it.
+    """
+    try:
+        with transaction.atomic() if enforced else nullcontext():
+            yield
+    except IntegrityError as e:
+        if not is_duplicate_ip_error(e):
+            raise
+        raise serializers.ValidationError({"ip_address": [DUPLICATE_IP_ERROR]}) from e
+
+
+def ip_conflict_errors(platform_id, items, owner_fields=()):
+    """
+    Check (ip address, owner) pairs about to be written to a platform that
+    enforces unique IPs, with one query on the unique IP index.
+
+    `owner` identifies the device each address goes to, as the values of
+    `owner_fields` (e.g. its pk), or a value matching no device for new
+    ones. An address is a conflict when a device other than its owner holds
+    it, or when an earlier item claims it for another owner. Returns one
+    error dict per item, aligned with `items` and empty when valid.
+    """
+    taken = {
+        row[0]: tuple(row[1:])
+        for row in Device.objects.filter(
+            platform_id=platform_id,
+            ip_unique=True,
+            ip_address__in={ip for ip, _ in items},
+        )
+        .order_by()
+        .values_list("ip_address", *owner_fields)
+    }
+    claimed = {}
+    errors = []
+    for ip, owner in items:
+        holder = taken.get(ip, claimed.get(ip, owner))
+        if holder != owner:
+            errors.append({"ip_address": [DUPLICATE_IP_ERROR]})
+            continue
+        claimed[ip] = owner
+        errors.append({})
+    return errors
+
+
+def conflict_groups(platform_id=None):
+    """
+    (platform_id, ip_int, count) rows of the IP addresses held by more than
+    one device, in (platform, ip_int) order. The GROUP BY walks the
+    (platform, ip_int) index, so no rows are sorted or read from the table.
+    """
+    queryset = Device.objects.filter(ip_int__isnull=False)
+    if platform_id is not None:
+        queryset = queryset.filter(platform_id=platform_id)
+    return (
+        queryset.order_by("platform_id", "ip_int")
+        .values_list("platform_id", "ip_int")
+        .annotate(count=Count("*"))
+        .filter(count__gt=1)
+    )
+
+
+def find_ip_conflicts(platform_id=None, limit=None):
+    """
+    Return the duplicated IP addresses of a platform (all platforms when
+    None), at most `limit` (DEVICES_IP_CONFLICTS_LIMIT) of them, each with
+    the devices holding it. The devices are read with one indexed query per
+    platform.
+    """
+    if limit is None:
+        limit = getattr(settings, "DEVICES_IP_CONFLICTS_LIMIT", 1000)
+    groups = list(conflict_groups(platform_id)[:limit])
+    by_platform = {}
+    for group_platform_id, ip_int, _ in groups:
+        by_platform.setdefault(group_platform_id, []).append(ip_int)
+
+    holders = {}
+    for group_platform_id, ip_ints in by_platform.items():
+        devices = (
+            Device.objects.filter(platform_id=group_platform_id, ip_int__in=ip_ints)
+            .order_by()
+            .values_list("ip_int", "pk", "name", "is_active", "user_platform_id")
+        )
+        for ip_int, pk, name, is_active, user_platform_id in devices:
+            holders.setdefault((group_platform_id, ip_int), []).append(
+                {
+                    "id": pk,
+                    "name": name,
+                    "is_active": is_active,
+                    "user_platform_id": user_platform_id,
+                }
+            )
+
+    return [
+        {
+            "platform_id": group_platform_id,
+            "ip_address": str(ipaddress.IPv4Address(ip_int)),
+            "count": count,
+            "devices": sorted(holders.get((group_platform_id, ip_int), []), key=itemgetter("id")),
+        }
+        for group_platform_id, ip_int, count in groups
+    ]
+
+
+def set_unique_device_ips(platform, enabled=True):
+    """
+    Turn unique IP enforcement on or off for a platform and copy the flag
+    onto its devices. Enabling it raises IPConflictError, and changes
+    nothing, while devices of the platform share an IP address. Running it
+    again also flags devices created with a stale copy of the setting.
+    Returns the number of devices updated.
+    """
+    with transaction.atomic():
+        if enabled:
+            conflicts = find_ip_conflicts(platform.pk)
+            if conflicts:
+                raise IPConflictError(conflicts)
+        platform.unique_device_ips = enabled
+        # save() evicts the platform's cached principals, whose platform
+        # instance new devices copy the flag from.
+        platform.save(update_fields=["unique_device_ips", "updated_at"])
+        devices = Device.objects.filter(platform=platform).exclude(ip_unique=enabled)
+        try:
+            with transaction.atomic():
+                return devices.update_quietly(ip_unique=enabled)
+        except IntegrityError as e:
+            # A duplicate written since the check above.
+            if not is_duplicate_ip_error(e):
+                raise
+            raise IPConflictError(find_ip_conflicts(platform.pk)) from e
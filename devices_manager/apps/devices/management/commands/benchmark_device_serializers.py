@@ -0,0 +1,114 @@
+"""
+Management command to benchmark device list serialization.
+"""
+
+import time
+
+from apps.core.renderers import MessagePackRenderer, ORJSONRenderer, msgpack, orjson
+from apps.devices.models import Device
+from apps.devices.rows import RowSerializer
+from apps.devices.serializers import DeviceSerializer
+from apps.platforms.models import Platform, UserPlatform
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Command comparing DeviceSerializer with the RowSerializer read path, and
+    the renderers available for the resulting list payload. Sample devices
+    are created inside a transaction that is rolled back.
+    """
+
+    help = (
+        "Compara el tiempo de serialización de DeviceSerializer y RowSerializer "
+        "y el de los renderers JSON/MessagePack"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Dispositivos de prueba")
+        parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por ruta")
+
+    def handle(self, *args, **options):
+        """
+        Execute the command.
+        """
+        try:
+            with transaction.atomic():
+                self.run(options["rows"], options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, rows, repeat):
+        platform = Platform.objects.create(name="Benchmark", is_active=True)
+        user_platform = UserPlatform.objects.create(
+            email="benchmark@example.com", platform=platform, password="!", is_active=True
+        )
+        Device.objects.bulk_create(
+            Device(
+                name=f"Dispositivo {i}",
+                ip_address=f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+                user_platform=user_platform,
+            )
+            for i in range(rows)
+        )
+        queryset = Device.objects.for_user_platform(user_platform)
+        renderer = JSONRenderer()
+
+        def model_path():
+            return renderer.render(DeviceSerializer(queryset, many=True).data)
+
+        row_serializer = RowSerializer(
+            DeviceSerializer(),
+            related_objects={"user_platform": user_platform, "platform": platform},
+        )
+
+        def row_path():
+            return renderer.render(row_serializer.serialize(row_serializer.get_queryset(queryset)))
+
+        if model_path() != row_path():
+            self.stderr.write(self.style.ERROR("✗ Las salidas no son idénticas"))
+            return
+
+        results = self.compare(
+            [("DeviceSerializer", model_path), ("RowSerializer", row_path)], rows, repeat
+        )
+        speedup = results["DeviceSerializer"] / results["RowSerializer"]
+        self.stdout.write(self.style.SUCCESS(f"✓ Salidas idénticas, {speedup:.1f}x más rápido"))
+
+        payload = row_serializer.serialize(row_serializer.get_queryset(queryset))
+        candidates = [("JSONRenderer", renderer)]
+        if orjson is not None:
+            candidates.append(("ORJSONRenderer", ORJSONRenderer()))
+        if msgpack is not None:
+            candidates.append(("MessagePackRenderer", MessagePackRenderer()))
+        results = self.compare(
+            [(name, lambda r=r: r.render(payload)) for name, r in candidates], rows, repeat
+        )
+        for name, elapsed in list(results.items())[1:]:
+            speedup = results["JSONRenderer"] / elapsed
+            self.stdout.write(self.style.SUCCESS(f"✓ {name}: {speedup:.1f}x más rápido"))
+
+    def compare(self, paths, rows, repeat):
+        """
+        Time each (name, callable) pair, keeping the best of `repeat` runs.
+        """
+        results = {}
+        for name, path in paths:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                path()
+                timings.append(time.perf_counter() - start)
+            results[name] = min(timings)
+            self.stdout.write(
+                f"{name}: {results[name] * 1000:.1f} ms "
+                f"({results[name] / rows * 1_000_000:.1f} µs/fila)"
+            )
+        return results
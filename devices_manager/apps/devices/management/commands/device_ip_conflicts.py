@@ -0,0 +1,81 @@
+"""
+Management command to report duplicated device IPs and enforce unique IPs.
+"""
+
+from apps.devices.ip_conflicts import IPConflictError, find_ip_conflicts, set_unique_device_ips
+from apps.platforms.models import Platform
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Command to list the IP addresses shared by several devices of a platform
+    and to turn unique IP enforcement on or off.
+    """
+
+    help = "Informa las direcciones IP repetidas por plataforma y activa su unicidad"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--platform", type=int, help="ID de la plataforma (por defecto todas)")
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Direcciones IP listadas como máximo (por defecto DEVICES_IP_CONFLICTS_LIMIT)",
+        )
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument(
+            "--enforce",
+            action="store_true",
+            help="Exigir IPs únicas en la plataforma si no hay conflictos",
+        )
+        mode.add_argument(
+            "--release",
+            action="store_true",
+            help="Dejar de exigir IPs únicas en la plataforma",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Execute the command.
+        """
+        platform_id = options["platform"]
+        if options["enforce"] or options["release"]:
+            if platform_id is None:
+                raise CommandError("--enforce y --release requieren --platform")
+            try:
+                platform = Platform.objects.get(pk=platform_id)
+            except Platform.DoesNotExist:
+                raise CommandError(f"La plataforma {platform_id} no existe")
+            self.set_mode(platform, options["enforce"], options["limit"])
+            return
+
+        conflicts = find_ip_conflicts(platform_id, limit=options["limit"])
+        self.write_conflicts(conflicts)
+        self.stdout.write(
+            self.style.SUCCESS(f"✓ {len(conflicts)} direcciones IP repetidas encontradas")
+        )
+
+    def set_mode(self, platform, enabled, limit):
+        try:
+            updated = set_unique_device_ips(platform, enabled)
+        except IPConflictError as e:
+            self.write_conflicts(e.conflicts[:limit] if limit else e.conflicts)
+            raise CommandError(f"No se pueden exigir IPs únicas en {platform}: {e}")
+        state = "exigen" if enabled else "ya no exigen"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ Los dispositivos de {platform} {state} IPs únicas "
+                f"({updated} dispositivos actualizados)"
+            )
+        )
+
+    def write_conflicts(self, conflicts):
+        for conflict in conflicts:
+            devices = ", ".join(
+                f"{device['name']} (#{device['id']})" for device in conflict["devices"]
+            )
+            self.stdout.write(
+                f"Plataforma {conflict['platform_id']} · {conflict['ip_address']} · "
+                f"{conflict['count']} dispositivos: {devices}"
+            )
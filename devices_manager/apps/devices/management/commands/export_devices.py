@@ -0,0 +1,53 @@
+"""
+Management command to export a platform's devices.
+"""
+
+from apps.devices.export import FORMATS, export_stream
+from apps.platforms.models import Platform
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Command to stream every device of a platform as CSV or JSON lines.
+    """
+
+    help = "Exporta los dispositivos de una plataforma en CSV o JSONL"
+
+    def add_arguments(self, parser):
+        parser.add_argument("platform_id", type=int, help="ID de la plataforma")
+        parser.add_argument("--format", choices=list(FORMATS), default="csv", dest="file_format")
+        parser.add_argument("--gzip", action="store_true", help="Comprimir la salida con gzip")
+        parser.add_argument(
+            "--output",
+            "-o",
+            help="Archivo de salida (por defecto la salida estándar)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=None, help="Filas por bloque")
+
+    def handle(self, *args, **options):
+        """
+        Execute the command.
+        """
+        platform_id = options["platform_id"]
+        if options["gzip"] and not options["output"]:
+            raise CommandError("--gzip requiere --output")
+        if not Platform.objects.filter(pk=platform_id).exists():
+            raise CommandError(f"La plataforma {platform_id} no existe")
+
+        blocks = export_stream(
+            platform_id,
+            options["file_format"],
+            gzip=options["gzip"],
+            chunk_size=options["chunk_size"],
+        )
+        output = options["output"]
+        if output:
+            with open(output, "wb") as file:
+                for block in blocks:
+                    file.write(block)
+            self.stderr.write(self.style.SUCCESS(f"✓ Exportación escrita en {output}"))
+            return
+
+        for block in blocks:
+            self.stdout.write(block.decode(), ending="")
@@ -0,0 +1,81 @@
+"""
+Management command to import devices from a CSV or JSON lines file.
+"""
+
+import json
+
+from apps.devices.imports import (
+    IMPORT_FORMATS,
+    IMPORT_KEYS,
+    detect_format,
+    import_devices,
+    iter_records,
+)
+from apps.platforms.models import UserPlatform
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Command to upsert the devices of a user from a CSV or JSON lines file.
+    """
+
+    help = "Importa (crea o actualiza) dispositivos de un usuario desde un archivo CSV o JSONL"
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_platform_id", type=int, help="ID del usuario de plataforma")
+        parser.add_argument("path", help="Archivo CSV o JSONL (opcionalmente .gz)")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            dest="file_format",
+            help="Formato del archivo (por defecto según la extensión)",
+        )
+        parser.add_argument(
+            "--key",
+            choices=IMPORT_KEYS,
+            default="name",
+            help="Campo para identificar dispositivos existentes",
+        )
+        parser.add_argument("--batch-size", type=int, default=None, help="Filas por lote")
+        parser.add_argument("--report", help="Escribir el reporte completo en un archivo JSON")
+
+    def handle(self, *args, **options):
+        """
+        Execute the command.
+        """
+        try:
+            user_platform = UserPlatform.objects.get(pk=options["user_platform_id"])
+        except UserPlatform.DoesNotExist:
+            raise CommandError(f"El usuario de plataforma {options['user_platform_id']} no existe")
+
+        path = options["path"]
+        file_format = options["file_format"] or detect_format(path)
+        if file_format is None:
+            raise CommandError("No se pudo detectar el formato; use --format")
+
+        try:
+            with open(path, "rb") as file:
+                records = iter_records(file, file_format, compressed=path.endswith(".gz"))
+                report = import_devices(
+                    user_platform,
+                    records,
+                    key=options["key"],
+                    batch_size=options["batch_size"],
+                )
+        except OSError as e:
+            raise CommandError(f"No se pudo leer {path}: {e}")
+
+        if options["report"]:
+            with open(options["report"], "w") as file:
+                json.dump(report.as_dict(), file, ensure_ascii=False, indent=2)
+        for error in report.errors:
+            self.stderr.write(
+                f"Fila {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ {report.created} creados, {report.updated} actualizados, "
+                f"{report.failed} con errores"
+            )
+        )
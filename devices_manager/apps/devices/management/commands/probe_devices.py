@@ -0,0 +1,76 @@
+"""
+Management command to probe the reachability of devices.
+"""
+
+import time
+
+from apps.devices.prober import DeviceProber
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Command to run the device reachability prober, once or as a worker.
+    """
+
+    help = "Sondea por TCP la disponibilidad de los dispositivos activos"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Sondear los dispositivos pendientes una sola vez y terminar",
+        )
+        parser.add_argument(
+            "--ports",
+            help="Puertos TCP separados por comas (por defecto DEVICES_PROBE_PORTS)",
+        )
+        parser.add_argument("--timeout", type=float, default=None, help="Segundos por sondeo")
+        parser.add_argument(
+            "--concurrency", type=int, default=None, help="Sondeos simultáneos como máximo"
+        )
+        parser.add_argument("--batch-size", type=int, default=None, help="Dispositivos por lote")
+
+    def handle(self, *args, **options):
+        """
+        Execute the command.
+        """
+        ports = None
+        if options["ports"]:
+            try:
+                ports = [int(port) for port in options["ports"].split(",")]
+            except ValueError:
+                raise CommandError("--ports debe ser una lista de números separados por comas")
+
+        prober = DeviceProber(
+            ports=ports,
+            timeout=options["timeout"],
+            concurrency=options["concurrency"],
+            batch_size=options["batch_size"],
+        )
+        if options["once"]:
+            self.run_pass(prober)
+            return
+
+        poll_interval = getattr(settings, "DEVICES_PROBE_POLL_INTERVAL", 30)
+        try:
+            while True:
+                self.run_pass(prober)
+                wait = prober.seconds_until_due()
+                time.sleep(poll_interval if wait is None else min(max(wait, 1), poll_interval))
+        except KeyboardInterrupt:
+            self.stdout.write("Sondeo detenido")
+
+    def run_pass(self, prober):
+        started = time.monotonic()
+        report = prober.run_once()
+        if not report.probed:
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ {report.probed} dispositivos sondeados en "
+                f"{time.monotonic() - started:.1f}s: {report.reachable} alcanzables, "
+                f"{report.unreachable} sin respuesta, {report.changed} cambios de estado"
+            )
+        )
@@ -0,0 +1,42 @@
+"""
+Management command to prune old device tombstones.
+"""
+
+from apps.devices.models import DeviceTombstone
+from apps.devices.sync import tombstone_retention
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """
+    Command to delete tombstones older than DEVICES_TOMBSTONE_RETENTION_DAYS.
+    """
+
+    help = "Elimina el registro de dispositivos eliminados más antiguo que la retención"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Registros eliminados por sentencia",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Execute the command.
+        """
+        cutoff = timezone.now() - tombstone_retention()
+        total = 0
+        while True:
+            ids = list(
+                DeviceTombstone.objects.filter(deleted_at__lt=cutoff).values_list("pk", flat=True)[
+                    : options["batch_size"]
+                ]
+            )
+            if not ids:
+                break
+            deleted, _ = DeviceTombstone.objects.filter(pk__in=ids).delete()
+            total += deleted
+        self.stdout.write(self.style.SUCCESS(f"✓ {total} registros eliminados"))
@@ -0,0 +1,34 @@
+"""
+Management command to repair drifted device counters.
+"""
+
+from apps.devices.counters import reconcile_device_counters
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Command to recompute the device counters of users and platforms whose
+    denormalized values differ from the device table.
+    """
+
+    help = "Corrige los contadores de dispositivos de usuarios y plataformas"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo informar las diferencias, sin corregirlas",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Execute the command.
+        """
+        user_ids, platform_ids = reconcile_device_counters(dry_run=options["dry_run"])
+        verb = "con diferencias" if options["dry_run"] else "corregidos"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ {len(user_ids)} usuarios y {len(platform_ids)} plataformas {verb}"
+            )
+        )
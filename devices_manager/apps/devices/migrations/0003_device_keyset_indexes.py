@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("devices", "0002_alter_device_created_by_alter_device_updated_by"),
+        ("platforms", "0002_alter_platform_created_by_alter_platform_updated_by_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["user_platform", "created_at", "id"], name="devices_dev_user_pl_743ede_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["user_platform", "name", "id"], name="devices_dev_user_pl_ce543f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["user_platform", "updated_at", "id"], name="devices_dev_user_pl_8b846d_idx"
+            ),
+        ),
+    ]
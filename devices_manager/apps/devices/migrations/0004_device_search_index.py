@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from apps.devices.search import install_search_index
+
+    install_search_index(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    from apps.devices.search import uninstall_search_index
+
+    uninstall_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("devices", "0003_device_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:46
+
+import ipaddress
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_ip_int(apps, schema_editor):
+    Device = apps.get_model("devices", "Device")
+    last_pk = 0
+    while True:
+        batch = list(
+            Device.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .only("pk", "ip_address")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for device in batch:
+            device.ip_int = int(ipaddress.IPv4Address(device.ip_address))
+        Device.objects.bulk_update(batch, ["ip_int"])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("devices", "0004_device_search_index"),
+        ("platforms", "0002_alter_platform_created_by_alter_platform_updated_by_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="device",
+            name="ip_int",
+            field=models.BigIntegerField(
+                blank=True, editable=False, null=True, verbose_name="Dirección IP numérica"
+            ),
+        ),
+        migrations.RunPython(backfill_ip_int, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["user_platform", "ip_int", "id"], name="devices_dev_user_pl_aeaece_idx"
+            ),
+        ),
+    ]
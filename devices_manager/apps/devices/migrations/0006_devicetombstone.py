@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("devices", "0005_device_ip_int"),
+        ("platforms", "0003_userplatform_devices_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeviceTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("device_id", models.BigIntegerField(verbose_name="ID del dispositivo")),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Fecha de eliminación"
+                    ),
+                ),
+                (
+                    "user_platform",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="device_tombstones",
+                        to="platforms.userplatform",
+                        verbose_name="Usuario de Plataforma",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Dispositivo eliminado",
+                "verbose_name_plural": "Dispositivos eliminados",
+                "indexes": [
+                    models.Index(
+                        fields=["user_platform", "deleted_at"],
+                        name="devices_dev_user_pl_38fe8d_idx",
+                    ),
+                    models.Index(fields=["deleted_at"], name="devices_dev_deleted_cd178a_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,116 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:13
+
+import django.db.models.deletion
+from apps.devices.search import KeepSearchIndex
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+BATCH_SIZE = 10000
+
+
+def backfill_platform(apps, schema_editor):
+    Device = apps.get_model("devices", "Device")
+    UserPlatform = apps.get_model("platforms", "UserPlatform")
+    platform_id = UserPlatform.objects.filter(pk=OuterRef("user_platform_id")).values("platform_id")
+    last_pk = Device.objects.aggregate(last_pk=Max("pk"))["last_pk"] or 0
+    # One UPDATE per primary key range keeps each statement (and its locks) small.
+    for start in range(0, last_pk, BATCH_SIZE):
+        Device.objects.filter(pk__gt=start, pk__lte=start + BATCH_SIZE).update(
+            platform_id=Subquery(platform_id)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("devices", "0006_devicetombstone"),
+        ("platforms", "0004_device_counters"),
+    ]
+
+    operations = [
+        KeepSearchIndex(
+            [
+                migrations.AddField(
+                    model_name="device",
+                    name="platform",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        editable=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="devices",
+                        to="platforms.platform",
+                        verbose_name="Plataforma",
+                    ),
+                ),
+                migrations.RunPython(backfill_platform, migrations.RunPython.noop),
+                migrations.AlterField(
+                    model_name="device",
+                    name="platform",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        editable=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="devices",
+                        to="platforms.platform",
+                        verbose_name="Plataforma",
+                    ),
+                ),
+            ]
+        ),
+        migrations.RemoveIndex(
+            model_name="device",
+            name="devices_dev_user_pl_b1b130_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="device",
+            name="devices_dev_user_pl_743ede_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="device",
+            name="devices_dev_user_pl_ce543f_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="device",
+            name="devices_dev_user_pl_8b846d_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="device",
+            name="devices_dev_user_pl_aeaece_idx",
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["platform", "user_platform", "is_active"],
+                name="devices_dev_platfor_daeadf_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["platform", "user_platform", "created_at", "id"],
+                name="devices_dev_platfor_8dd75d_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["platform", "user_platform", "name", "id"],
+                name="devices_dev_platfor_eb0230_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["platform", "user_platform", "updated_at", "id"],
+                name="devices_dev_platfor_84b001_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["platform", "user_platform", "ip_int", "id"],
+                name="devices_dev_platfor_fd86a0_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:21
+
+from apps.devices.search import KeepSearchIndex
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("devices", "0007_device_platform"),
+        ("platforms", "0004_device_counters"),
+    ]
+
+    operations = [
+        KeepSearchIndex(
+            [
+                migrations.AddField(
+                    model_name="device",
+                    name="last_seen",
+                    field=models.DateTimeField(
+                        blank=True, editable=False, null=True, verbose_name="Última respuesta"
+                    ),
+                ),
+                migrations.AddField(
+                    model_name="device",
+                    name="next_probe_at",
+                    field=models.DateTimeField(
+                        blank=True, editable=False, null=True, verbose_name="Próximo sondeo"
+                    ),
+                ),
+                migrations.AddField(
+                    model_name="device",
+                    name="probe_failures",
+                    field=models.PositiveIntegerField(
+                        default=0, editable=False, verbose_name="Sondeos fallidos seguidos"
+                    ),
+                ),
+                migrations.AddField(
+                    model_name="device",
+                    name="reachable",
+                    field=models.BooleanField(editable=False, null=True, verbose_name="Alcanzable"),
+                ),
+            ]
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["is_active", "next_probe_at"], name="devices_dev_is_acti_e827bb_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:35
+
+from apps.devices.search import KeepSearchIndex
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("devices", "0008_device_reachability"),
+        ("platforms", "0005_platform_unique_device_ips"),
+    ]
+
+    operations = [
+        KeepSearchIndex(
+            [
+                migrations.AddField(
+                    model_name="device",
+                    name="ip_unique",
+                    field=models.BooleanField(
+                        default=False, editable=False, verbose_name="IP única"
+                    ),
+                ),
+            ]
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["platform", "ip_int"], name="devices_dev_platfor_d1d726_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="device",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("ip_unique", True)),
+                fields=("platform", "ip_address"),
+                name="devices_unique_ip_per_platform",
+                violation_error_message="Ya existe un dispositivo con esta dirección IP en la plataforma.",
+            ),
+        ),
+    ]
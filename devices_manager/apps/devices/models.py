@@ -2,10 +2,320 @@
 Device models.
 """
 
+import functools
+import ipaddress
+
 from apps.core.models import BaseModel
-from apps.platforms.models import UserPlatform
+from apps.devices.signals import devices_changed
+from apps.platforms.models import Platform, UserPlatform
 from django.core.validators import validate_ipv4_address
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Subquery
+from django.utils import timezone
+
+
+def forget_ip_unique(device):
+    """
+    Drop the subquery assign_platforms set as ip_unique once it is written,
+    so reading the field loads the stored value.
+    """
+    device.__dict__.pop("ip_unique", None)
+
+
+def notify_changed(action, rows, counter_deltas=None):
+    """
+    Send devices_changed for (device id, user_platform id) pairs, with the
+    change in each user's (total, active) device counts.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    devices_changed.send(
+        sender=Device,
+        user_platform_ids={user_platform_id for _, user_platform_id in rows},
+        device_ids=[pk for pk, _ in rows],
+        rows=rows,
+        action=action,
+        counter_deltas=counter_deltas or {},
+    )
+
+
+def count_deltas(items):
+    """
+    Sum (user_platform id, total delta, active delta) triples per user,
+    dropping users whose counts do not change.
+    """
+    deltas = {}
+    for user_platform_id, total, active in items:
+        current = deltas.get(user_platform_id, (0, 0))
+        deltas[user_platform_id] = (current[0] + total, current[1] + active)
+    return {key: value for key, value in deltas.items() if value != (0, 0)}
+
+
+def atomic_write(method):
+    """
+    Run a device write and the devices_changed receivers it triggers
+    (version stamps, counters, tombstones) in one transaction, so a failure
+    in between rolls the write back instead of leaving the counters drifted.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if isinstance(self, models.QuerySet):
+            using = self.db
+        else:
+            using = kwargs.get("using") or self._state.db
+        with transaction.atomic(using=using, savepoint=False):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def ip_to_int(value):
+    """
+    Return the integer form of an IPv4 address, or None for empty values.
+    """
+    if value in (None, ""):
+        return None
+    return int(ipaddress.IPv4Address(value))
+
+
+class DeviceQuerySet(models.QuerySet):
+    """
+    QuerySet keeping Device.ip_int in sync on bulk writes and sending
+    devices_changed for writes that do not go through Device.save/delete.
+    """
+
+    # Cleared on the querysets bulk_update() runs its UPDATEs on, so they
+    # are not pre-selected and notified a second time; both are cleared by
+    # update_quietly().
+    _notify_changes = True
+    _touch_updated_at = True
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._notify_changes = self._notify_changes
+        clone._touch_updated_at = self._touch_updated_at
+        return clone
+
+    def assign_platforms(self, objs):
+        """
+        Set platform from user_platform on devices that lack it, reading the
+        cached user_platform (and its platform instance) when loaded and
+        querying the rest at once. ip_unique is set to a subquery on the
+        platform's unique_device_ips, so the write copies the flag from the
+        platform row rather than from a possibly stale platform instance.
+        """
+        missing = {}
+        for obj in objs:
+            if Device.user_platform.is_cached(obj):
+                user_platform = obj.user_platform
+                if UserPlatform.platform.is_cached(user_platform):
+                    obj.platform = user_platform.platform
+                else:
+                    obj.platform_id = user_platform.platform_id
+            elif obj.platform_id is None:
+                missing.setdefault(obj.user_platform_id, []).append(obj)
+        if missing:
+            platform_ids = dict(
+                UserPlatform.objects.using(self.db)
+                .filter(pk__in=list(missing))
+                .values_list("pk", "platform_id")
+            )
+            for user_platform_id, devices in missing.items():
+                for obj in devices:
+                    obj.platform_id = platform_ids.get(user_platform_id)
+        unique_ips = {}
+        for obj in objs:
+            if obj.platform_id not in unique_ips:
+                unique_ips[obj.platform_id] = Subquery(
+                    Platform.objects.filter(pk=obj.platform_id).values("unique_device_ips")
+                )
+            obj.ip_unique = unique_ips[obj.platform_id]
+
+    def for_user_platform(self, user_platform):
+        """
+        Devices of `user_platform`, filtered on the device table alone.
+        Loaded devices get the given user_platform (and its platform, when
+        loaded) attached the way related managers do, instead of joining
+        their tables.
+        """
+        queryset = self.filter(platform_id=user_platform.platform_id, user_platform=user_platform)
+        known = {Device._meta.get_field("user_platform"): {user_platform.pk: user_platform}}
+        if UserPlatform.platform.is_cached(user_platform):
+            known[Device._meta.get_field("platform")] = {
+                user_platform.platform_id: user_platform.platform
+            }
+        queryset._known_related_objects = known
+        return queryset
+
+    @atomic_write
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self.assign_platforms(objs)
+        for obj in objs:
+            obj.ip_int = ip_to_int(obj.ip_address)
+        objs = super().bulk_create(objs, *args, **kwargs)
+        for obj in objs:
+            forget_ip_unique(obj)
+        deltas = count_deltas((obj.user_platform_id, 1, int(obj.is_active)) for obj in objs)
+        notify_changed("created", [(obj.pk, obj.user_platform_id) for obj in objs], deltas)
+        for obj in objs:
+            obj._loaded_is_active = obj.is_active
+            obj._loaded_user_platform_id = obj.user_platform_id
+        return objs
+
+    @atomic_write
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if "ip_address" in fields:
+            objs = list(objs)
+            for obj in objs:
+                obj.ip_int = ip_to_int(obj.ip_address)
+            fields = [*fields, "ip_int"]
+        objs = list(objs)
+        queryset = self._chain()
+        queryset._notify_changes = False
+        updated = super(DeviceQuerySet, queryset).bulk_update(objs, fields, *args, **kwargs)
+        deltas = {}
+        if "is_active" in fields:
+            deltas = count_deltas(obj.pop_active_delta() for obj in objs)
+        notify_changed("updated", [(obj.pk, obj.user_platform_id) for obj in objs], deltas)
+        return updated
+
+    def update_quietly(self, **kwargs):
+        """
+        update() without bumping updated_at or sending devices_changed, for
+        bookkeeping columns clients are not notified about (probe results).
+        """
+        queryset = self._chain()
+        queryset._notify_changes = False
+        queryset._touch_updated_at = False
+        return queryset.update(**kwargs)
+
+    @atomic_write
+    def update(self, **kwargs):
+        # auto_now is not applied by update(); delta sync relies on updated_at.
+        if self._touch_updated_at:
+            kwargs.setdefault("updated_at", timezone.now())
+        if isinstance(kwargs.get("ip_address"), str):
+            kwargs.setdefault("ip_int", ip_to_int(kwargs["ip_address"]))
+        if not self._notify_changes:
+            return super().update(**kwargs)
+        if "is_active" not in kwargs:
+            rows = list(self.values_list("pk", "user_platform_id"))
+            updated = super().update(**kwargs)
+            notify_changed("updated", rows)
+            return updated
+
+        before = list(self.values_list("pk", "user_platform_id", "is_active"))
+        updated = super().update(**kwargs)
+        if isinstance(kwargs["is_active"], bool):
+            after = dict.fromkeys((pk for pk, _, _ in before), kwargs["is_active"])
+        else:
+            after = dict(
+                self.model.objects.db_manager(self.db)
+                .filter(pk__in=[pk for pk, _, _ in before])
+                .values_list("pk", "is_active")
+            )
+        deltas = count_deltas(
+            (user_platform_id, 0, int(after.get(pk, was_active)) - int(was_active))
+            for pk, user_platform_id, was_active in before
+        )
+        notify_changed(
+            "updated", [(pk, user_platform_id) for pk, user_platform_id, _ in before], deltas
+        )
+        return updated
+
+    @atomic_write
+    def delete(self):
+        rows = list(self.values_list("pk", "user_platform_id", "is_active"))
+        deleted = super().delete()
+        deltas = count_deltas(
+            (user_platform_id, -1, -int(is_active)) for _, user_platform_id, is_active in rows
+        )
+        notify_changed(
+            "deleted", [(pk, user_platform_id) for pk, user_platform_id, _ in rows], deltas
+        )
+        return deleted
+
+    def _update_returning(self, assignments, params, returning):
+        """
+        Return the SQL and params of a single UPDATE of the rows of this
+        queryset, with RETURNING (SQLite >= 3.35 and PostgreSQL).
+        The queryset is applied as a primary-key subquery so its joins and
+        filters (search, IP ranges) keep working.
+        """
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        subquery, subquery_params = (
+            self.order_by().values("pk").query.get_compiler(self.db).as_sql()
+        )
+        sql = (
+            f"UPDATE {quote(self.model._meta.db_table)} SET {assignments} "
+            f"WHERE {quote(self.model._meta.pk.column)} IN ({subquery}) "
+            f"RETURNING {returning}"
+        )
+        return sql, [*params, *subquery_params]
+
+    def _audit_assignments(self, updated_by):
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        updated_at = self.model._meta.get_field("updated_at")
+        updated_by_column = self.model._meta.get_field("updated_by").column
+        sql = f"{quote(updated_at.column)} = %s, {quote(updated_by_column)} = %s"
+        params = [
+            updated_at.get_db_prep_value(timezone.now(), connection),
+            updated_by.pk if updated_by is not None else None,
+        ]
+        return sql, params
+
+    @atomic_write
+    def toggle_active(self, updated_by=None):
+        """
+        Flip is_active of the devices of this queryset with a single
+        `UPDATE ... SET is_active = NOT is_active ... RETURNING` statement and
+        return the updated devices. Concurrent toggles serialize on the row
+        instead of overwriting each other.
+        """
+        quote = connections[self.db].ops.quote_name
+        column = quote(self.model._meta.get_field("is_active").column)
+        audit_sql, audit_params = self._audit_assignments(updated_by)
+        returning = ", ".join(quote(field.column) for field in self.model._meta.concrete_fields)
+        sql, params = self._update_returning(
+            f"{column} = NOT {column}, {audit_sql}", audit_params, returning
+        )
+        devices = list(self.model.objects.db_manager(self.db).raw(sql, params))
+        deltas = count_deltas(
+            (device.user_platform_id, 0, 1 if device.is_active else -1) for device in devices
+        )
+        notify_changed(
+            "toggled", [(device.pk, device.user_platform_id) for device in devices], deltas
+        )
+        return devices
+
+    @atomic_write
+    def set_active(self, is_active, updated_by=None):
+        """
+        Set is_active on every device of this queryset that does not have it
+        yet, in a single UPDATE. Returns the number of devices changed.
+        """
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        field = self.model._meta.get_field("is_active")
+        audit_sql, audit_params = self._audit_assignments(updated_by)
+        sql, params = self.exclude(is_active=is_active)._update_returning(
+            f"{quote(field.column)} = %s, {audit_sql}",
+            [field.get_db_prep_value(is_active, connection), *audit_params],
+            f"{quote(self.model._meta.pk.column)}, "
+            f"{quote(self.model._meta.get_field('user_platform').column)}",
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        step = 1 if is_active else -1
+        deltas = count_deltas((user_platform_id, 0, step) for _, user_platform_id in rows)
+        notify_changed("toggled", rows, deltas)
+        return len(rows)
 
 
 class Device(BaseModel):
@@ -19,6 +329,12 @@ class Device(BaseModel):
         validators=[validate_ipv4_address],
         verbose_name="Dirección IP",
     )
+    ip_int = models.BigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Dirección IP numérica",
+    )
     is_active = models.BooleanField(default=True, verbose_name="Activo")
     user_platform = models.ForeignKey(
         UserPlatform,
@@ -26,14 +342,193 @@ class Device(BaseModel):
         related_name="devices",
         verbose_name="Usuario de Plataforma",
     )
+    # Copy of user_platform.platform, so tenant-scoped queries and
+    # per-platform scans run on this table alone. The composite indexes
+    # below lead with it, so it needs no index of its own.
+    platform = models.ForeignKey(
+        Platform,
+        on_delete=models.CASCADE,
+        related_name="devices",
+        db_index=False,
+        editable=False,
+        verbose_name="Plataforma",
+    )
+    # Reachability, written by the prober (apps.devices.prober). reachable is
+    # None until the first probe.
+    reachable = models.BooleanField(null=True, editable=False, verbose_name="Alcanzable")
+    last_seen = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="Última respuesta"
+    )
+    next_probe_at = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="Próximo sondeo"
+    )
+    probe_failures = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Sondeos fallidos seguidos"
+    )
+    # Copy of platform.unique_device_ips, set by assign_platforms: the
+    # partial unique index below only covers devices of platforms enforcing
+    # unique IP addresses.
+    ip_unique = models.BooleanField(default=False, editable=False, verbose_name="IP única")
+
+    # Only written by the prober, so a full save() of a possibly stale
+    # instance never overwrites them.
+    probe_fields = {"reachable", "last_seen", "next_probe_at", "probe_failures"}
+
+    objects = DeviceQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Dispositivo"
         verbose_name_plural = "Dispositivos"
         ordering = ["name"]
         indexes = [
-            models.Index(fields=["user_platform", "is_active"]),
+            models.Index(fields=["platform", "user_platform", "is_active"]),
+            models.Index(fields=["platform", "user_platform", "created_at", "id"]),
+            models.Index(fields=["platform", "user_platform", "name", "id"]),
+            models.Index(fields=["platform", "user_platform", "updated_at", "id"]),
+            models.Index(fields=["platform", "user_platform", "ip_int", "id"]),
+            models.Index(fields=["platform", "ip_int"]),
+            models.Index(fields=["is_active", "next_probe_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["platform", "ip_address"],
+                condition=models.Q(ip_unique=True),
+                name="devices_unique_ip_per_platform",
+                violation_error_message=(
+                    "Ya existe un dispositivo con esta dirección IP en la plataforma."
+                ),
+            ),
         ]
 
     def __str__(self):
         return f"{self.name} ({self.ip_address})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_active = instance.__dict__.get("is_active")
+        instance._loaded_user_platform_id = instance.__dict__.get("user_platform_id")
+        return instance
+
+    def pop_active_delta(self):
+        """
+        Return (user_platform id, 0, active delta) for the is_active change
+        since the device was loaded or last saved, and mark it as saved.
+        Devices whose stored state is unknown report no change.
+        """
+        loaded = getattr(self, "_loaded_is_active", None)
+        self._loaded_is_active = self.is_active
+        if loaded is None:
+            return self.user_platform_id, 0, 0
+        return self.user_platform_id, 0, int(self.is_active) - int(loaded)
+
+    @atomic_write
+    def save(self, *args, **kwargs):
+        """
+        Keep ip_int and platform in sync and send devices_changed.
+        platform and ip_unique are only written on creation and when the
+        device moves to another user_platform, with ip_unique read from the
+        platform row, so neither a stale instance nor a stale principal
+        undoes set_unique_device_ips.
+        """
+        adding = self._state.adding
+        previous_owner = getattr(self, "_loaded_user_platform_id", None)
+        if not adding and kwargs.get("update_fields") is None:
+            moved = self.user_platform_id != previous_owner
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.probe_fields
+                and field.name not in ("platform", "ip_unique")
+                and (moved or field.name != "user_platform")
+            ]
+        self.ip_int = ip_to_int(self.ip_address)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "ip_address" in update_fields:
+            kwargs["update_fields"] = update_fields = {*update_fields, "ip_int"}
+        assign = adding or (update_fields is not None and "user_platform" in update_fields)
+        if assign:
+            if not adding and not Device.user_platform.is_cached(self):
+                # Moved by id: read the platform of the new user_platform.
+                self.platform_id = None
+            Device.objects.db_manager(kwargs.get("using") or self._state.db).assign_platforms(
+                [self]
+            )
+            if update_fields is not None:
+                kwargs["update_fields"] = update_fields = {*update_fields, "platform", "ip_unique"}
+        super().save(*args, **kwargs)
+        self._loaded_user_platform_id = self.user_platform_id
+        if assign:
+            forget_ip_unique(self)
+        if adding:
+            self._loaded_is_active = self.is_active
+            deltas = count_deltas([(self.user_platform_id, 1, int(self.is_active))])
+            notify_changed("created", [(self.pk, self.user_platform_id)], deltas)
+            return
+        if previous_owner is not None and previous_owner != self.user_platform_id:
+            self.notify_moved(previous_owner, "is_active" in update_fields)
+            return
+        deltas = {}
+        if update_fields is None or "is_active" in update_fields:
+            deltas = count_deltas([self.pop_active_delta()])
+        notify_changed("updated", [(self.pk, self.user_platform_id)], deltas)
+
+    def notify_moved(self, previous_owner, saved_active):
+        """
+        Send devices_changed for a device saved under another user_platform:
+        to the user it was loaded with it is deleted, leaving its counts, and
+        to its new user it is created, as stored.
+        """
+        loaded = getattr(self, "_loaded_is_active", None)
+        was_active = self.is_active if loaded is None else loaded
+        is_active = self.is_active if saved_active else was_active
+        self._loaded_is_active = is_active
+        notify_changed(
+            "deleted",
+            [(self.pk, previous_owner)],
+            count_deltas([(previous_owner, -1, -int(was_active))]),
+        )
+        notify_changed(
+            "created",
+            [(self.pk, self.user_platform_id)],
+            count_deltas([(self.user_platform_id, 1, int(is_active))]),
+        )
+
+    @atomic_write
+    def delete(self, *args, **kwargs):
+        """
+        Delete the device and send devices_changed.
+        """
+        rows = [(self.pk, self.user_platform_id)]
+        deltas = count_deltas([(self.user_platform_id, -1, -int(self.is_active))])
+        deleted = super().delete(*args, **kwargs)
+        notify_changed("deleted", rows, deltas)
+        return deleted
+
+
+class DeviceTombstone(models.Model):
+    """
+    Deletion log used by the delta-sync endpoint to report deleted devices.
+    Rows older than DEVICES_TOMBSTONE_RETENTION can be pruned.
+    """
+
+    device_id = models.BigIntegerField(verbose_name="ID del dispositivo")
+    user_platform = models.ForeignKey(
+        UserPlatform,
+        on_delete=models.CASCADE,
+        related_name="device_tombstones",
+        verbose_name="Usuario de Plataforma",
+    )
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name="Fecha de eliminación")
+
+    class Meta:
+        verbose_name = "Dispositivo eliminado"
+        verbose_name_plural = "Dispositivos eliminados"
+        indexes = [
+            models.Index(fields=["user_platform", "deleted_at"]),
+            models.Index(fields=["deleted_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.device_id} ({self.deleted_at})"
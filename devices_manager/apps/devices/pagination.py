@@ -0,0 +1,169 @@
+"""
+Device pagination classes.
+"""
+
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over (<ordering field>, pk).
+
+    Pages are located with a range condition on the ordering column plus the
+    primary key as tie-breaker, so deep pages cost the same as the first one
+    and no COUNT(*) is issued. Cursors are opaque base64 tokens bound to the
+    ordering they were produced with.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    mode = "cursor"
+    invalid_cursor_message = "Cursor inválido."
+
+    @classmethod
+    def is_requested(cls, request):
+        """
+        Return True if the request asks for keyset pagination.
+        """
+        params = request.query_params
+        return cls.cursor_query_param in params or params.get(cls.mode_query_param) == cls.mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.field = self.get_ordering_field(queryset.model)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = bool(self.cursor and self.cursor["r"])
+        descending = self.ordering.startswith("-") != reverse
+        name = self.field.name
+        if descending:
+            queryset = queryset.order_by(f"-{name}", "-pk")
+        else:
+            queryset = queryset.order_by(name, "pk")
+
+        if self.cursor is not None:
+            value, pk = self.cursor["v"], self.cursor["i"]
+            # The redundant bound on the ordering column gives the planner an
+            # index range to seek to; the OR clause breaks ties on pk.
+            if descending:
+                condition = Q(**{f"{name}__lte": value}) & (
+                    Q(**{f"{name}__lt": value}) | Q(pk__lt=pk)
+                )
+            else:
+                condition = Q(**{f"{name}__gte": value}) & (
+                    Q(**{f"{name}__gt": value}) | Q(pk__gt=pk)
+                )
+            queryset = queryset.filter(condition)
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = results
+        return results
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the single ordering term the pages are keyed on, as resolved
+        by the view's ordering filter.
+        """
+        backends = getattr(view, "filter_backends", [])
+        ordering_filter = next(
+            (backend() for backend in backends if issubclass(backend, OrderingFilter)),
+            OrderingFilter(),
+        )
+        ordering = ordering_filter.get_ordering(request, queryset, view) or ["-pk"]
+        return ordering[0]
+
+    def get_ordering_field(self, model):
+        """
+        Return the model field behind the ordering term.
+        """
+        name = self.ordering.lstrip("-")
+        if name == "pk":
+            return model._meta.pk
+        return model._meta.get_field(name)
+
+    def decode_cursor(self, request):
+        """
+        Decode the cursor query parameter, or return None for the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            if cursor["o"] != self.ordering:
+                raise ValueError("ordering mismatch")
+            return {
+                "v": self.field.to_python(cursor["v"]),
+                "i": int(cursor["i"]),
+                "r": bool(cursor["r"]),
+            }
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse):
+        """
+        Return the URL of the page starting after (or before) the given row.
+        """
+        cursor = {
+            "o": self.ordering,
+            "v": self.field.value_to_string(instance),
+            "i": instance.pk,
+            "r": int(reverse),
+        }
+        encoded = urlsafe_b64encode(json.dumps(cursor, separators=(",", ":")).encode())
+        url = remove_query_param(self.base_url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded.decode("ascii"))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
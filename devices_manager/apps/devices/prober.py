@@ -0,0 +1,226 @@
+"""
+Asynchronous TCP reachability prober for devices.
+"""
+
+import asyncio
+import random
+from datetime import timedelta
+
+from apps.devices.models import Device
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+
+async def _connect(host, port):
+    """
+    Return True if `host` accepts or actively refuses a TCP connection on
+    `port`, False if the attempt fails otherwise (unreachable network...).
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        transport, _ = await loop.create_connection(asyncio.Protocol, host, port)
+    except ConnectionRefusedError:
+        # A reset comes from the host itself: it is up, the port is closed.
+        return True
+    except OSError:
+        return False
+    transport.abort()
+    return True
+
+
+async def probe_host(host, ports, timeout):
+    """
+    Return True if `host` answers on any of `ports` within `timeout` seconds.
+    The ports are tried concurrently and the first answer wins.
+    """
+    attempts = [asyncio.ensure_future(_connect(host, port)) for port in ports]
+    try:
+        for attempt in asyncio.as_completed(attempts, timeout=timeout):
+            if await attempt:
+                return True
+        return False
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
+
+
+def backoff_exponent(failures, interval, max_interval):
+    """
+    Return the exponent of the retry delay after `failures` consecutive
+    failures, capped where interval * 2**exponent reaches max_interval.
+    """
+    exponent = 0
+    while exponent < failures and interval * 2**exponent < max_interval:
+        exponent += 1
+    return exponent
+
+
+def next_probe_delay(exponent, interval, max_interval, jitter=1.0):
+    """
+    Seconds until the next probe: `interval` for devices that answer, doubled
+    per consecutive failure (see backoff_exponent) up to `max_interval`,
+    scaled by `jitter`.
+    """
+    return min(interval * 2**exponent, max_interval) * jitter
+
+
+class ProbeReport:
+    """
+    Counters of a prober pass.
+    """
+
+    def __init__(self):
+        self.probed = 0
+        self.reachable = 0
+        self.changed = 0
+
+    @property
+    def unreachable(self):
+        return self.probed - self.reachable
+
+
+class DeviceProber:
+    """
+    Probe the reachability of active devices whose next probe is due.
+
+    Devices are read in batches of `batch_size`. Each batch is probed on one
+    asyncio event loop with at most `concurrency` probes in flight, so a
+    single core keeps thousands of connection attempts going, and written
+    back with a few grouped UPDATEs. Memory is bounded by the batch size.
+
+    Devices whose reachability changed get updated_at bumped and are
+    notified through devices_changed (response caches, delta sync, SSE);
+    last_seen refreshes of devices that stay reachable are written without
+    notifying clients.
+    """
+
+    def __init__(
+        self,
+        ports=None,
+        timeout=None,
+        concurrency=None,
+        batch_size=None,
+        interval=None,
+        max_interval=None,
+    ):
+        self.ports = ports or getattr(settings, "DEVICES_PROBE_PORTS", [22, 80, 443])
+        self.timeout = timeout or getattr(settings, "DEVICES_PROBE_TIMEOUT", 2)
+        self.concurrency = concurrency or getattr(settings, "DEVICES_PROBE_CONCURRENCY", 500)
+        self.batch_size = batch_size or getattr(settings, "DEVICES_PROBE_BATCH_SIZE", 2000)
+        self.interval = interval or getattr(settings, "DEVICES_PROBE_INTERVAL", 300)
+        self.max_interval = max_interval or getattr(settings, "DEVICES_PROBE_MAX_INTERVAL", 3600)
+
+    def due_devices(self, now):
+        """
+        Active devices never probed or whose next probe is due.
+        """
+        return Device.objects.filter(
+            Q(next_probe_at__isnull=True) | Q(next_probe_at__lte=now), is_active=True
+        )
+
+    def seconds_until_due(self, now=None):
+        """
+        Seconds until the next active device is due, or None without devices.
+        """
+        now = now or timezone.now()
+        active = Device.objects.filter(is_active=True)
+        if active.filter(next_probe_at__isnull=True).exists():
+            return 0
+        next_probe_at = active.aggregate(next_probe_at=Min("next_probe_at"))["next_probe_at"]
+        if next_probe_at is None:
+            return None
+        return max((next_probe_at - now).total_seconds(), 0)
+
+    async def probe_all(self, hosts):
+        """
+        Probe hosts concurrently, at most `concurrency` at a time.
+        Returns one boolean per host, in order.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(host):
+            async with semaphore:
+                return await probe_host(host, self.ports, self.timeout)
+
+        return await asyncio.gather(*(bounded(host) for host in hosts))
+
+    def run_once(self, now=None):
+        """
+        Probe every device due at `now` (default: the start of the pass).
+        Returns a ProbeReport.
+        """
+        now = now or timezone.now()
+        report = ProbeReport()
+        due = (
+            self.due_devices(now)
+            .order_by("pk")
+            .values_list("pk", "ip_address", "reachable", "probe_failures")
+        )
+        last_pk = 0
+        while rows := list(due.filter(pk__gt=last_pk)[: self.batch_size]):
+            results = asyncio.run(self.probe_all([row[1] for row in rows]))
+            self.save_results(rows, results, report)
+            last_pk = rows[-1][0]
+        return report
+
+    def save_results(self, rows, results, report):
+        """
+        Write a batch of probe results.
+
+        Devices are grouped by outcome (reachable, state changed) and each
+        group is written with one UPDATE ... WHERE id IN (...), so a batch
+        costs a handful of statements instead of the per-row CASE
+        expressions of bulk_update(). next_probe_at gets its own ±10% jitter
+        per device, which keeps devices from probing in lockstep, and is
+        written with a single executemany() of a primary-key UPDATE.
+        """
+        now = timezone.now()
+        groups = {}
+        schedule = []
+        for (pk, _, was_reachable, failures), reachable in zip(rows, results):
+            exponent = (
+                0 if reachable else backoff_exponent(failures + 1, self.interval, self.max_interval)
+            )
+            delay = next_probe_delay(
+                exponent, self.interval, self.max_interval, random.uniform(0.9, 1.1)
+            )
+            schedule.append((now + timedelta(seconds=delay), pk))
+            groups.setdefault((reachable, reachable != was_reachable), []).append(pk)
+            report.probed += 1
+            report.reachable += reachable
+
+        with transaction.atomic():
+            for (reachable, changed), pks in groups.items():
+                values = {"reachable": reachable}
+                if reachable:
+                    values.update(last_seen=now, probe_failures=0)
+                else:
+                    values["probe_failures"] = F("probe_failures") + 1
+                devices = Device.objects.filter(pk__in=pks)
+                if changed:
+                    # Notified like any other edit: updated_at, caches, delta sync, SSE.
+                    devices.update(**values)
+                    report.changed += len(pks)
+                else:
+                    devices.update_quietly(**values)
+            self.schedule(schedule)
+
+    def schedule(self, schedule):
+        """
+        Set next_probe_at from (datetime, device pk) pairs.
+        """
+        connection = connections[Device.objects.db]
+        quote = connection.ops.quote_name
+        field = Device._meta.get_field("next_probe_at")
+        sql = (
+            f"UPDATE {quote(Device._meta.db_table)} SET {quote(field.column)} = %s "
+            f"WHERE {quote(Device._meta.pk.column)} = %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                sql, [(field.get_db_prep_value(when, connection), pk) for when, pk in schedule]
+            )
@@ -0,0 +1,35 @@
+"""
+Device renderers.
+"""
+
+import json
+
+from apps.core import renderers as core_renderers
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def dumps_row(row):
+    """
+    Encode one row as compact UTF-8 JSON, the same way JSONRenderer does,
+    with orjson when it is installed.
+    """
+    if core_renderers.orjson is not None:
+        return core_renderers.orjson_dumps(row)
+    return json.dumps(row, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON: one object per line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return b"".join(dumps_row(row) + b"\n" for row in rows)
@@ -0,0 +1,215 @@
+"""
+Indexed search backends for devices.
+"""
+
+import functools
+import sqlite3
+from contextlib import closing
+
+from django.conf import settings
+from django.db import connections, migrations
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework import filters
+
+FTS_TABLE = "devices_device_fts"
+
+# SQLite: external-content FTS5 table with the trigram tokenizer, so MATCH
+# gives case-insensitive substring matches like icontains. Triggers keep it in
+# sync with every write, including bulk and raw SQL statements.
+SQLITE_FTS_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, ip_address, content='devices_device', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON devices_device BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, ip_address)
+        VALUES (new.id, new.name, new.ip_address);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON devices_device BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, ip_address)
+        VALUES ('delete', old.id, old.name, old.ip_address);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, ip_address
+    ON devices_device BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, ip_address)
+        VALUES ('delete', old.id, old.name, old.ip_address);
+        INSERT INTO {FTS_TABLE}(rowid, name, ip_address)
+        VALUES (new.id, new.name, new.ip_address);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_FTS_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# PostgreSQL: trigram GIN indexes on the exact expressions Django emits for
+# icontains (UPPER(col::text) and UPPER(HOST(inet))).
+POSTGRES_TRGM_INSTALL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS devices_device_name_trgm "
+    "ON devices_device USING gin (UPPER(name::text) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS devices_device_ip_trgm "
+    "ON devices_device USING gin (UPPER(HOST(ip_address)) gin_trgm_ops)",
+]
+
+POSTGRES_TRGM_UNINSTALL = [
+    "DROP INDEX IF EXISTS devices_device_name_trgm",
+    "DROP INDEX IF EXISTS devices_device_ip_trgm",
+]
+
+
+@functools.lru_cache(maxsize=None)
+def sqlite_fts_supported():
+    """
+    Return True if the linked SQLite library has FTS5 with the trigram tokenizer.
+    Checked on a private in-memory database, outside Django's connections.
+    """
+    try:
+        with closing(sqlite3.connect(":memory:")) as probe:
+            probe.execute("CREATE VIRTUAL TABLE probe USING fts5(x, tokenize='trigram')")
+    except sqlite3.Error:
+        return False
+    return True
+
+
+def install_search_index(schema_editor):
+    """
+    Create the search index structures for the schema editor's backend.
+    Used by migrations; safe to run again after a table rebuild.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite" and sqlite_fts_supported():
+        statements = SQLITE_FTS_INSTALL
+    elif vendor == "postgresql":
+        statements = POSTGRES_TRGM_INSTALL
+    else:
+        # SQLite built without FTS5: searches fall back to icontains.
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def uninstall_search_index(schema_editor):
+    """
+    Drop the search index structures.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        statements = SQLITE_FTS_UNINSTALL
+    elif vendor == "postgresql":
+        statements = POSTGRES_TRGM_UNINSTALL
+    else:
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+class KeepSearchIndex(migrations.SeparateDatabaseAndState):
+    """
+    Run migration operations, then install the search index again, both
+    when applying and when reverting them. Adding or removing some columns
+    rebuilds the table on SQLite, which drops the full-text search triggers.
+    """
+
+    serialization_expand_args = ["operations"]
+
+    def __init__(self, operations):
+        super().__init__(database_operations=operations, state_operations=operations)
+
+    def deconstruct(self):
+        return self.__class__.__qualname__, [], {"operations": self.database_operations}
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        super().database_forwards(app_label, schema_editor, from_state, to_state)
+        install_search_index(schema_editor)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        super().database_backwards(app_label, schema_editor, from_state, to_state)
+        install_search_index(schema_editor)
+
+    def describe(self):
+        return "Keep the device search index through: " + "; ".join(
+            operation.describe() for operation in self.database_operations
+        )
+
+
+class IContainsSearchBackend:
+    """
+    Plain icontains matching, as done by DRF's SearchFilter.
+    Used on PostgreSQL, where the trigram indexes make it index-backed.
+    """
+
+    fields = ("name", "ip_address")
+
+    def term_condition(self, term):
+        condition = Q()
+        for field in self.fields:
+            condition |= Q(**{f"{field}__icontains": term})
+        return condition
+
+    def filter(self, queryset, terms):
+        for term in terms:
+            queryset = queryset.filter(self.term_condition(term))
+        return queryset
+
+
+class SQLiteFTSSearchBackend(IContainsSearchBackend):
+    """
+    Trigram FTS5 lookups on SQLite.
+    Terms shorter than a trigram cannot use the index and fall back to icontains.
+    """
+
+    min_term_length = 3
+
+    def term_condition(self, term):
+        if len(term) < self.min_term_length:
+            return super().term_condition(term)
+        phrase = '"{}"'.format(term.replace('"', '""'))
+        return Q(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [phrase],
+            )
+        )
+
+
+def get_search_backend(queryset):
+    """
+    Return the configured search backend (DEVICES_SEARCH_BACKEND), or the
+    best one for the queryset's database when set to "auto".
+    """
+    backend = getattr(settings, "DEVICES_SEARCH_BACKEND", "auto")
+    if backend != "auto":
+        return import_string(backend)()
+    if connections[queryset.db].vendor == "sqlite" and sqlite_fts_supported():
+        return SQLiteFTSSearchBackend()
+    return IContainsSearchBackend()
+
+
+class DeviceSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter answering ?search= through an indexed backend.
+    Terms are parsed exactly like SearchFilter: every term must match the
+    name or the IP address.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return get_search_backend(queryset).filter(queryset, terms)
@@ -2,18 +2,20 @@
 Device serializers.
 """
 
+from apps.core.fieldsets import SparseFieldsetSerializerMixin
+from apps.devices.ip_conflicts import unique_ip_errors
 from apps.devices.models import Device
 from apps.platforms.models import UserPlatform
 from rest_framework import serializers
 
 
-class DeviceSerializer(serializers.ModelSerializer):
+class DeviceSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Device model.
     """
 
     user_platform_email = serializers.EmailField(source="user_platform.email", read_only=True)
-    platform_name = serializers.CharField(source="user_platform.platform.name", read_only=True)
+    platform_name = serializers.CharField(source="platform.name", read_only=True)
 
     class Meta:
         model = Device
@@ -22,6 +24,7 @@ class DeviceSerializer(serializers.ModelSerializer):
             "name",
             "ip_address",
             "is_active",
+            "reachable",
             "user_platform_email",
             "platform_name",
             "created_at",
@@ -29,6 +32,7 @@ class DeviceSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = [
             "id",
+            "reachable",
             "user_platform_email",
             "platform_name",
             "created_at",
@@ -60,10 +64,29 @@ class DeviceSerializer(serializers.ModelSerializer):
         if not user_platform:
             raise serializers.ValidationError("user_platform es requerido.")
 
-        device = Device.objects.create(
-            user_platform=user_platform,
-            created_by=user_platform,
-            updated_by=user_platform,
-            **validated_data,
-        )
+        # The INSERT reads unique_device_ips from the platform row; outside
+        # a request transaction the savepoint is the write's own transaction.
+        with unique_ip_errors():
+            device = Device.objects.create(
+                user_platform=user_platform,
+                created_by=user_platform,
+                updated_by=user_platform,
+                **validated_data,
+            )
         return device
+
+    def update(self, instance, validated_data):
+        """
+        Update device instance, reporting an IP address already used in a
+        platform that enforces unique IPs as a validation error.
+        """
+        with unique_ip_errors(instance.ip_unique):
+            return super().update(instance, validated_data)
+
+
+class DeviceSetActiveSerializer(serializers.Serializer):
+    """
+    Serializer for the bulk set_active payload.
+    """
+
+    is_active = serializers.BooleanField()
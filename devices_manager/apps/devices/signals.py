@@ -0,0 +1,151 @@
+"""
+Device change notifications.
+"""
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+# Sent after devices are created, updated or deleted, including bulk and
+# queryset writes that bypass post_save/post_delete.
+# Arguments: user_platform_ids, device_ids, rows ((device_id, user_platform_id)
+# pairs), action ("created", "updated", "toggled", "deleted") and
+# counter_deltas ({user_platform_id: (total delta, active delta)}).
+devices_changed = Signal()
+
+
+def advance_devices_version(user_platforms, **updates):
+    """
+    Advance the device collection version of a UserPlatform queryset, which
+    changes the ETag of their device lists.
+    """
+    user_platforms.update(
+        devices_version=F("devices_version") + 1,
+        devices_changed_at=timezone.now(),
+        **updates,
+    )
+
+
+def saved_field(update_fields, field):
+    """
+    Return True unless the update_fields of a post_save leave `field` out.
+    """
+    return update_fields is None or field in update_fields
+
+
+@receiver(devices_changed)
+def bump_devices_version(sender, user_platform_ids, counter_deltas=None, **kwargs):
+    """
+    Advance the device collection version of the affected users, applying
+    the change in their device counters in the same UPDATE.
+    """
+    from apps.devices.counters import user_counter_updates
+    from apps.platforms.models import UserPlatform
+
+    user_platform_ids = set(user_platform_ids)
+    if not user_platform_ids:
+        return
+    advance_devices_version(
+        UserPlatform.objects.filter(pk__in=user_platform_ids),
+        **user_counter_updates(counter_deltas or {}),
+    )
+
+
+@receiver(devices_changed)
+def update_platform_counters(sender, counter_deltas=None, **kwargs):
+    """
+    Apply the change in device counts to the platforms of the affected users.
+    """
+    from apps.devices.counters import apply_platform_deltas
+
+    if counter_deltas:
+        apply_platform_deltas(counter_deltas)
+
+
+@receiver(devices_changed)
+def record_tombstones(sender, rows, action, **kwargs):
+    """
+    Log deleted devices for the delta-sync endpoint.
+    """
+    from apps.devices.models import DeviceTombstone
+
+    if action != "deleted":
+        return
+    DeviceTombstone.objects.bulk_create(
+        [
+            DeviceTombstone(device_id=device_id, user_platform_id=user_platform_id)
+            for device_id, user_platform_id in rows
+        ]
+    )
+
+
+@receiver(devices_changed)
+def invalidate_device_responses(sender, user_platform_ids, **kwargs):
+    """
+    Drop the cached device responses of the affected users.
+    Done immediately and again on commit, so a response built from data read
+    before the commit cannot stay cached under the new generation.
+    """
+    from apps.devices.cache import device_response_cache
+
+    user_platform_ids = set(user_platform_ids)
+    device_response_cache.invalidate_users(user_platform_ids)
+    transaction.on_commit(lambda: device_response_cache.invalidate_users(user_platform_ids))
+
+
+@receiver(devices_changed)
+def publish_device_events(sender, rows, action, **kwargs):
+    """
+    Push the change to the SSE feed of the affected users once committed.
+    """
+    from apps.devices.events import publish_rows
+
+    rows = list(rows)
+    transaction.on_commit(lambda: publish_rows(action, rows))
+
+
+@receiver([post_save, post_delete], sender="platforms.UserPlatform")
+def invalidate_user_platform_responses(
+    sender, instance, created=None, update_fields=None, **kwargs
+):
+    """
+    Drop a user's cached device responses when the user changes (email),
+    and advance its collection version so earlier ETags no longer match.
+    """
+    from apps.devices.cache import device_response_cache
+    from apps.platforms.models import UserPlatform
+
+    device_response_cache.invalidate_users([instance.pk])
+    if created is False and saved_field(update_fields, "email"):
+        advance_devices_version(UserPlatform.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender="platforms.UserPlatform")
+def discount_user_platform_devices(sender, instance, **kwargs):
+    """
+    Remove a deleted user's devices, deleted by cascade without
+    devices_changed, from its platform's counters.
+    """
+    from apps.platforms.models import Platform
+
+    if instance.devices_total or instance.devices_active:
+        Platform.objects.filter(pk=instance.platform_id).update(
+            devices_total=F("devices_total") - instance.devices_total,
+            devices_active=F("devices_active") - instance.devices_active,
+        )
+
+
+@receiver([post_save, post_delete], sender="platforms.Platform")
+def invalidate_platform_responses(sender, instance, created=None, update_fields=None, **kwargs):
+    """
+    Drop the cached device responses of a platform's users (platform name),
+    and advance their collection versions so earlier ETags no longer match.
+    """
+    from apps.devices.cache import device_response_cache
+    from apps.platforms.models import UserPlatform
+
+    device_response_cache.invalidate_platform(instance.pk)
+    if created is False and saved_field(update_fields, "name"):
+        advance_devices_version(UserPlatform.objects.filter(platform_id=instance.pk))
@@ -0,0 +1,35 @@
+"""
+Streaming helpers for large device collections.
+"""
+
+from apps.devices.renderers import NDJSONRenderer, dumps_row
+from django.http import StreamingHttpResponse
+
+
+def iter_json_array(rows):
+    """
+    Yield the rows as the chunks of a single JSON array.
+    """
+    yield b"["
+    separator = b""
+    for row in rows:
+        yield separator + dumps_row(row)
+        separator = b","
+    yield b"]"
+
+
+def iter_ndjson(rows):
+    """
+    Yield the rows as newline-delimited JSON.
+    """
+    for row in rows:
+        yield dumps_row(row) + b"\n"
+
+
+def streaming_response(rows, ndjson=False):
+    """
+    Build a StreamingHttpResponse writing the rows as NDJSON or a JSON array.
+    """
+    if ndjson:
+        return StreamingHttpResponse(iter_ndjson(rows), content_type=NDJSONRenderer.media_type)
+    return StreamingHttpResponse(iter_json_array(rows), content_type="application/json")
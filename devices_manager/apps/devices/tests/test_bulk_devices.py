@@ -0,0 +1,158 @@
+"""
+Unit tests for bulk device endpoints.
+"""
+
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class BulkDevicesEndpointTest(TestCase):
+    """
+    Test POST/PATCH/DELETE /api/devices/bulk/.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.url = "/api/devices/bulk/"
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.select_related("platform").get(
+            pk=UserPlatform.objects.create(
+                email="test@example.com",
+                platform=self.platform,
+                password="hashed_password",
+                is_active=True,
+            ).pk
+        )
+        self.other_user = UserPlatform.objects.create(
+            email="other@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+
+    def create_device(self, user_platform=None, **kwargs):
+        defaults = {"name": "Dispositivo", "ip_address": "10.0.0.1"}
+        defaults.update(kwargs)
+        return Device.objects.create(user_platform=user_platform or self.user_platform, **defaults)
+
+    def test_bulk_create(self):
+        """
+        Test creating several devices in one request.
+        """
+        data = [{"name": f"Dispositivo {i}", "ip_address": f"10.0.0.{i}"} for i in range(1, 4)]
+
+        # Platform flag, SAVEPOINT, INSERT, user version and counters,
+        # platform counters, RELEASE
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertTrue(all(item["id"] for item in response.data))
+        self.assertEqual(response.data[0]["platform_name"], "Plataforma Test")
+        devices = Device.objects.filter(user_platform=self.user_platform)
+        self.assertEqual(devices.count(), 3)
+        self.assertTrue(all(device.created_by_id == self.user_platform.id for device in devices))
+
+    def test_bulk_create_reports_errors_per_item(self):
+        """
+        Test that invalid items are reported by position and nothing is written.
+        """
+        data = [
+            {"name": "Válido", "ip_address": "10.0.0.1"},
+            {"name": "Inválido", "ip_address": "no-es-ip"},
+        ]
+
+        response = self.client.post(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("ip_address", response.data[1])
+        self.assertFalse(Device.objects.exists())
+
+    @override_settings(DEVICES_BULK_MAX_ITEMS=2)
+    def test_bulk_create_limit(self):
+        """
+        Test that payloads over the limit are rejected.
+        """
+        data = [{"name": f"D{i}", "ip_address": f"10.0.0.{i}"} for i in range(1, 4)]
+
+        response = self.client.post(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Device.objects.exists())
+
+    def test_bulk_update(self):
+        """
+        Test updating several devices in one request.
+        """
+        first = self.create_device(name="Uno")
+        second = self.create_device(name="Dos")
+        data = [
+            {"id": first.id, "name": "Uno actualizado"},
+            {"id": second.id, "is_active": False},
+        ]
+
+        response = self.client.patch(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.name, "Uno actualizado")
+        self.assertFalse(second.is_active)
+        self.assertEqual(second.updated_by_id, self.user_platform.id)
+
+    def test_bulk_update_foreign_device_not_found(self):
+        """
+        Test that devices of other users cannot be updated.
+        """
+        mine = self.create_device(name="Mío")
+        foreign = self.create_device(user_platform=self.other_user, name="Ajeno")
+        data = [{"id": mine.id, "name": "Cambio"}, {"id": foreign.id, "name": "Cambio"}]
+
+        response = self.client.patch(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("id", response.data[1])
+        mine.refresh_from_db()
+        self.assertEqual(mine.name, "Mío")
+
+    def test_bulk_delete(self):
+        """
+        Test deleting several devices in one request.
+        """
+        devices = [self.create_device(name=f"D{i}") for i in range(3)]
+
+        response = self.client.delete(self.url, [d.id for d in devices[:2]], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["deleted"], 2)
+        self.assertEqual(list(Device.objects.values_list("id", flat=True)), [devices[2].id])
+
+    def test_bulk_delete_foreign_device(self):
+        """
+        Test that deleting foreign devices fails without deleting anything.
+        """
+        mine = self.create_device()
+        foreign = self.create_device(user_platform=self.other_user)
+
+        response = self.client.delete(self.url, [mine.id, foreign.id], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Device.objects.count(), 2)
+
+    def test_bulk_requires_list(self):
+        """
+        Test that a non-list payload is rejected.
+        """
+        response = self.client.post(self.url, {"name": "D"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,163 @@
+"""
+Unit tests for the delta-sync endpoint and device tombstones.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from apps.devices.models import Device, DeviceTombstone
+from apps.devices.sync import encode_token
+from apps.platforms.models import Platform, UserPlatform
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@override_settings(DEVICES_CHANGES_GRACE_PERIOD=0)
+class DeviceChangesTest(TestCase):
+    """
+    Test GET /api/devices/changes/.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.other = UserPlatform.objects.create(
+            email="other@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        self.router = Device.objects.create(
+            name="Router", ip_address="10.0.0.1", user_platform=self.user_platform
+        )
+        self.switch = Device.objects.create(
+            name="Switch", ip_address="10.0.0.2", user_platform=self.user_platform
+        )
+
+    def changes(self, token=None):
+        params = {"since": token} if token else {}
+        response = self.client.get("/api/devices/changes/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_first_sync_returns_everything(self):
+        """
+        Test that a call without token returns the full collection with reset.
+        """
+        data = self.changes()
+        self.assertTrue(data["reset"])
+        self.assertEqual({item["id"] for item in data["changed"]}, {self.router.id, self.switch.id})
+        self.assertEqual(data["deleted"], [])
+        self.assertTrue(data["token"])
+
+    def test_returns_only_churn(self):
+        """
+        Test that a later sync returns only updated, created and deleted devices.
+        """
+        token = self.changes()["token"]
+        self.client.patch(f"/api/devices/{self.router.id}/", {"name": "Otro"}, format="json")
+        created = self.client.post(
+            "/api/devices/", {"name": "Nuevo", "ip_address": "10.0.0.3"}, format="json"
+        ).data
+        self.client.delete(f"/api/devices/{self.switch.id}/")
+        Device.objects.create(name="Ajeno", ip_address="10.0.0.9", user_platform=self.other)
+
+        data = self.changes(token)
+        self.assertFalse(data["reset"])
+        self.assertEqual([item["id"] for item in data["changed"]], [self.router.id, created["id"]])
+        self.assertEqual(data["deleted"], [self.switch.id])
+
+        data = self.changes(data["token"])
+        self.assertEqual(data["changed"], [])
+        self.assertEqual(data["deleted"], [])
+
+    def test_moved_devices_are_deleted_for_previous_owner(self):
+        """
+        Test that a device moved to another user is reported deleted to its
+        previous owner, and changed again once moved back.
+        """
+        token = self.changes()["token"]
+        self.switch.user_platform = self.other
+        self.switch.save()
+
+        data = self.changes(token)
+        self.assertEqual(data["changed"], [])
+        self.assertEqual(data["deleted"], [self.switch.id])
+        self.assertTrue(
+            DeviceTombstone.objects.filter(
+                device_id=self.switch.id, user_platform=self.user_platform
+            ).exists()
+        )
+
+        self.switch.user_platform = self.user_platform
+        self.switch.save()
+        data = self.changes(token)
+        self.assertEqual([item["id"] for item in data["changed"]], [self.switch.id])
+        self.assertEqual(data["deleted"], [])
+
+    def test_bulk_paths_are_tracked(self):
+        """
+        Test that bulk deletes write tombstones and set_active updates are seen.
+        """
+        token = self.changes()["token"]
+        self.client.post("/api/devices/set_active/", {"is_active": False}, format="json")
+        self.client.delete("/api/devices/bulk/", [self.switch.id], format="json")
+
+        data = self.changes(token)
+        self.assertEqual([item["id"] for item in data["changed"]], [self.router.id])
+        self.assertEqual(data["deleted"], [self.switch.id])
+
+    def test_expired_token_forces_reset(self):
+        """
+        Test that tokens older than the tombstone retention force a full resync.
+        """
+        token = encode_token(timezone.now() - timedelta(days=365))
+        data = self.changes(token)
+        self.assertTrue(data["reset"])
+        self.assertEqual(len(data["changed"]), 2)
+
+    def test_invalid_token(self):
+        """
+        Test that malformed tokens are rejected.
+        """
+        response = self.client.get("/api/devices/changes/", {"since": "no-es-un-token"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("since", response.data)
+
+    def test_query_count(self):
+        """
+        Test that a delta sync runs one query for devices and one for tombstones.
+        """
+        token = self.changes()["token"]
+        with self.assertNumQueries(2):
+            self.changes(token)
+
+    def test_prune_tombstones(self):
+        """
+        Test that the prune command only removes tombstones past retention.
+        """
+        self.client.delete(f"/api/devices/{self.switch.id}/")
+        DeviceTombstone.objects.create(
+            device_id=999,
+            user_platform=self.user_platform,
+            deleted_at=timezone.now() - timedelta(days=60),
+        )
+        out = StringIO()
+        call_command("prune_device_tombstones", stdout=out)
+        self.assertIn("1 registros eliminados", out.getvalue())
+        self.assertEqual(
+            list(DeviceTombstone.objects.values_list("device_id", flat=True)), [self.switch.id]
+        )
@@ -0,0 +1,162 @@
+"""
+Unit tests for conditional GET (ETag/Last-Modified) on device endpoints.
+"""
+
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class DeviceConditionalGetTest(TestCase):
+    """
+    Test ETag/Last-Modified validators and 304 responses.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.other = UserPlatform.objects.create(
+            email="other@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        self.device = Device.objects.create(
+            name="Router", ip_address="10.0.0.1", user_platform=self.user_platform
+        )
+
+    def get(self, url, etag=None, **params):
+        headers = {"If-None-Match": etag} if etag else {}
+        return self.client.get(url, params, headers=headers)
+
+    def test_list_returns_validators(self):
+        """
+        Test that the list carries ETag and Last-Modified headers.
+        """
+        response = self.get("/api/devices/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("Authorization", response["Vary"])
+
+    @override_settings(DEVICES_RESPONSE_CACHE_TIMEOUT=0)
+    def test_list_not_modified(self):
+        """
+        Test that a matching If-None-Match is answered with 304 after a
+        single version lookup when the response cache is off.
+        """
+        etag = self.get("/api/devices/")["ETag"]
+        with self.assertNumQueries(1):
+            response = self.get("/api/devices/", etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_list_if_modified_since(self):
+        """
+        Test that If-Modified-Since is honoured when no ETag is sent.
+        """
+        last_modified = self.get("/api/devices/")["Last-Modified"]
+        response = self.client.get("/api/devices/", headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_change_etag(self):
+        """
+        Test that every kind of device write produces a new collection ETag.
+        """
+        etags = [self.get("/api/devices/")["ETag"]]
+        writes = [
+            lambda: self.client.post(
+                "/api/devices/", {"name": "Nuevo", "ip_address": "10.0.0.2"}, format="json"
+            ),
+            lambda: self.client.patch(
+                f"/api/devices/{self.device.id}/", {"name": "Otro"}, format="json"
+            ),
+            lambda: self.client.patch(f"/api/devices/{self.device.id}/toggle_active/"),
+            lambda: self.client.post(
+                "/api/devices/bulk/", [{"name": "B", "ip_address": "10.0.0.3"}], format="json"
+            ),
+            lambda: self.client.delete(f"/api/devices/{self.device.id}/"),
+        ]
+        for write in writes:
+            self.assertLess(write().status_code, 300)
+            response = self.get("/api/devices/", etags[-1])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etags.append(response["ETag"])
+        self.assertEqual(len(set(etags)), len(etags))
+
+    def test_other_users_writes_keep_etag(self):
+        """
+        Test that devices of another user do not invalidate the collection.
+        """
+        etag = self.get("/api/devices/")["ETag"]
+        Device.objects.create(name="Ajeno", ip_address="10.0.0.9", user_platform=self.other)
+        self.assertEqual(self.get("/api/devices/", etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_owner_renames_change_etag(self):
+        """
+        Test that renaming the user or its platform, both shown in the
+        device representation, produces a new collection ETag.
+        """
+        etag = self.get("/api/devices/")["ETag"]
+        self.user_platform.save(update_fields=["last_login"])
+        self.assertEqual(self.get("/api/devices/", etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.user_platform.email = "renombrado@example.com"
+        self.user_platform.save()
+        response = self.get("/api/devices/", etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"][0]["user_platform_email"], "renombrado@example.com"
+        )
+
+        etag = response["ETag"]
+        self.platform.name = "Plataforma Renombrada"
+        self.platform.save()
+        response = self.get("/api/devices/", etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["platform_name"], "Plataforma Renombrada")
+
+    def test_etag_depends_on_query(self):
+        """
+        Test that different query parameters get different ETags.
+        """
+        etag = self.get("/api/devices/")["ETag"]
+        response = self.get("/api/devices/", etag, ordering="name")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_my_devices_not_modified(self):
+        """
+        Test conditional requests on my_devices, including streamed output.
+        """
+        for params in ({}, {"stream": "1"}):
+            etag = self.get("/api/devices/my_devices/", **params)["ETag"]
+            response = self.get("/api/devices/my_devices/", etag, **params)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_not_modified(self):
+        """
+        Test that the detail route validates against the device's updated_at.
+        """
+        url = f"/api/devices/{self.device.id}/"
+        etag = self.get(url)["ETag"]
+        self.assertEqual(self.get(url, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.device.name = "Cambiado"
+        self.device.save()
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "Cambiado")
@@ -0,0 +1,249 @@
+"""
+Unit tests for the denormalized device counters.
+"""
+
+from io import StringIO
+from unittest.mock import patch
+
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, TransactionTestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class DeviceCountersTest(TestCase):
+    """
+    Test that user and platform counters follow every write path.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.other = UserPlatform.objects.create(
+            email="other@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+
+    def assertCounters(self, user, platform, other=(0, 0)):
+        counters = {
+            "user": UserPlatform.objects.get(pk=self.user_platform.pk),
+            "other": UserPlatform.objects.get(pk=self.other.pk),
+            "platform": Platform.objects.get(pk=self.platform.pk),
+        }
+        self.assertEqual(
+            {name: (obj.devices_total, obj.devices_active) for name, obj in counters.items()},
+            {"user": user, "other": other, "platform": platform},
+        )
+
+    def create(self, name, ip_address, **kwargs):
+        response = self.client.post(
+            "/api/devices/", {"name": name, "ip_address": ip_address, **kwargs}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+    def test_api_write_paths(self):
+        """
+        Test create, update, toggle, set_active, bulk and delete through the API.
+        """
+        first = self.create("Router", "10.0.0.1")
+        second = self.create("Switch", "10.0.0.2", is_active=False)
+        Device.objects.create(name="Ajeno", ip_address="10.0.0.9", user_platform=self.other)
+        self.assertCounters(user=(2, 1), platform=(3, 2), other=(1, 1))
+
+        self.client.patch(f"/api/devices/{second}/", {"is_active": True}, format="json")
+        self.client.patch(f"/api/devices/{second}/", {"name": "Otro"}, format="json")
+        self.assertCounters(user=(2, 2), platform=(3, 3), other=(1, 1))
+
+        self.client.patch(f"/api/devices/{first}/toggle_active/")
+        self.assertCounters(user=(2, 1), platform=(3, 2), other=(1, 1))
+
+        self.client.post("/api/devices/set_active/", {"is_active": False}, format="json")
+        self.assertCounters(user=(2, 0), platform=(3, 1), other=(1, 1))
+
+        self.client.patch("/api/devices/bulk/", [{"id": first, "is_active": True}], format="json")
+        self.client.post(
+            "/api/devices/bulk/",
+            [{"name": f"D{i}", "ip_address": f"10.0.1.{i}"} for i in range(3)],
+            format="json",
+        )
+        self.assertCounters(user=(5, 4), platform=(6, 5), other=(1, 1))
+
+        self.client.delete(f"/api/devices/{first}/")
+        self.client.delete("/api/devices/bulk/", [second], format="json")
+        self.assertCounters(user=(3, 3), platform=(4, 4), other=(1, 1))
+
+    def test_queryset_writes(self):
+        """
+        Test queryset update() and delete() across several users.
+        """
+        Device.objects.bulk_create(
+            [
+                Device(name="A", ip_address="10.0.0.1", user_platform=self.user_platform),
+                Device(name="B", ip_address="10.0.0.2", user_platform=self.other),
+                Device(name="C", ip_address="10.0.0.3", user_platform=self.other),
+            ]
+        )
+        Device.objects.filter(name__in=["A", "B"]).update(is_active=False)
+        self.assertCounters(user=(1, 0), platform=(3, 1), other=(2, 1))
+        Device.objects.filter(name__in=["B", "C"]).delete()
+        self.assertCounters(user=(1, 0), platform=(1, 0))
+
+    def test_stats(self):
+        """
+        Test that the stats endpoint reads the counters with one query.
+        """
+        self.create("Router", "10.0.0.1")
+        self.create("Switch", "10.0.0.2", is_active=False)
+        Device.objects.create(name="Ajeno", ip_address="10.0.0.9", user_platform=self.other)
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/devices/stats/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {"user": {"total": 2, "active": 1}, "platform": {"total": 3, "active": 2}},
+        )
+
+    def test_save_does_not_overwrite_counters(self):
+        """
+        Test that saving a stale user or platform keeps the counters.
+        """
+        stale_user = UserPlatform.objects.get(pk=self.user_platform.pk)
+        stale_platform = Platform.objects.get(pk=self.platform.pk)
+        self.create("Router", "10.0.0.1")
+        stale_user.email = "nuevo@example.com"
+        stale_user.save()
+        stale_platform.description = "Nueva"
+        stale_platform.save()
+        self.assertCounters(user=(1, 1), platform=(1, 1))
+
+    def test_user_deletion_updates_platform(self):
+        """
+        Test that deleting a user removes its devices from the platform counters.
+        """
+        self.create("Router", "10.0.0.1")
+        Device.objects.create(name="Ajeno", ip_address="10.0.0.9", user_platform=self.other)
+        UserPlatform.objects.get(pk=self.other.pk).delete()
+        platform = Platform.objects.get(pk=self.platform.pk)
+        self.assertEqual((platform.devices_total, platform.devices_active), (1, 1))
+
+    def test_moving_device_moves_counts(self):
+        """
+        Test that moving a device takes it out of its previous user's and
+        platform's counts and into the new ones.
+        """
+        router = self.create("Router", "10.0.0.1")
+        self.create("Switch", "10.0.0.2", is_active=False)
+        other_platform = Platform.objects.create(name="Otra Plataforma", is_active=True)
+        outsider = UserPlatform.objects.create(
+            email="outsider@example.com",
+            platform=other_platform,
+            password="hashed_password",
+            is_active=True,
+        )
+
+        device = Device.objects.get(pk=router)
+        device.user_platform = self.other
+        device.save()
+        self.assertCounters(user=(1, 0), platform=(2, 1), other=(1, 1))
+
+        device = Device.objects.get(pk=router)
+        device.user_platform_id = outsider.pk
+        device.is_active = False
+        device.save()
+        self.assertCounters(user=(1, 0), platform=(1, 0))
+        outsider = UserPlatform.objects.get(pk=outsider.pk)
+        other_platform = Platform.objects.get(pk=other_platform.pk)
+        self.assertEqual((outsider.devices_total, outsider.devices_active), (1, 0))
+        self.assertEqual((other_platform.devices_total, other_platform.devices_active), (1, 0))
+
+        out = StringIO()
+        call_command("reconcile_device_counters", "--dry-run", stdout=out)
+        self.assertIn("0 usuarios y 0 plataformas con diferencias", out.getvalue())
+
+    def test_reconcile_command(self):
+        """
+        Test that the reconciliation command repairs drifted counters.
+        """
+        self.create("Router", "10.0.0.1")
+        UserPlatform.objects.filter(pk=self.user_platform.pk).update(devices_total=7)
+        Platform.objects.filter(pk=self.platform.pk).update(devices_active=0)
+
+        out = StringIO()
+        call_command("reconcile_device_counters", "--dry-run", stdout=out)
+        self.assertIn("1 usuarios y 1 plataformas con diferencias", out.getvalue())
+        self.assertCounters(user=(7, 1), platform=(1, 0))
+
+        out = StringIO()
+        call_command("reconcile_device_counters", stdout=out)
+        self.assertIn("1 usuarios y 1 plataformas corregidos", out.getvalue())
+        self.assertCounters(user=(1, 1), platform=(1, 1))
+
+
+class DeviceCountersAtomicityTest(TransactionTestCase):
+    """
+    Test that device writes and their counter updates commit together,
+    outside any request or test transaction.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.device = Device.objects.create(
+            name="Router", ip_address="10.0.0.1", user_platform=self.user_platform
+        )
+
+    def assertUnchanged(self):
+        user = UserPlatform.objects.get(pk=self.user_platform.pk)
+        platform = Platform.objects.get(pk=self.platform.pk)
+        self.assertEqual((user.devices_total, user.devices_active), (1, 1))
+        self.assertEqual((platform.devices_total, platform.devices_active), (1, 1))
+        self.assertEqual(user.devices_version, self.version)
+        self.assertEqual(
+            list(Device.objects.values_list("pk", "is_active")), [(self.device.pk, True)]
+        )
+
+    def test_failed_receiver_rolls_back_write(self):
+        """
+        Test that a failing devices_changed receiver undoes the device write
+        and the counter updates made before it.
+        """
+        self.version = UserPlatform.objects.get(pk=self.user_platform.pk).devices_version
+        writes = [
+            lambda: Device.objects.create(
+                name="Nuevo", ip_address="10.0.0.2", user_platform=self.user_platform
+            ),
+            lambda: Device.objects.filter(pk=self.device.pk).toggle_active(),
+            lambda: Device.objects.filter(pk=self.device.pk).update(is_active=False),
+            lambda: Device.objects.get(pk=self.device.pk).delete(),
+        ]
+        for write in writes:
+            with patch("apps.devices.counters.apply_platform_deltas", side_effect=DatabaseError):
+                with self.assertRaises(DatabaseError):
+                    write()
+            self.assertUnchanged()
@@ -0,0 +1,124 @@
+"""
+Unit tests for keyset (cursor) pagination of devices.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from apps.devices.models import Device
+from apps.devices.pagination import KeysetPagination
+from apps.platforms.models import Platform, UserPlatform
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@patch.object(KeysetPagination, "page_size", 2)
+class CursorPaginationTest(TestCase):
+    """
+    Test DeviceViewSet list with ?pagination=cursor.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+
+        now = timezone.now()
+        self.devices = []
+        for i, name in enumerate(["Delta", "Alpha", "Charlie", "Alpha", "Bravo"]):
+            device = Device.objects.create(
+                name=name, ip_address=f"10.0.0.{i + 1}", user_platform=self.user_platform
+            )
+            Device.objects.filter(pk=device.pk).update(created_at=now + timedelta(seconds=i))
+            self.devices.append(device)
+
+    def walk(self, url):
+        ids = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            ids.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+            pages += 1
+        return ids, pages
+
+    def test_walk_default_ordering(self):
+        """
+        Test walking every page in -created_at order.
+        """
+        ids, pages = self.walk("/api/devices/?pagination=cursor")
+
+        self.assertEqual(ids, [device.id for device in reversed(self.devices)])
+        self.assertEqual(pages, 3)
+
+    def test_walk_by_name_with_ties(self):
+        """
+        Test that rows sharing the ordering value are neither lost nor repeated.
+        """
+        ids, _ = self.walk("/api/devices/?pagination=cursor&ordering=name")
+
+        expected = sorted(self.devices, key=lambda device: (device.name, device.id))
+        self.assertEqual(ids, [device.id for device in expected])
+
+    def test_previous_link(self):
+        """
+        Test that the previous link returns the preceding page.
+        """
+        first = self.client.get("/api/devices/?pagination=cursor&ordering=name")
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+
+        self.assertIsNone(first.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(back.data["previous"])
+
+    def test_no_count_query(self):
+        """
+        Test that cursor pages do not run COUNT(*).
+        """
+        first = self.client.get("/api/devices/?pagination=cursor")
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(first.data["next"])
+
+        self.assertFalse(any("COUNT(" in query["sql"] for query in context.captured_queries))
+
+    def test_invalid_cursor(self):
+        """
+        Test that a malformed cursor is rejected.
+        """
+        response = self.client.get("/api/devices/?cursor=not-a-cursor")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_bound_to_ordering(self):
+        """
+        Test that a cursor cannot be reused with a different ordering.
+        """
+        first = self.client.get("/api/devices/?pagination=cursor")
+        response = self.client.get(first.data["next"] + "&ordering=name")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_mode_is_default(self):
+        """
+        Test that existing clients keep page-number pagination.
+        """
+        response = self.client.get("/api/devices/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 5)
@@ -0,0 +1,120 @@
+"""
+Unit tests for the denormalized Device.platform column.
+"""
+
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class DevicePlatformTest(TestCase):
+    """
+    Test that Device.platform follows the user and scopes queries without joins.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        other_platform = Platform.objects.create(name="Otra", is_active=True)
+        self.other_user = UserPlatform.objects.create(
+            email="otro@example.com",
+            platform=other_platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.device = Device.objects.create(
+            name="Router", ip_address="10.0.0.1", user_platform=self.user_platform
+        )
+
+    def test_platform_assigned_on_writes(self):
+        """
+        Test that create, save by id and bulk_create copy the user's platform.
+        """
+        self.assertEqual(self.device.platform_id, self.platform.id)
+
+        by_id = Device(name="Switch", ip_address="10.0.0.2", user_platform_id=self.other_user.id)
+        by_id.save()
+        devices = Device.objects.bulk_create(
+            [
+                Device(name="A", ip_address="10.0.0.3", user_platform_id=self.user_platform.id),
+                Device(name="B", ip_address="10.0.0.4", user_platform_id=self.other_user.id),
+            ]
+        )
+
+        self.assertEqual(by_id.platform_id, self.other_user.platform_id)
+        self.assertEqual(
+            [device.platform_id for device in devices],
+            [self.platform.id, self.other_user.platform_id],
+        )
+        self.assertFalse(
+            Device.objects.exclude(platform_id=F("user_platform__platform_id")).exists()
+        )
+
+    def test_moving_device_updates_platform(self):
+        """
+        Test that reassigning user_platform with update_fields moves the platform too.
+        """
+        self.device.user_platform = self.other_user
+        self.device.save(update_fields=["user_platform"])
+        self.device.refresh_from_db()
+        self.assertEqual(self.device.platform_id, self.other_user.platform_id)
+
+    def test_full_save_keeps_platform_columns(self):
+        """
+        Test that a full save of a device that did not move leaves platform and ip_unique alone.
+        """
+        self.device.name = "Router 2"
+        with CaptureQueriesContext(connection) as queries:
+            self.device.save()
+        update = next(q["sql"] for q in queries if q["sql"].startswith('UPDATE "devices_device"'))
+        self.assertNotIn('"platform_id"', update)
+        self.assertNotIn('"ip_unique"', update)
+
+    def test_moving_device_by_id_updates_platform(self):
+        """
+        Test that a full save of a device moved by user_platform_id moves the platform too.
+        """
+        self.device.refresh_from_db()
+        self.device.user_platform_id = self.other_user.pk
+        self.device.save()
+        self.device.refresh_from_db()
+        self.assertEqual(self.device.platform_id, self.other_user.platform_id)
+
+    def test_endpoints_read_device_table_only(self):
+        """
+        Test that the tenant-scoped reads never join users or platforms.
+        """
+        urls = [
+            "/api/devices/",
+            f"/api/devices/{self.device.id}/",
+            "/api/devices/my_devices/",
+            "/api/devices/changes/",
+        ]
+        for url in urls:
+            with self.subTest(url=url), CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                selects = [q["sql"] for q in queries if 'FROM "devices_device"' in q["sql"]]
+                self.assertTrue(selects)
+                for sql in selects:
+                    self.assertNotIn("JOIN", sql)
+                    self.assertIn('"devices_device"."platform_id" =', sql)
+
+        response = self.client.get(f"/api/devices/{self.device.id}/")
+        self.assertEqual(response.data["user_platform_email"], "test@example.com")
+        self.assertEqual(response.data["platform_name"], "Plataforma Test")
@@ -0,0 +1,181 @@
+"""
+Unit tests for the device Server-Sent Events feed.
+"""
+
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+from apps.devices.events import LocalEventBroker, event_stream, get_event_broker
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.test import AsyncClient, SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def parse_event(chunk):
+    lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+
+class LocalEventBrokerTest(SimpleTestCase):
+    """
+    Test fan-out, overflow and unsubscription of the in-process broker.
+    """
+
+    def test_publish_from_other_thread(self):
+        """
+        Test that events published from a request thread reach the loop.
+        """
+
+        async def scenario():
+            broker = LocalEventBroker()
+            subscription = broker.subscribe(1)
+            other = broker.subscribe(2)
+            thread = threading.Thread(
+                target=broker.publish, args=(1, {"action": "created", "ids": [5]})
+            )
+            thread.start()
+            thread.join()
+            event = await asyncio.wait_for(subscription.get(), 1)
+            self.assertTrue(other.queue.empty())
+            return event
+
+        self.assertEqual(asyncio.run(scenario()), {"action": "created", "ids": [5]})
+
+    def test_overflow_becomes_resync(self):
+        """
+        Test that a slow client gets a single resync event instead of a backlog.
+        """
+
+        async def scenario():
+            broker = LocalEventBroker(max_queue=2)
+            subscription = broker.subscribe(1)
+            for i in range(5):
+                broker.publish(1, {"action": "updated", "ids": [i]})
+            await asyncio.sleep(0)
+            return [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+
+        events = asyncio.run(scenario())
+        self.assertEqual(events[0], {"action": "resync"})
+        self.assertLessEqual(len(events), 2)
+
+    def test_stream_unsubscribes_on_close(self):
+        """
+        Test that closing the stream removes the subscription.
+        """
+
+        async def scenario():
+            broker = LocalEventBroker()
+            stream = event_stream(broker, 1, "token")
+            self.assertTrue((await stream.__anext__()).startswith("retry:"))
+            event, data = parse_event(await stream.__anext__())
+            self.assertEqual((event, data["token"]), ("ready", "token"))
+            self.assertEqual(broker.subscriber_count(), 1)
+            await stream.aclose()
+            return broker.subscriber_count()
+
+        self.assertEqual(asyncio.run(scenario()), 0)
+
+
+class DeviceEventsEndpointTest(TestCase):
+    """
+    Test GET /api/devices/events/ and event publication from writes.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        token = AccessToken()
+        token["user_id"] = self.user_platform.id
+        token["platform_id"] = self.platform.id
+        self.authorization = f"Bearer {token}"
+
+    async def test_requires_authentication(self):
+        """
+        Test that the feed rejects anonymous clients.
+        """
+        response = await AsyncClient().get("/api/devices/events/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_stream_delivers_events(self):
+        """
+        Test that the feed starts with a ready event and pushes published changes.
+        """
+        response = await AsyncClient().get(
+            "/api/devices/events/", headers={"Authorization": self.authorization}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        chunks = aiter(response.streaming_content)
+        self.assertTrue((await anext(chunks)).startswith(b"retry:"))
+        event, data = parse_event((await anext(chunks)).decode())
+        self.assertEqual(event, "ready")
+        self.assertTrue(data["token"])
+
+        get_event_broker().publish(self.user_platform.id, {"action": "toggled", "ids": [3]})
+        event, data = parse_event((await asyncio.wait_for(anext(chunks), 1)).decode())
+        self.assertEqual((event, data["ids"]), ("toggled", [3]))
+        await chunks.aclose()
+
+    def test_writes_publish_on_commit(self):
+        """
+        Test that device writes publish one event per action after commit.
+        """
+        with patch.object(get_event_broker(), "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                device = Device.objects.create(
+                    name="Router", ip_address="10.0.0.1", user_platform=self.user_platform
+                )
+            device_id = device.pk
+            with self.captureOnCommitCallbacks(execute=True):
+                Device.objects.filter(pk=device_id).toggle_active()
+            with self.captureOnCommitCallbacks(execute=True):
+                device.delete()
+
+        self.assertEqual(
+            [call.args for call in publish.call_args_list],
+            [
+                (self.user_platform.id, {"action": "created", "ids": [device_id]}),
+                (self.user_platform.id, {"action": "toggled", "ids": [device_id]}),
+                (self.user_platform.id, {"action": "deleted", "ids": [device_id]}),
+            ],
+        )
+
+    def test_move_publishes_deleted_and_created(self):
+        """
+        Test that moving a device reports it deleted to its previous owner
+        and created to the new one.
+        """
+        other = UserPlatform.objects.create(
+            email="other@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        device = Device.objects.create(
+            name="Router", ip_address="10.0.0.1", user_platform=self.user_platform
+        )
+        with patch.object(get_event_broker(), "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                device.user_platform = other
+                device.save()
+
+        self.assertEqual(
+            [call.args for call in publish.call_args_list],
+            [
+                (self.user_platform.id, {"action": "deleted", "ids": [device.pk]}),
+                (other.id, {"action": "created", "ids": [device.pk]}),
+            ],
+        )
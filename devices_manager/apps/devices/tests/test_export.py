@@ -0,0 +1,147 @@
+"""
+Unit tests for the streaming device export.
+"""
+
+import csv
+import gzip
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from apps.devices.export import export_stream
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from rest_framework import status
+
+
+class DeviceExportTest(TestCase):
+    """
+    Test GET /api/platforms/{id}/devices/export/ and the export_devices command.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.other_platform = Platform.objects.create(name="Otra Plataforma", is_active=True)
+        first = UserPlatform.objects.create(
+            email="first@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        second = UserPlatform.objects.create(
+            email="second@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        outsider = UserPlatform.objects.create(
+            email="outsider@example.com",
+            platform=self.other_platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.devices = Device.objects.bulk_create(
+            [
+                Device(name=f"Device {i}", ip_address=f"10.0.0.{i}", user_platform=owner)
+                for i, owner in enumerate([first, second, first, second, first], start=1)
+            ]
+        )
+        Device.objects.create(name="Ajeno", ip_address="10.9.9.9", user_platform=outsider)
+        # Exports group devices by user, in creation order.
+        self.export_order = sorted(self.devices, key=lambda d: (d.user_platform_id, d.id))
+        self.url = f"/api/platforms/{self.platform.id}/devices/export/"
+        self.staff = get_user_model().objects.create_user(
+            username="admin", password="admin", is_staff=True
+        )
+
+    def download(self, **params):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b"".join(response.streaming_content)
+
+    def test_requires_staff(self):
+        """
+        Test that anonymous and non-staff users are rejected.
+        """
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        user = get_user_model().objects.create_user(username="user", password="user")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_csv(self):
+        """
+        Test that the CSV export contains every device of the platform only.
+        """
+        response, content = self.download()
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        self.assertIn(f"platform-{self.platform.id}-devices.csv", response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        self.assertEqual(
+            [int(row["id"]) for row in rows], [device.id for device in self.export_order]
+        )
+        self.assertEqual(rows[-1]["user_platform_email"], "second@example.com")
+
+    def test_export_jsonl_gzip(self):
+        """
+        Test that the gzipped JSON lines export decompresses to one object per device.
+        """
+        response, content = self.download(format="jsonl", gzip="1")
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn("devices.jsonl.gz", response["Content-Disposition"])
+        lines = gzip.decompress(content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line)["ip_address"] for line in lines],
+            [device.ip_address for device in self.export_order],
+        )
+
+    def test_invalid_format_and_missing_platform(self):
+        """
+        Test that unknown formats and platforms are rejected.
+        """
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, {"format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get("/api/platforms/9999/devices/export/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_stream_is_chunked(self):
+        """
+        Test that the export yields one block per chunk of rows.
+        """
+        blocks = list(export_stream(self.platform.id, "jsonl", chunk_size=2))
+        self.assertEqual([block.count(b"\n") for block in blocks], [2, 2, 1])
+        blocks = list(export_stream(self.platform.id, "csv", chunk_size=2))
+        self.assertEqual(len(blocks), 3)
+
+    def test_command(self):
+        """
+        Test that the command writes the export to a file.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "devices.csv.gz"
+            call_command(
+                "export_devices",
+                str(self.platform.id),
+                gzip=True,
+                output=str(output),
+                stderr=io.StringIO(),
+            )
+            rows = list(csv.reader(io.StringIO(gzip.decompress(output.read_bytes()).decode())))
+        self.assertEqual(len(rows), len(self.devices) + 1)
+
+        out = io.StringIO()
+        call_command("export_devices", str(self.platform.id), format="jsonl", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), len(self.devices))
+
+        with self.assertRaises(CommandError):
+            call_command("export_devices", "9999")
+        with self.assertRaises(CommandError):
+            call_command("export_devices", str(self.platform.id), gzip=True)
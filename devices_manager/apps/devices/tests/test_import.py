@@ -0,0 +1,169 @@
+"""
+Unit tests for the streaming device import.
+"""
+
+import gzip
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from apps.devices.imports import import_devices, iter_records
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+CSV_CONTENT = (
+    "name,ip_address,is_active\n"
+    "Router,10.0.0.10,false\n"
+    "Nuevo,10.0.0.20,\n"
+    "Sin IP,no-es-ip,true\n"
+    "  ,10.0.0.30,true\n"
+)
+
+
+class DeviceImportTest(TestCase):
+    """
+    Test POST /api/devices/import/ and the import_devices command.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.url = "/api/devices/import/"
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.other = UserPlatform.objects.create(
+            email="other@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        self.router = Device.objects.create(
+            name="Router", ip_address="10.0.0.1", user_platform=self.user_platform
+        )
+        self.foreign = Device.objects.create(
+            name="Router", ip_address="10.0.0.1", user_platform=self.other
+        )
+
+    def upload(self, content, filename, **params):
+        upload = SimpleUploadedFile(filename, content)
+        query = "&".join(f"{name}={value}" for name, value in params.items())
+        return self.client.post(f"{self.url}?{query}", {"file": upload}, format="multipart")
+
+    def test_import_csv_upserts_by_name(self):
+        """
+        Test that existing devices are updated, new ones created and bad rows reported.
+        """
+        response = self.upload(CSV_CONTENT.encode(), "devices.csv")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            (response.data["created"], response.data["updated"], response.data["failed"]),
+            (1, 1, 2),
+        )
+        self.assertEqual([error["row"] for error in response.data["errors"]], [4, 5])
+        self.assertIn("ip_address", response.data["errors"][0]["errors"])
+        self.assertIn("name", response.data["errors"][1]["errors"])
+
+        self.router.refresh_from_db()
+        self.assertEqual((self.router.ip_address, self.router.is_active), ("10.0.0.10", False))
+        self.assertEqual(self.router.ip_int, 167772170)
+        created = Device.objects.get(user_platform=self.user_platform, name="Nuevo")
+        self.assertTrue(created.is_active)
+        self.assertEqual(created.created_by_id, self.user_platform.id)
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.foreign.ip_address, "10.0.0.1")
+
+    def test_import_gzipped_jsonl_by_ip(self):
+        """
+        Test a gzipped JSON lines upload keyed on ip_address.
+        """
+        lines = [
+            json.dumps({"name": "Renombrado", "ip_address": "10.0.0.1"}),
+            "no-es-json",
+            json.dumps({"name": "Otro", "ip_address": "10.0.0.2"}),
+        ]
+        content = gzip.compress("\n".join(lines).encode())
+
+        response = self.upload(content, "devices.jsonl.gz", key="ip_address")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["created"], response.data["updated"]), (1, 1))
+        self.assertEqual(response.data["errors"][0]["row"], 2)
+        self.router.refresh_from_db()
+        self.assertEqual(self.router.name, "Renombrado")
+
+    def test_rejects_bad_requests(self):
+        """
+        Test that missing files, unknown formats and keys are rejected.
+        """
+        response = self.client.post(self.url, {}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.upload(b"", "devices.xml")
+        self.assertIn("format", response.data)
+        response = self.upload(b"", "devices.csv", key="id")
+        self.assertIn("key", response.data)
+
+    def test_batches_are_bounded(self):
+        """
+        Test that each batch runs one lookup and one write per kind.
+        """
+        records = iter_records(io.BytesIO(CSV_CONTENT.encode()), "csv")
+        # Platform flag, then SAVEPOINT, SELECT, INSERT and UPDATE each
+        # followed by the user and platform counter updates, RELEASE; the
+        # second batch only holds invalid rows and writes nothing.
+        with self.assertNumQueries(10):
+            report = import_devices(self.user_platform, records, batch_size=2)
+        self.assertEqual((report.created, report.updated, report.failed), (1, 1, 2))
+
+    def test_repeated_keys_add_up(self):
+        """
+        Test that rows superseded by a later row with the same key are
+        counted, so the totals add up to the rows in the file.
+        """
+        rows = [
+            (1, {"name": "Nuevo", "ip_address": "10.0.0.2"}),
+            (2, {"name": "Router", "ip_address": "10.0.0.3"}),
+            (3, {"name": "Nuevo", "ip_address": "10.0.0.4"}),
+            (4, {"name": "Router", "ip_address": "10.0.0.5"}),
+        ]
+        report = import_devices(self.user_platform, rows)
+
+        self.assertEqual((report.created, report.updated, report.failed), (1, 3, 0))
+        created = Device.objects.get(user_platform=self.user_platform, name="Nuevo")
+        self.assertEqual(created.ip_address, "10.0.0.4")
+        self.router.refresh_from_db()
+        self.assertEqual(self.router.ip_address, "10.0.0.5")
+
+    def test_command(self):
+        """
+        Test that the command imports a file and prints a summary.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "devices.csv"
+            path.write_text(CSV_CONTENT)
+            out = io.StringIO()
+            call_command(
+                "import_devices",
+                str(self.user_platform.id),
+                str(path),
+                stdout=out,
+                stderr=io.StringIO(),
+            )
+        self.assertIn("1 creados, 1 actualizados, 2 con errores", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command("import_devices", "9999", "devices.csv")
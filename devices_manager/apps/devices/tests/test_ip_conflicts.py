@@ -0,0 +1,355 @@
+"""
+Unit tests for duplicate IP detection and per-platform unique IPs.
+"""
+
+import io
+
+from apps.devices.imports import import_devices
+from apps.devices.ip_conflicts import (
+    DUPLICATE_IP_ERROR,
+    IPConflictError,
+    find_ip_conflicts,
+    set_unique_device_ips,
+)
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class UniqueDeviceIPsTest(TestCase):
+    """
+    Test unique IP enforcement on devices of a platform.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.other_platform = Platform.objects.create(name="Otra Plataforma", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.neighbour = UserPlatform.objects.create(
+            email="vecino@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.outsider = UserPlatform.objects.create(
+            email="outsider@example.com",
+            platform=self.other_platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.router = Device.objects.create(
+            name="Router", ip_address="10.0.0.1", user_platform=self.user_platform
+        )
+        self.switch = Device.objects.create(
+            name="Switch", ip_address="10.0.0.2", user_platform=self.neighbour
+        )
+        Device.objects.create(name="Ajeno", ip_address="10.0.0.1", user_platform=self.outsider)
+        self.client.force_authenticate(user=self.user_platform)
+
+    def enforce(self):
+        set_unique_device_ips(self.platform)
+        self.user_platform.refresh_from_db()
+
+    def test_duplicates_allowed_by_default(self):
+        """
+        Test that platforms not enforcing unique IPs accept duplicates.
+        """
+        Device.objects.create(name="Copia", ip_address="10.0.0.1", user_platform=self.neighbour)
+        self.assertEqual(Device.objects.filter(ip_address="10.0.0.1").count(), 3)
+
+    def test_enforce_flags_devices(self):
+        """
+        Test that enforcing copies the flag onto the platform's devices only.
+        """
+        self.assertEqual(set_unique_device_ips(self.platform), 2)
+        self.platform.refresh_from_db()
+        self.assertTrue(self.platform.unique_device_ips)
+        self.assertEqual(
+            set(Device.objects.filter(ip_unique=True).values_list("pk", flat=True)),
+            {self.router.pk, self.switch.pk},
+        )
+        new = Device.objects.create(
+            name="Nuevo", ip_address="10.0.0.9", user_platform=self.neighbour
+        )
+        self.assertTrue(new.ip_unique)
+
+        self.assertEqual(set_unique_device_ips(self.platform, enabled=False), 3)
+        self.assertFalse(Device.objects.filter(ip_unique=True).exists())
+
+    def test_index_rejects_duplicates(self):
+        """
+        Test that the database rejects a second device with the same IP.
+        """
+        self.enforce()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Device.objects.create(name="Copia", ip_address="10.0.0.2", user_platform=self.neighbour)
+        Device.objects.create(name="Otro", ip_address="10.0.0.2", user_platform=self.outsider)
+
+    def test_enforce_refuses_conflicts(self):
+        """
+        Test that a platform with duplicated IPs cannot enforce them.
+        """
+        copy = Device.objects.create(
+            name="Copia", ip_address="10.0.0.1", user_platform=self.neighbour
+        )
+        with self.assertRaises(IPConflictError) as context:
+            set_unique_device_ips(self.platform)
+
+        self.assertEqual(len(context.exception.conflicts), 1)
+        self.assertEqual(
+            [device["id"] for device in context.exception.conflicts[0]["devices"]],
+            [self.router.pk, copy.pk],
+        )
+        self.platform.refresh_from_db()
+        self.assertFalse(self.platform.unique_device_ips)
+        self.assertFalse(Device.objects.filter(ip_unique=True).exists())
+
+    def test_create_and_update_report_duplicates(self):
+        """
+        Test that the API answers 400 for an IP used by another user's device.
+        """
+        self.enforce()
+        response = self.client.post(
+            "/api/devices/", {"name": "Copia", "ip_address": "10.0.0.2"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["ip_address"], [DUPLICATE_IP_ERROR])
+
+        response = self.client.patch(
+            f"/api/devices/{self.router.id}/", {"ip_address": "10.0.0.2"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["ip_address"], [DUPLICATE_IP_ERROR])
+
+        response = self.client.patch(
+            f"/api/devices/{self.router.id}/", {"name": "Router 2"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_stale_principal_keeps_devices_flagged(self):
+        """
+        Test that a principal loaded before enforcement neither unflags the
+        devices it updates nor creates unflagged ones.
+        """
+        stale = UserPlatform.objects.select_related("platform").get(pk=self.user_platform.pk)
+        self.enforce()
+        self.client.force_authenticate(user=stale)
+
+        response = self.client.patch(
+            f"/api/devices/{self.router.id}/", {"name": "Router 2"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.put(
+            f"/api/devices/{self.router.id}/",
+            {"name": "Router 3", "ip_address": "10.0.0.1"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.router.refresh_from_db()
+        self.assertTrue(self.router.ip_unique)
+
+        response = self.client.post(
+            "/api/devices/", {"name": "Copia", "ip_address": "10.0.0.1"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["ip_address"], [DUPLICATE_IP_ERROR])
+
+    def test_stale_principal_bulk_and_import_report_items(self):
+        """
+        Test that bulk writes and imports by a principal loaded before
+        enforcement still report duplicates per item and per row.
+        """
+        stale = UserPlatform.objects.select_related("platform").get(pk=self.user_platform.pk)
+        self.enforce()
+        self.client.force_authenticate(user=stale)
+
+        response = self.client.post(
+            "/api/devices/bulk/",
+            [{"name": "A", "ip_address": "10.0.0.5"}, {"name": "B", "ip_address": "10.0.0.1"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, [{}, {"ip_address": [DUPLICATE_IP_ERROR]}])
+
+        report = import_devices(stale, [(1, {"name": "Nuevo", "ip_address": "10.0.0.1"})])
+        self.assertEqual((report.created, report.updated, report.failed), (0, 0, 1))
+        self.assertEqual(report.errors[0]["errors"], {"ip_address": [DUPLICATE_IP_ERROR]})
+
+    def test_bulk_create_reports_items(self):
+        """
+        Test that bulk creation reports duplicates in the payload and the table.
+        """
+        self.enforce()
+        response = self.client.post(
+            "/api/devices/bulk/",
+            [
+                {"name": "A", "ip_address": "10.0.0.5"},
+                {"name": "B", "ip_address": "10.0.0.5"},
+                {"name": "C", "ip_address": "10.0.0.2"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data,
+            [{}, {"ip_address": [DUPLICATE_IP_ERROR]}, {"ip_address": [DUPLICATE_IP_ERROR]}],
+        )
+        self.assertFalse(Device.objects.filter(ip_address="10.0.0.5").exists())
+
+    def test_bulk_update_reports_items(self):
+        """
+        Test that bulk updates may keep a device's own IP but not take another's.
+        """
+        self.enforce()
+        other = Device.objects.create(
+            name="Otro", ip_address="10.0.0.3", user_platform=self.user_platform
+        )
+        response = self.client.patch(
+            "/api/devices/bulk/",
+            [
+                {"id": self.router.id, "ip_address": "10.0.0.1", "name": "Router 2"},
+                {"id": other.id, "ip_address": "10.0.0.2"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, [{}, {"ip_address": [DUPLICATE_IP_ERROR]}])
+
+    def test_import_skips_duplicates(self):
+        """
+        Test that imports report rows taking another device's IP.
+        """
+        self.enforce()
+        rows = [
+            (1, {"name": "Router", "ip_address": "10.0.0.1"}),
+            (2, {"name": "Nuevo", "ip_address": "10.0.0.2"}),
+            (3, {"name": "Otro", "ip_address": "10.0.0.7"}),
+            (4, {"name": "Repetido", "ip_address": "10.0.0.7"}),
+        ]
+        report = import_devices(self.user_platform, rows)
+
+        self.assertEqual((report.created, report.updated, report.failed), (1, 1, 2))
+        self.assertEqual([error["row"] for error in report.errors], [2, 4])
+        self.assertEqual(report.errors[0]["errors"], {"ip_address": [DUPLICATE_IP_ERROR]})
+
+
+class IPConflictReportTest(TestCase):
+    """
+    Test the IP conflict report, its endpoint and the device_ip_conflicts command.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.other_platform = Platform.objects.create(name="Otra Plataforma", is_active=True)
+        first = UserPlatform.objects.create(
+            email="first@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        second = UserPlatform.objects.create(
+            email="second@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        outsider = UserPlatform.objects.create(
+            email="outsider@example.com",
+            platform=self.other_platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.devices = Device.objects.bulk_create(
+            Device(name=f"Device {i}", ip_address=ip, user_platform=owner)
+            for i, (ip, owner) in enumerate(
+                [
+                    ("10.0.0.20", first),
+                    ("10.0.0.3", second),
+                    ("10.0.0.20", second),
+                    ("10.0.0.3", first),
+                    ("10.0.0.3", first),
+                    ("10.0.0.4", first),
+                    ("10.0.0.4", outsider),
+                ]
+            )
+        )
+        self.url = f"/api/platforms/{self.platform.id}/devices/ip-conflicts/"
+        self.staff = get_user_model().objects.create_user(
+            username="admin", password="admin", is_staff=True
+        )
+
+    def test_find_conflicts(self):
+        """
+        Test that conflicts are grouped per platform, in numeric IP order.
+        """
+        conflicts = find_ip_conflicts(self.platform.id)
+
+        self.assertEqual(
+            [(c["ip_address"], c["count"]) for c in conflicts], [("10.0.0.3", 3), ("10.0.0.20", 2)]
+        )
+        self.assertEqual(
+            [device["id"] for device in conflicts[1]["devices"]],
+            [self.devices[0].id, self.devices[2].id],
+        )
+        self.assertEqual(len(find_ip_conflicts()), 2)
+        self.assertEqual(len(find_ip_conflicts(self.platform.id, limit=1)), 1)
+        self.assertEqual(find_ip_conflicts(self.other_platform.id), [])
+
+    def test_endpoint(self):
+        """
+        Test the staff-only report endpoint.
+        """
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_login(self.staff)
+
+        data = self.client.get(self.url, {"limit": 1}).json()
+        self.assertEqual(data["platform_id"], self.platform.id)
+        self.assertFalse(data["unique_device_ips"])
+        self.assertTrue(data["truncated"])
+        self.assertEqual([c["ip_address"] for c in data["conflicts"]], ["10.0.0.3"])
+
+        response = self.client.get(self.url, {"limit": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get("/api/platforms/9999/devices/ip-conflicts/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command(self):
+        """
+        Test that the command reports conflicts and refuses to enforce them.
+        """
+        out = io.StringIO()
+        call_command("device_ip_conflicts", stdout=out)
+        self.assertIn("2 direcciones IP repetidas encontradas", out.getvalue())
+        self.assertIn("10.0.0.20 · 2 dispositivos", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command("device_ip_conflicts", "--enforce", stdout=io.StringIO())
+        with self.assertRaises(CommandError):
+            call_command(
+                "device_ip_conflicts", f"--platform={self.platform.id}", "--enforce", stdout=out
+            )
+
+        out = io.StringIO()
+        call_command(
+            "device_ip_conflicts", f"--platform={self.other_platform.id}", "--enforce", stdout=out
+        )
+        self.assertIn("1 dispositivos actualizados", out.getvalue())
+        self.other_platform.refresh_from_db()
+        self.assertTrue(self.other_platform.unique_device_ips)
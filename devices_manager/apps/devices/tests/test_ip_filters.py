@@ -0,0 +1,155 @@
+"""
+Unit tests for integer IP storage, CIDR/range filters and IP ordering.
+"""
+
+from unittest.mock import patch
+
+from apps.devices.models import Device
+from apps.devices.pagination import KeysetPagination
+from apps.platforms.models import Platform, UserPlatform
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class DeviceIPIntTest(TestCase):
+    """
+    Test that Device.ip_int follows ip_address on every write path.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+
+    def test_save_sets_ip_int(self):
+        """
+        Test that create and save keep ip_int in sync.
+        """
+        device = Device.objects.create(
+            name="Router", ip_address="10.2.0.1", user_platform=self.user_platform
+        )
+        self.assertEqual(device.ip_int, 167903233)
+
+        device.ip_address = "0.0.1.0"
+        device.save(update_fields=["ip_address"])
+        device.refresh_from_db()
+        self.assertEqual(device.ip_int, 256)
+
+    def test_bulk_writes_set_ip_int(self):
+        """
+        Test that bulk_create, bulk_update and update keep ip_int in sync.
+        """
+        devices = Device.objects.bulk_create(
+            [
+                Device(name="A", ip_address="0.0.0.1", user_platform=self.user_platform),
+                Device(name="B", ip_address="255.255.255.255", user_platform=self.user_platform),
+            ]
+        )
+        self.assertEqual(sorted(Device.objects.values_list("ip_int", flat=True)), [1, 4294967295])
+
+        devices[0].ip_address = "0.0.0.2"
+        Device.objects.bulk_update(devices, ["ip_address"])
+        self.assertEqual(Device.objects.get(name="A").ip_int, 2)
+
+        Device.objects.filter(name="B").update(ip_address="0.0.0.3")
+        self.assertEqual(Device.objects.get(name="B").ip_int, 3)
+
+
+class DeviceIPFilterTest(TestCase):
+    """
+    Test ?cidr=, ?ip_from=/?ip_to= and ?ordering=ip_address on DeviceViewSet.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        for name, ip_address in [
+            ("a", "10.2.0.1"),
+            ("b", "10.2.255.254"),
+            ("c", "10.3.0.1"),
+            ("d", "10.10.0.1"),
+            ("e", "9.255.255.255"),
+        ]:
+            Device.objects.create(
+                name=name, ip_address=ip_address, user_platform=self.user_platform
+            )
+
+    def get_names(self, params):
+        response = self.client.get("/api/devices/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["name"] for item in response.data["results"]]
+
+    def test_cidr_filter(self):
+        """
+        Test that ?cidr= returns the devices inside the network.
+        """
+        names = self.get_names({"cidr": "10.2.0.0/16", "ordering": "name"})
+        self.assertEqual(names, ["a", "b"])
+
+    def test_cidr_filter_uses_integer_range(self):
+        """
+        Test that ?cidr= is answered with a range on ip_int.
+        """
+        with CaptureQueriesContext(connection) as context:
+            self.get_names({"cidr": "10.2.0.0/16"})
+        sql = context.captured_queries[-1]["sql"]
+        self.assertIn('"ip_int" >= 167903232', sql)
+        self.assertIn('"ip_int" <= 167968767', sql)
+
+    def test_ip_range_filter(self):
+        """
+        Test that ?ip_from= and ?ip_to= are inclusive bounds.
+        """
+        names = self.get_names(
+            {"ip_from": "10.2.255.254", "ip_to": "10.10.0.1", "ordering": "name"}
+        )
+        self.assertEqual(names, ["b", "c", "d"])
+
+    def test_invalid_filters(self):
+        """
+        Test that malformed networks and addresses are rejected.
+        """
+        for params in ({"cidr": "10.2.0.0/33"}, {"ip_from": "not-an-ip"}, {"ip_to": "::1"}):
+            response = self.client.get("/api/devices/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ordering_by_ip_is_numeric(self):
+        """
+        Test that ?ordering=ip_address sorts addresses numerically.
+        """
+        self.assertEqual(self.get_names({"ordering": "ip_address"}), ["e", "a", "b", "c", "d"])
+        self.assertEqual(self.get_names({"ordering": "-ip_address"}), ["d", "c", "b", "a", "e"])
+
+    def test_cursor_pagination_by_ip(self):
+        """
+        Test that keyset pagination walks the numeric IP order.
+        """
+        names = []
+        url, params = "/api/devices/", {"pagination": "cursor", "ordering": "ip_address"}
+        with patch.object(KeysetPagination, "page_size", 2):
+            while url:
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                names.extend(item["name"] for item in response.data["results"])
+                url, params = response.data["next"], None
+        self.assertEqual(names, ["e", "a", "b", "c", "d"])
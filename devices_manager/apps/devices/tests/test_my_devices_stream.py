@@ -0,0 +1,75 @@
+"""
+Unit tests for the streaming mode of my_devices.
+"""
+
+import json
+
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class MyDevicesStreamTest(TestCase):
+    """
+    Test my_devices with ?stream=1 and Accept: application/x-ndjson.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        for i in range(1, 6):
+            Device.objects.create(
+                name=f"Dispositivo {i}",
+                ip_address=f"10.0.0.{i}",
+                user_platform=self.user_platform,
+            )
+        self.url = "/api/devices/my_devices/"
+
+    @override_settings(DEVICES_STREAM_CHUNK_SIZE=2)
+    def test_ndjson_stream(self):
+        """
+        Test that NDJSON output has one device per line.
+        """
+        expected = self.client.get(self.url).json()
+
+        response = self.client.get(self.url, HTTP_ACCEPT="application/x-ndjson")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], expected)
+
+    def test_json_array_stream(self):
+        """
+        Test that ?stream=1 streams the same JSON array as the buffered response.
+        """
+        expected = self.client.get(self.url).content
+
+        response = self.client.get(self.url, {"stream": "1"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b"".join(response.streaming_content), expected)
+
+    def test_empty_stream(self):
+        """
+        Test streaming when the user has no devices.
+        """
+        Device.objects.all().delete()
+
+        response = self.client.get(self.url, {"stream": "1"})
+
+        self.assertEqual(b"".join(response.streaming_content), b"[]")
@@ -0,0 +1,228 @@
+"""
+Unit tests for the device reachability prober.
+"""
+
+import asyncio
+import socket
+from datetime import timedelta
+from io import StringIO
+
+from apps.devices.models import Device
+from apps.devices.prober import (
+    DeviceProber,
+    ProbeReport,
+    backoff_exponent,
+    next_probe_delay,
+    probe_host,
+)
+from apps.platforms.models import Platform, UserPlatform
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+# Loopback address whose listener never completes new handshakes.
+UNRESPONSIVE_HOST = "127.0.0.2"
+
+
+class LocalListeners:
+    """
+    A port listening on 127.0.0.1 and, on the same port, an unresponsive
+    listener on UNRESPONSIVE_HOST: its accept queue (backlog 0) is filled
+    and never drained, so further SYNs are dropped and connections hang
+    like those to a host that is down. The kernel completes handshakes to
+    127.0.0.1 without accept() being called.
+    """
+
+    def __init__(self):
+        self.stalled = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.stalled.bind((UNRESPONSIVE_HOST, 0))
+        self.stalled.listen(0)
+        self.port = self.stalled.getsockname()[1]
+        self.sockets = [self.stalled]
+        for _ in range(3):
+            filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            filler.setblocking(False)
+            filler.connect_ex((UNRESPONSIVE_HOST, self.port))
+            self.sockets.append(filler)
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", self.port))
+        listener.listen(128)
+        self.sockets.append(listener)
+
+    def close(self):
+        for sock in self.sockets:
+            sock.close()
+
+
+def closed_port():
+    """
+    Return a localhost port nothing listens on.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class ProbeHostTest(SimpleTestCase):
+    """
+    Test single-host probes against localhost.
+    """
+
+    def setUp(self):
+        self.listeners = LocalListeners()
+        self.port = self.listeners.port
+
+    def tearDown(self):
+        self.listeners.close()
+
+    def test_listening_port_is_reachable(self):
+        """
+        Test that an accepted connection marks the host as reachable.
+        """
+        self.assertTrue(asyncio.run(probe_host("127.0.0.1", [self.port], 1)))
+
+    def test_refused_connection_is_reachable(self):
+        """
+        Test that a refused connection still proves the host is up.
+        """
+        self.assertTrue(asyncio.run(probe_host("127.0.0.1", [closed_port()], 1)))
+
+    def test_unreachable_host(self):
+        """
+        Test that a host that does not answer within the timeout is unreachable.
+        """
+        self.assertFalse(asyncio.run(probe_host(UNRESPONSIVE_HOST, [self.port], 0.2)))
+
+    def test_next_probe_delay_backs_off(self):
+        """
+        Test that failures double the delay up to the maximum.
+        """
+        delays = [
+            next_probe_delay(backoff_exponent(failures, 60, 600), 60, 600)
+            for failures in [0, 1, 2, 3, 4, 100]
+        ]
+        self.assertEqual(delays, [60, 120, 240, 480, 600, 600])
+
+
+class DeviceProberTest(TestCase):
+    """
+    Test probing passes over the device table.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.listeners = LocalListeners()
+        self.port = self.listeners.port
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.up = Device.objects.create(
+            name="Router", ip_address="127.0.0.1", user_platform=self.user_platform
+        )
+        self.down = Device.objects.create(
+            name="Switch", ip_address=UNRESPONSIVE_HOST, user_platform=self.user_platform
+        )
+        self.inactive = Device.objects.create(
+            name="Apagado",
+            ip_address="127.0.0.1",
+            is_active=False,
+            user_platform=self.user_platform,
+        )
+        self.prober = DeviceProber(
+            ports=[self.port], timeout=0.2, batch_size=1, interval=60, max_interval=600
+        )
+
+    def tearDown(self):
+        self.listeners.close()
+
+    def test_run_once_records_results(self):
+        """
+        Test that a pass probes due active devices and schedules the next probe.
+        """
+        report = self.prober.run_once()
+
+        self.assertEqual((report.probed, report.reachable, report.changed), (2, 1, 2))
+        self.up.refresh_from_db()
+        self.down.refresh_from_db()
+        self.inactive.refresh_from_db()
+        self.assertTrue(self.up.reachable)
+        self.assertIsNotNone(self.up.last_seen)
+        self.assertEqual(self.up.probe_failures, 0)
+        self.assertFalse(self.down.reachable)
+        self.assertIsNone(self.down.last_seen)
+        self.assertEqual(self.down.probe_failures, 1)
+        self.assertGreater(self.down.next_probe_at, self.up.next_probe_at)
+        self.assertIsNone(self.inactive.reachable)
+
+        self.assertEqual(self.prober.run_once().probed, 0)
+        later = timezone.now() + timedelta(seconds=200)
+        self.assertEqual(self.prober.run_once(now=later).probed, 2)
+        self.down.refresh_from_db()
+        self.assertEqual(self.down.probe_failures, 2)
+
+    def test_only_state_changes_are_notified(self):
+        """
+        Test that devices staying reachable are written without notifying clients.
+        """
+        self.prober.run_once()
+        self.user_platform.refresh_from_db()
+        version = self.user_platform.devices_version
+        self.up.refresh_from_db()
+        updated_at = self.up.updated_at
+
+        self.prober.run_once(now=timezone.now() + timedelta(seconds=1000))
+
+        self.user_platform.refresh_from_db()
+        self.up.refresh_from_db()
+        self.assertEqual(self.user_platform.devices_version, version)
+        self.assertEqual(self.up.updated_at, updated_at)
+        self.assertGreater(self.up.last_seen, updated_at)
+
+    def test_jitter_is_drawn_per_device(self):
+        """
+        Test that devices with the same outcome get different next probes.
+        """
+        devices = Device.objects.bulk_create(
+            Device(name=f"Nodo {i}", ip_address=f"10.0.0.{i}", user_platform=self.user_platform)
+            for i in range(1, 21)
+        )
+        rows = [(device.pk, device.ip_address, None, 0) for device in devices]
+        self.prober.save_results(rows, [True] * len(rows), ProbeReport())
+
+        next_probes = set(
+            Device.objects.filter(pk__in=[device.pk for device in devices]).values_list(
+                "next_probe_at", flat=True
+            )
+        )
+        self.assertEqual(len(next_probes), len(devices))
+        now = timezone.now()
+        for next_probe_at in next_probes:
+            self.assertLessEqual(next_probe_at, now + timedelta(seconds=66))
+            self.assertGreater(next_probe_at, now + timedelta(seconds=50))
+
+    def test_save_keeps_probe_fields(self):
+        """
+        Test that saving a stale instance does not overwrite probe results.
+        """
+        stale = Device.objects.get(pk=self.up.pk)
+        self.prober.run_once()
+        stale.name = "Renombrado"
+        stale.save()
+        self.up.refresh_from_db()
+        self.assertEqual(self.up.name, "Renombrado")
+        self.assertTrue(self.up.reachable)
+
+    def test_command_once(self):
+        """
+        Test that probe_devices --once runs a single pass.
+        """
+        out = StringIO()
+        call_command("probe_devices", "--once", f"--ports={self.port}", "--timeout=0.2", stdout=out)
+        self.assertIn("2 dispositivos sondeados", out.getvalue())
+        self.assertGreater(self.prober.seconds_until_due(), 0)
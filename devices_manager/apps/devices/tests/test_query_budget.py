@@ -0,0 +1,149 @@
+"""
+Query budget tests for device endpoints.
+"""
+
+from unittest.mock import patch
+
+from apps.core.query_budget import QueryBudgetTestMixin
+from apps.devices.ip_conflicts import set_unique_device_ips
+from apps.devices.models import Device
+from apps.devices.pagination import KeysetPagination
+from apps.platforms.models import Platform, UserPlatform
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class DeviceQueryBudgetTest(QueryBudgetTestMixin, TestCase):
+    """
+    Test that device endpoints run a constant number of queries.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.select_related("platform").get(
+            pk=UserPlatform.objects.create(
+                email="test@example.com",
+                platform=self.platform,
+                password="hashed_password",
+                is_active=True,
+            ).pk
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        self.devices = [
+            Device.objects.create(
+                name=f"Dispositivo {i}",
+                ip_address=f"10.0.0.{i}",
+                user_platform=self.user_platform,
+            )
+            for i in range(1, 11)
+        ]
+
+    def test_list(self):
+        """
+        Test that listing does not query per row.
+        """
+        with self.assertQueryBudget(3):
+            response = self.client.get("/api/devices/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["platform_name"], "Plataforma Test")
+
+    def test_my_devices(self):
+        """
+        Test that my_devices runs the version lookup and a single query.
+        """
+        with self.assertQueryBudget(2):
+            response = self.client.get("/api/devices/my_devices/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(response.data[0]["user_platform_email"], "test@example.com")
+
+    def test_reachability(self):
+        """
+        Test that reachability runs the count and page queries, or one keyset page query.
+        """
+        with self.assertQueryBudget(2):
+            response = self.client.get("/api/devices/reachability/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 10)
+        self.assertEqual(set(response.data["results"][0]), {"id", "reachable", "last_seen"})
+
+        with patch.object(KeysetPagination, "page_size", 5):
+            with self.assertQueryBudget(1):
+                response = self.client.get("/api/devices/reachability/", {"pagination": "cursor"})
+            with self.assertQueryBudget(1):
+                response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_retrieve(self):
+        """
+        Test that the detail route runs a single query.
+        """
+        with self.assertQueryBudget(1):
+            response = self.client.get(f"/api/devices/{self.devices[0].id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_create(self):
+        """
+        Test that creating a device runs an INSERT, the version and counter
+        bump and the platform counter update.
+        """
+        data = {"name": "Nuevo", "ip_address": "10.0.1.1"}
+        with self.assertQueryBudget(3):
+            response = self.client.post("/api/devices/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["platform_name"], "Plataforma Test")
+
+    def test_create_with_unique_ips(self):
+        """
+        Test that platforms enforcing unique IPs add no query to creation.
+        """
+        set_unique_device_ips(self.platform)
+        self.user_platform.platform.refresh_from_db()
+        data = {"name": "Nuevo", "ip_address": "10.0.1.1"}
+        with self.assertQueryBudget(3):
+            response = self.client.post("/api/devices/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Device.objects.get(pk=response.data["id"]).ip_unique)
+
+    def test_update(self):
+        """
+        Test that updating a device runs a lookup, an UPDATE and the version bump.
+        """
+        with self.assertQueryBudget(3):
+            response = self.client.patch(
+                f"/api/devices/{self.devices[0].id}/", {"name": "Otro"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_is_active(self):
+        """
+        Test that deactivating a device also updates the platform counters.
+        """
+        with self.assertQueryBudget(4):
+            response = self.client.patch(
+                f"/api/devices/{self.devices[0].id}/", {"is_active": False}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_toggle_active(self):
+        """
+        Test that toggling runs a single UPDATE ... RETURNING, the version and
+        counter bump and the platform counter update.
+        """
+        with self.assertQueryBudget(3):
+            response = self.client.patch(f"/api/devices/{self.devices[0].id}/toggle_active/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_destroy(self):
+        """
+        Test that deleting a device runs a lookup, a DELETE, the version and
+        counter bump, the platform counter update and the tombstone INSERT.
+        """
+        with self.assertQueryBudget(5):
+            response = self.client.delete(f"/api/devices/{self.devices[0].id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,142 @@
+"""
+Query plan regression tests for device endpoints.
+"""
+
+from unittest.mock import patch
+
+from apps.core.query_plans import QueryPlanTestMixin
+from apps.devices.export import export_rows
+from apps.devices.ip_conflicts import find_ip_conflicts, ip_conflict_errors, set_unique_device_ips
+from apps.devices.models import Device
+from apps.devices.pagination import KeysetPagination
+from apps.platforms.models import Platform, UserPlatform
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class DeviceQueryPlanTest(QueryPlanTestMixin, TestCase):
+    """
+    Test that device endpoint queries are answered from indexes, without
+    full scans or temporary sorts.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        neighbour = UserPlatform.objects.create(
+            email="vecino@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        Device.objects.bulk_create(
+            Device(
+                name=f"Router {i}",
+                ip_address=f"10.0.{i % 4}.{i}",
+                is_active=i % 3 != 0,
+                user_platform=owner,
+            )
+            for i in range(1, 31)
+            for owner in (self.user_platform, neighbour)
+        )
+        self.device = Device.objects.filter(user_platform=self.user_platform).first()
+
+    def assertIndexedGet(self, url, params=None):
+        with self.assertIndexedQueries():
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_list_orderings(self):
+        """
+        Test that every allowed ordering reads the matching composite index.
+        """
+        for ordering in [None, "name", "-name", "ip_address", "created_at", "-updated_at"]:
+            with self.subTest(ordering=ordering):
+                params = {"ordering": ordering} if ordering else {}
+                self.assertIndexedGet("/api/devices/", {**params, "page": 2})
+
+    def test_list_filters(self):
+        """
+        Test that search and IP range filters keep indexed plans.
+        """
+        self.assertIndexedGet("/api/devices/", {"search": "router"})
+        self.assertIndexedGet("/api/devices/", {"cidr": "10.0.1.0/24", "ordering": "ip_address"})
+        self.assertIndexedGet(
+            "/api/devices/", {"ip_from": "10.0.0.5", "ip_to": "10.0.2.0", "ordering": "-ip_address"}
+        )
+
+    def test_keyset_pages(self):
+        """
+        Test that keyset cursors seek into the index instead of sorting.
+        """
+        with patch.object(KeysetPagination, "page_size", 5):
+            for ordering in ["-created_at", "name", "-updated_at"]:
+                with self.subTest(ordering=ordering):
+                    response = self.assertIndexedGet(
+                        "/api/devices/", {"pagination": "cursor", "ordering": ordering}
+                    )
+                    self.assertIndexedGet(response.data["next"])
+
+    def test_detail_and_collection_endpoints(self):
+        """
+        Test retrieve, my_devices, stats, reachability and delta sync.
+        """
+        self.assertIndexedGet(f"/api/devices/{self.device.id}/")
+        self.assertIndexedGet("/api/devices/my_devices/")
+        self.assertIndexedGet("/api/devices/stats/")
+        self.assertIndexedGet("/api/devices/reachability/")
+        self.assertIndexedGet("/api/devices/reachability/", {"pagination": "cursor"})
+        token = self.assertIndexedGet("/api/devices/changes/").data["token"]
+        Device.objects.filter(pk=self.device.pk).delete()
+        self.assertIndexedGet("/api/devices/changes/", {"since": token})
+
+    def test_writes(self):
+        """
+        Test that write endpoints locate their rows through indexes.
+        """
+        url = f"/api/devices/{self.device.id}/"
+        with self.assertIndexedQueries():
+            self.assertEqual(self.client.patch(url, {"name": "Otro"}).status_code, 200)
+        with self.assertIndexedQueries():
+            self.assertEqual(self.client.patch(f"{url}toggle_active/").status_code, 200)
+        with self.assertIndexedQueries():
+            response = self.client.post(
+                "/api/devices/set_active/?cidr=10.0.2.0/24", {"is_active": False}, format="json"
+            )
+            self.assertEqual(response.status_code, 200)
+        with self.assertIndexedQueries():
+            self.assertEqual(self.client.delete(url).status_code, 204)
+
+    def test_export(self):
+        """
+        Test that the platform export streams in index order.
+        """
+        with self.assertIndexedQueries():
+            rows = list(export_rows(self.platform.id))
+        self.assertEqual(len(rows), 60)
+
+    def test_ip_conflicts(self):
+        """
+        Test that the conflict report groups on the (platform, ip_int) index
+        and unique IP checks read the partial unique index.
+        """
+        with self.assertIndexedQueries():
+            conflicts = find_ip_conflicts(self.platform.id)
+        self.assertEqual(len(conflicts), 30)
+        Device.objects.filter(user_platform=self.user_platform).delete()
+        set_unique_device_ips(self.platform)
+        with self.assertIndexedQueries():
+            errors = ip_conflict_errors(self.platform.id, [("10.0.1.1", ("new", 0))])
+        self.assertEqual(len(errors[0]), 1)
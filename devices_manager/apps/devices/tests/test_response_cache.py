@@ -0,0 +1,264 @@
+"""
+Unit tests for the per-user device response cache.
+"""
+
+from unittest.mock import patch
+
+from apps.devices.cache import DeviceResponseCache, device_response_cache
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+
+class DeviceResponseCacheTest(TestCase):
+    """
+    Test caching and invalidation of list and my_devices responses.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        cache.clear()
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.other = UserPlatform.objects.create(
+            email="other@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        self.device = Device.objects.create(
+            name="Router", ip_address="10.0.0.1", user_platform=self.user_platform
+        )
+
+    def test_second_request_is_served_from_cache(self):
+        """
+        Test that a repeated list request runs no queries.
+        """
+        first = self.client.get("/api/devices/")
+        self.assertEqual(first["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/devices/")
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_moved_device_leaves_previous_owner_cache(self):
+        """
+        Test that moving a device to another user invalidates the previous
+        owner's cached and validated collection.
+        """
+        etag = self.client.get("/api/devices/")["ETag"]
+        device = Device.objects.get(pk=self.device.pk)
+        device.user_platform = self.other
+        device.save()
+
+        response = self.client.get("/api/devices/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"], [])
+
+    def test_reachability_is_never_cached(self):
+        """
+        Test that last_seen, updated without invalidating the cache, is left
+        out of cached responses and read fresh from the reachability endpoint.
+        """
+        self.assertNotIn("last_seen", self.client.get("/api/devices/").data["results"][0])
+        seen = timezone.now()
+        Device.objects.filter(pk=self.device.pk).update_quietly(reachable=True, last_seen=seen)
+
+        self.assertEqual(self.client.get("/api/devices/")["X-Cache"], "HIT")
+        response = self.client.get("/api/devices/reachability/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"], [{"id": self.device.id, "reachable": True, "last_seen": seen}]
+        )
+        self.assertNotIn("ETag", response)
+
+    def test_cache_hit_answers_conditional_request(self):
+        """
+        Test that a cached entry answers If-None-Match with 304.
+        """
+        etag = self.client.get("/api/devices/")["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/devices/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_keyed_by_query_and_page(self):
+        """
+        Test that different query parameters are cached separately.
+        """
+        self.client.get("/api/devices/")
+        response = self.client.get("/api/devices/", {"ordering": "name"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        response = self.client.get("/api/devices/", {"page": 1})
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_writes_invalidate(self):
+        """
+        Test that API writes invalidate the writer's cached lists.
+        """
+        writes = [
+            lambda: self.client.post(
+                "/api/devices/", {"name": "Nuevo", "ip_address": "10.0.0.2"}, format="json"
+            ),
+            lambda: self.client.patch(
+                f"/api/devices/{self.device.id}/", {"name": "Otro"}, format="json"
+            ),
+            lambda: self.client.patch(f"/api/devices/{self.device.id}/toggle_active/"),
+            lambda: self.client.delete(f"/api/devices/{self.device.id}/"),
+        ]
+        for write in writes:
+            self.client.get("/api/devices/")
+            self.client.get("/api/devices/my_devices/")
+            self.assertLess(write().status_code, 300)
+            self.assertEqual(self.client.get("/api/devices/")["X-Cache"], "MISS")
+            self.assertEqual(self.client.get("/api/devices/my_devices/")["X-Cache"], "MISS")
+
+    def test_keyed_by_host(self):
+        """
+        Test that pages are cached per host, since their links are absolute.
+        """
+        Device.objects.create(
+            name="Switch", ip_address="10.0.0.2", user_platform=self.user_platform
+        )
+        with patch("rest_framework.pagination.PageNumberPagination.page_size", 1):
+            self.client.get("/api/devices/", HTTP_HOST="localhost")
+            response = self.client.get("/api/devices/", HTTP_HOST="127.0.0.1")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertTrue(response.data["next"].startswith("http://127.0.0.1/"))
+
+    def test_culled_generation_does_not_revive_entries(self):
+        """
+        Test that losing a generation key never serves entries cached before
+        the writes it recorded.
+        """
+        self.client.get("/api/devices/")
+        self.device.name = "Editado"
+        self.device.save()
+        cache.delete(device_response_cache.user_generation_key(self.user_platform.pk))
+        response = self.client.get("/api/devices/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["name"], "Editado")
+
+    def test_admin_style_edits_invalidate(self):
+        """
+        Test that model saves and platform renames invalidate the cache.
+        """
+        self.client.get("/api/devices/")
+        self.device.name = "Editado"
+        self.device.save()
+        response = self.client.get("/api/devices/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["name"], "Editado")
+
+        self.platform.name = "Renombrada"
+        self.platform.save()
+        response = self.client.get("/api/devices/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["platform_name"], "Renombrada")
+
+    def test_other_users_writes_keep_cache(self):
+        """
+        Test that another user's writes leave the cache in place.
+        """
+        self.client.get("/api/devices/")
+        Device.objects.create(name="Ajeno", ip_address="10.0.0.9", user_platform=self.other)
+        self.assertEqual(self.client.get("/api/devices/")["X-Cache"], "HIT")
+
+    def test_streamed_my_devices_is_not_cached(self):
+        """
+        Test that streamed responses bypass the cache.
+        """
+        self.client.get("/api/devices/my_devices/", {"stream": "1"})
+        response = self.client.get("/api/devices/my_devices/", {"stream": "1"})
+        self.assertTrue(response.streaming)
+        self.assertNotIn("X-Cache", response)
+
+    @override_settings(DEVICES_RESPONSE_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        """
+        Test that a timeout of 0 disables the cache.
+        """
+        self.client.get("/api/devices/")
+        response = self.client.get("/api/devices/")
+        self.assertNotIn("X-Cache", response)
+
+    def test_stats(self):
+        """
+        Test the hit ratio metrics.
+        """
+        with (
+            patch.object(device_response_cache, "hits", 0),
+            patch.object(device_response_cache, "misses", 0),
+        ):
+            self.client.get("/api/devices/")
+            self.client.get("/api/devices/")
+            self.client.get("/api/devices/")
+            stats = device_response_cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertAlmostEqual(stats["hit_ratio"], 2 / 3)
+
+
+class DeviceResponseCacheStampedeTest(TestCase):
+    """
+    Test that concurrent misses are rebuilt by a single request.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        cache.clear()
+        self.response_cache = DeviceResponseCache()
+
+    def build(self):
+        response = Response({"results": []})
+        response["ETag"] = '"x"'
+        return response
+
+    def test_waiting_request_uses_built_entry(self):
+        """
+        Test that a request finding the lock taken waits for the entry.
+        """
+        key = "devices:resp:test"
+        cache.add(f"{key}:lock", 1, 10)
+        entry = {"data": {"results": [1]}, "etag": '"y"', "last_modified": None}
+
+        def sleep(seconds):
+            cache.set(key, entry)
+
+        with patch("apps.devices.cache.time.sleep", side_effect=sleep):
+            found, response = self.response_cache.fill(key, self.build)
+        self.assertIsNone(response)
+        self.assertEqual(found, entry)
+        self.assertEqual(self.response_cache.waits, 1)
+        self.assertEqual(self.response_cache.misses, 0)
+
+    @override_settings(DEVICES_RESPONSE_CACHE_LOCK_WAIT=0)
+    def test_builds_when_lock_holder_is_slow(self):
+        """
+        Test that waiting is bounded and the request builds the entry itself.
+        """
+        key = "devices:resp:test"
+        cache.add(f"{key}:lock", 1, 10)
+        found, response = self.response_cache.fill(key, self.build)
+        self.assertIsNone(found)
+        self.assertEqual(response.data, {"results": []})
+        self.assertIsNotNone(cache.get(key))
+        self.assertIsNotNone(cache.get(f"{key}:lock"))
@@ -0,0 +1,139 @@
+"""
+Unit tests for the read-optimized device serialization path.
+"""
+
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from io import StringIO
+
+from apps.devices.models import Device
+from apps.devices.rows import RowSerializer
+from apps.devices.serializers import DeviceSerializer
+from apps.platforms.models import Platform, UserPlatform
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+
+class RowSerializerTest(TestCase):
+    """
+    Test that RowSerializer output is byte-identical to DeviceSerializer.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma «Ñandú»", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        names = ["Router", "Cámara 📷", 'Con "comillas"', "  espacios  "]
+        for i, name in enumerate(names, start=1):
+            Device.objects.create(
+                name=name,
+                ip_address=f"10.0.{i}.{i * 60}",
+                is_active=bool(i % 2),
+                user_platform=self.user_platform,
+            )
+        # Whole seconds render without a fractional part.
+        Device.objects.filter(name="Router").update(
+            created_at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc)
+        )
+
+    def queryset(self):
+        return Device.objects.filter(user_platform=self.user_platform).select_related(
+            "user_platform__platform"
+        )
+
+    def assert_equivalent(self):
+        expected = JSONRenderer().render(DeviceSerializer(self.queryset(), many=True).data)
+        row_serializer = RowSerializer(DeviceSerializer())
+        rows = row_serializer.serialize(row_serializer.get_queryset(self.queryset()))
+        self.assertEqual(JSONRenderer().render(rows), expected)
+        self.assertEqual(
+            JSONRenderer().render(list(row_serializer.iter_serialized(self.queryset()))),
+            expected,
+        )
+
+    def test_byte_identical(self):
+        """
+        Test that both paths render exactly the same bytes.
+        """
+        self.assert_equivalent()
+
+    @override_settings(TIME_ZONE="America/Bogota")
+    def test_byte_identical_other_timezone(self):
+        """
+        Test that datetimes are converted to the current timezone like DRF does.
+        """
+        self.assert_equivalent()
+
+    def test_single_query(self):
+        """
+        Test that rows, joined email and platform name come from one query.
+        """
+        row_serializer = RowSerializer(DeviceSerializer())
+        with self.assertNumQueries(1):
+            rows = row_serializer.serialize(row_serializer.get_queryset(self.queryset()))
+        self.assertEqual(rows[0]["platform_name"], "Plataforma «Ñandú»")
+
+    def test_rejects_computed_fields(self):
+        """
+        Test that fields without a backing column are refused.
+        """
+
+        class ComputedSerializer(DeviceSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta(DeviceSerializer.Meta):
+                fields = [*DeviceSerializer.Meta.fields, "label"]
+
+            def get_label(self, obj):
+                return str(obj)
+
+        with self.assertRaises(ValueError):
+            RowSerializer(ComputedSerializer())
+
+    def test_endpoints_match_model_serializer(self):
+        """
+        Test that the list endpoints return what DeviceSerializer would.
+        """
+        expected = DeviceSerializer(self.queryset().order_by("-created_at"), many=True).data
+        response = self.client.get("/api/devices/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], expected)
+
+        expected = DeviceSerializer(self.queryset().order_by("ip_int", "pk"), many=True).data
+        response = self.client.get(
+            "/api/devices/", {"pagination": "cursor", "ordering": "ip_address"}
+        )
+        self.assertEqual(response.data["results"], expected)
+
+        expected = DeviceSerializer(self.queryset(), many=True).data
+        response = self.client.get("/api/devices/my_devices/")
+        self.assertEqual(response.data, expected)
+
+    def test_list_rendering_matches_json_renderer(self):
+        """
+        Test that the list payload renders to the bytes of DRF's JSONRenderer.
+        """
+        response = self.client.get("/api/devices/")
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_benchmark_command(self):
+        """
+        Test that the benchmark checks equivalence and leaves no data behind.
+        """
+        out = StringIO()
+        call_command("benchmark_device_serializers", rows=20, repeat=1, stdout=out)
+        self.assertIn("Salidas idénticas", out.getvalue())
+        self.assertFalse(Platform.objects.filter(name="Benchmark").exists())
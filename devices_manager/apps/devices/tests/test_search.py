@@ -0,0 +1,139 @@
+"""
+Unit tests for the indexed device search backend.
+"""
+
+from apps.devices.models import Device
+from apps.devices.search import FTS_TABLE
+from apps.platforms.models import Platform, UserPlatform
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class DeviceSearchTest(TestCase):
+    """
+    Test ?search= on DeviceViewSet.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        other = UserPlatform.objects.create(
+            email="other@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        self.router = self.create_device("Router Principal", "192.168.1.1")
+        self.switch = self.create_device("Switch Piso 2", "192.168.2.10")
+        self.camera = self.create_device("Cámara Entrada", "10.0.0.5")
+        self.create_device("Router Ajeno", "192.168.1.1", user_platform=other)
+
+    def create_device(self, name, ip_address, user_platform=None):
+        return Device.objects.create(
+            name=name, ip_address=ip_address, user_platform=user_platform or self.user_platform
+        )
+
+    def search(self, term):
+        response = self.client.get("/api/devices/", {"search": term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item["id"] for item in response.data["results"]}
+
+    def test_search_uses_fts_index(self):
+        """
+        Test that searches on SQLite run through the FTS5 table.
+        """
+        with CaptureQueriesContext(connection) as context:
+            self.search("router")
+
+        self.assertTrue(any(f"{FTS_TABLE} MATCH" in q["sql"] for q in context.captured_queries))
+
+    def test_search_by_name_substring(self):
+        """
+        Test case-insensitive substring search on the name.
+        """
+        self.assertEqual(self.search("outer"), {self.router.id})
+        self.assertEqual(self.search("PISO"), {self.switch.id})
+
+    def test_search_by_ip_substring(self):
+        """
+        Test substring search on the IP address.
+        """
+        self.assertEqual(self.search("192.168"), {self.router.id, self.switch.id})
+        self.assertEqual(self.search("0.0.5"), {self.camera.id})
+
+    def test_all_terms_must_match(self):
+        """
+        Test that every search term has to match.
+        """
+        self.assertEqual(self.search("router 192.168"), {self.router.id})
+        self.assertEqual(self.search("router 10.0"), set())
+
+    def test_short_terms_fall_back_to_icontains(self):
+        """
+        Test terms shorter than a trigram.
+        """
+        self.assertEqual(self.search("2"), {self.router.id, self.switch.id})
+
+    def test_index_follows_updates_and_deletes(self):
+        """
+        Test that the FTS table stays in sync with writes.
+        """
+        Device.objects.filter(pk=self.router.pk).update(name="Gateway")
+        self.switch.delete()
+        Device.objects.bulk_create(
+            [Device(name="Router Nuevo", ip_address="172.16.0.1", user_platform=self.user_platform)]
+        )
+
+        new = Device.objects.get(name="Router Nuevo")
+        self.assertEqual(self.search("router"), {new.id})
+        self.assertEqual(self.search("gateway"), {self.router.id})
+        self.assertEqual(self.search("piso"), set())
+
+    @override_settings(DEVICES_SEARCH_BACKEND="apps.devices.search.IContainsSearchBackend")
+    def test_icontains_backend_matches_fts(self):
+        """
+        Test that the icontains backend returns the same results.
+        """
+        self.assertEqual(self.search("outer"), {self.router.id})
+        self.assertEqual(self.search("192.168"), {self.router.id, self.switch.id})
+
+
+class SearchIndexMigrationTest(TransactionTestCase):
+    """
+    Test that the FTS triggers survive the migrations that rebuild the table.
+    """
+
+    def triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+                ["devices_device"],
+            )
+            return {name for (name,) in cursor.fetchall()}
+
+    def test_reverse_and_reapply(self):
+        """
+        Test that the triggers are there after reverting and reapplying.
+        """
+        triggers = {f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au"}
+        self.assertEqual(self.triggers(), triggers)
+        try:
+            call_command("migrate", "devices", "0006", verbosity=0)
+            self.assertEqual(self.triggers(), triggers)
+        finally:
+            call_command("migrate", "devices", verbosity=0)
+        self.assertEqual(self.triggers(), triggers)
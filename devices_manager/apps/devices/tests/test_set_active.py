@@ -0,0 +1,135 @@
+"""
+Unit tests for the single-statement toggle_active and bulk set_active.
+"""
+
+from apps.devices.models import Device
+from apps.platforms.models import Platform, UserPlatform
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class DeviceSetActiveTest(TestCase):
+    """
+    Test toggle_active and set_active against the database.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(name="Plataforma Test", is_active=True)
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.other = UserPlatform.objects.create(
+            email="other@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        self.router = self.create_device("Router Principal", "10.2.0.1")
+        self.switch = self.create_device("Switch Piso 2", "10.2.0.2")
+        self.camera = self.create_device("Cámara Entrada", "10.3.0.5")
+        self.foreign = self.create_device("Router Ajeno", "10.2.0.3", user_platform=self.other)
+
+    def create_device(self, name, ip_address, user_platform=None):
+        return Device.objects.create(
+            name=name, ip_address=ip_address, user_platform=user_platform or self.user_platform
+        )
+
+    def test_toggle_runs_single_update_returning(self):
+        """
+        Test that toggling is one UPDATE ... RETURNING and returns the new row.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(f"/api/devices/{self.router.id}/toggle_active/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["is_active"])
+        self.assertEqual(response.data["platform_name"], "Plataforma Test")
+        statements = [query["sql"] for query in context.captured_queries]
+        self.assertTrue(statements[0].startswith('UPDATE "devices_device"'))
+        self.assertIn("NOT", statements[0])
+        self.assertIn("RETURNING", statements[0])
+        self.assertFalse(any(sql.startswith("SELECT") for sql in statements))
+
+        self.router.refresh_from_db()
+        self.assertFalse(self.router.is_active)
+        self.assertEqual(self.router.updated_by, self.user_platform)
+
+    def test_toggle_twice_restores_state(self):
+        """
+        Test that consecutive toggles flip the stored value each time.
+        """
+        url = f"/api/devices/{self.router.id}/toggle_active/"
+        self.assertFalse(self.client.patch(url).data["is_active"])
+        self.assertTrue(self.client.patch(url).data["is_active"])
+
+    def test_toggle_not_found(self):
+        """
+        Test that unknown, foreign and malformed ids return 404 without changes.
+        """
+        for pk in (999, self.foreign.id, "abc"):
+            response = self.client.patch(f"/api/devices/{pk}/toggle_active/")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.foreign.refresh_from_db()
+        self.assertTrue(self.foreign.is_active)
+
+    def test_set_active_by_search(self):
+        """
+        Test deactivating every device matching ?search= in one statement.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                "/api/devices/set_active/?search=router", {"is_active": False}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"updated": 1})
+        updates = [q["sql"] for q in context.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len([sql for sql in updates if '"devices_device"' in sql]), 1)
+
+        self.assertFalse(Device.objects.get(pk=self.router.pk).is_active)
+        self.assertTrue(Device.objects.get(pk=self.switch.pk).is_active)
+        self.assertTrue(Device.objects.get(pk=self.foreign.pk).is_active)
+
+    def test_set_active_by_cidr(self):
+        """
+        Test that IP filters select the devices to update.
+        """
+        response = self.client.post(
+            "/api/devices/set_active/?cidr=10.2.0.0/16", {"is_active": False}, format="json"
+        )
+        self.assertEqual(response.data, {"updated": 2})
+        self.assertEqual(
+            set(Device.objects.filter(is_active=False).values_list("pk", flat=True)),
+            {self.router.pk, self.switch.pk},
+        )
+
+        response = self.client.post("/api/devices/set_active/", {"is_active": False}, format="json")
+        self.assertEqual(response.data, {"updated": 1})
+
+    def test_set_active_invalid_payload(self):
+        """
+        Test that a missing or non-boolean is_active is rejected.
+        """
+        for data in ({}, {"is_active": "tal vez"}):
+            response = self.client.post("/api/devices/set_active/", data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("is_active", response.data)
+
+    def test_set_active_bumps_version(self):
+        """
+        Test that the collection version advances for the affected user only.
+        """
+        self.client.post("/api/devices/set_active/", {"is_active": False}, format="json")
+        self.user_platform.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.user_platform.devices_version, 4)
+        self.assertEqual(self.other.devices_version, 1)
@@ -0,0 +1,131 @@
+"""
+Unit tests for ?fields= and ?omit= sparse fieldsets.
+"""
+
+from unittest.mock import patch
+
+from apps.devices.models import Device
+from apps.devices.pagination import KeysetPagination
+from apps.platforms.models import Platform, UserPlatform
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class SparseFieldsetTest(TestCase):
+    """
+    Test sparse fieldsets on the device and platform endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.client = APIClient()
+        self.platform = Platform.objects.create(
+            name="Plataforma Test", description="Descripción", is_active=True
+        )
+        self.user_platform = UserPlatform.objects.create(
+            email="test@example.com",
+            platform=self.platform,
+            password="hashed_password",
+            is_active=True,
+        )
+        self.client.force_authenticate(user=self.user_platform)
+        self.device = Device.objects.create(
+            name="Router", ip_address="10.0.0.1", user_platform=self.user_platform
+        )
+        Device.objects.create(
+            name="Switch", ip_address="10.0.0.2", user_platform=self.user_platform
+        )
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        device_queries = [q["sql"] for q in queries if 'FROM "devices_device"' in q["sql"]]
+        return response, device_queries
+
+    def test_list_fields_prunes_columns_and_joins(self):
+        """
+        Test that ?fields= shrinks the payload and drops columns and joins.
+        """
+        response, queries = self.get("/api/devices/", {"fields": "id,name,is_active"})
+
+        self.assertEqual(
+            [set(item) for item in response.data["results"]], [{"id", "name", "is_active"}] * 2
+        )
+        select = queries[-1]
+        self.assertNotIn("JOIN", select)
+        self.assertNotIn('"ip_address"', select)
+
+    def test_list_omit_reads_device_table_only(self):
+        """
+        Test that ?omit= drops fields and relations are never joined.
+        """
+        response, queries = self.get(
+            "/api/devices/",
+            {"omit": "reachable,platform_name,created_at,updated_at"},
+        )
+
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {"id", "name", "ip_address", "is_active", "user_platform_email"},
+        )
+        self.assertEqual(response.data["results"][0]["user_platform_email"], "test@example.com")
+        self.assertNotIn("JOIN", queries[-1])
+
+    def test_keyset_pagination_with_fields(self):
+        """
+        Test that keyset cursors still work when the ordering column is not rendered.
+        """
+        params = {"fields": "id", "pagination": "cursor", "ordering": "name"}
+        with patch.object(KeysetPagination, "page_size", 1):
+            response, _ = self.get("/api/devices/", params)
+            self.assertEqual(response.data["results"], [{"id": self.device.id}])
+            response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertNotEqual(response.data["results"][0]["id"], self.device.id)
+
+    def test_retrieve_and_my_devices(self):
+        """
+        Test sparse fieldsets on the detail and my_devices endpoints.
+        """
+        response, queries = self.get(f"/api/devices/{self.device.id}/", {"fields": "id,name"})
+        self.assertEqual(response.data, {"id": self.device.id, "name": "Router"})
+        self.assertNotIn("JOIN", queries[0])
+        self.assertNotIn('"ip_address"', queries[0])
+
+        response, _ = self.get("/api/devices/my_devices/", {"fields": "name"})
+        self.assertEqual(response.data, [{"name": "Router"}, {"name": "Switch"}])
+
+    def test_unknown_field(self):
+        """
+        Test that unknown field names are rejected.
+        """
+        response = self.client.get("/api/devices/", {"fields": "id,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
+
+    def test_writes_return_full_representation(self):
+        """
+        Test that sparse parameters do not apply to writes.
+        """
+        response = self.client.patch(
+            f"/api/devices/{self.device.id}/?fields=id", {"name": "Otro"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("platform_name", response.data)
+
+    def test_platforms(self):
+        """
+        Test sparse fieldsets on the platform list.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/platforms/", {"fields": "id,name"})
+        self.assertEqual(
+            response.data["results"], [{"id": self.platform.id, "name": "Plataforma Test"}]
+        )
+        self.assertNotIn('"description"', queries[-1]["sql"])
@@ -2,7 +2,12 @@
 Device URLs.
 """
 
-from apps.devices.views import DeviceViewSet
+from apps.devices.views import (
+    DeviceViewSet,
+    device_events,
+    export_platform_devices,
+    platform_ip_conflicts,
+)
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
@@ -12,5 +17,16 @@ router.register(r"devices", DeviceViewSet, basename="device")
 app_name = "devices"
 
 urlpatterns = [
+    path("devices/events/", device_events, name="device-events"),
+    path(
+        "platforms/<int:platform_id>/devices/export/",
+        export_platform_devices,
+        name="platform-devices-export",
+    ),
+    path(
+        "platforms/<int:platform_id>/devices/ip-conflicts/",
+        platform_ip_conflicts,
+        name="platform-devices-ip-conflicts",
+    ),
     path("", include(router.urls)),
 ]
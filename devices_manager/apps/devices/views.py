@@ -2,16 +2,52 @@
 Device views.
 """
 
+import functools
+
+from apps.core.fieldsets import SparseFieldsetMixin
+from apps.core.query_budget import query_budget
+from apps.devices.bulk import bulk_create_devices, bulk_delete_devices, bulk_update_devices
+from apps.devices.cache import device_response_cache
+from apps.devices.conditional import (
+    collection_validators,
+    conditional_response,
+    instance_validators,
+)
+from apps.devices.events import event_stream, get_event_broker
+from apps.devices.export import FORMATS, export_filename, export_stream
+from apps.devices.filters import DeviceIPFilter, DeviceOrderingFilter
+from apps.devices.imports import (
+    IMPORT_FORMATS,
+    IMPORT_KEYS,
+    detect_format,
+    import_devices,
+    iter_records,
+)
+from apps.devices.ip_conflicts import find_ip_conflicts
 from apps.devices.models import Device
-from apps.devices.serializers import DeviceSerializer
-from apps.platforms.models import UserPlatform
-from rest_framework import filters, status, viewsets
+from apps.devices.pagination import KeysetPagination
+from apps.devices.renderers import NDJSONRenderer
+from apps.devices.rows import RowSerializer
+from apps.devices.search import DeviceSearchFilter
+from apps.devices.serializers import DeviceSerializer, DeviceSetActiveSerializer
+from apps.devices.streaming import streaming_response
+from apps.devices.sync import encode_token, get_changes
+from apps.platforms.models import Platform, UserPlatform
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 
-class DeviceViewSet(viewsets.ModelViewSet):
+class DeviceViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Device model.
     Returns only devices belonging to the authenticated user in their current platform.
@@ -19,23 +55,112 @@ class DeviceViewSet(viewsets.ModelViewSet):
 
     serializer_class = DeviceSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DeviceSearchFilter, DeviceIPFilter, DeviceOrderingFilter]
     search_fields = ["name", "ip_address"]
-    ordering_fields = ["name", "created_at", "updated_at"]
+    ordering_fields = ["name", "ip_address", "created_at", "updated_at"]
     ordering = ["-created_at"]
 
+    @property
+    def paginator(self):
+        """
+        Use keyset pagination when requested (?pagination=cursor or ?cursor=),
+        page-number pagination otherwise.
+        """
+        if not hasattr(self, "_paginator"):
+            if KeysetPagination.is_requested(self.request):
+                self._paginator = KeysetPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
     def get_queryset(self):
         """
-        Filter devices by authenticated user_platform.
+        Filter devices by authenticated user_platform, pruned to the columns
+        of the requested sparse fieldset on reads.
+        Both filters are device columns covered by the (platform,
+        user_platform, ...) indexes, and the user and platform rendered by the
+        serializer are the authenticated ones, so no other table is read.
         """
         user_platform = self.request.user
         if isinstance(user_platform, UserPlatform):
-            return Device.objects.filter(
-                user_platform=user_platform,
-                user_platform__platform=user_platform.platform,
-            )
+            queryset = Device.objects.for_user_platform(user_platform)
+            return self.prune_queryset(queryset, extra=["updated_at"])
         return Device.objects.none()
 
+    def get_row_serializer(self):
+        """
+        Return the read-optimized serializer for list responses. Keyset
+        cursors read the ordering column from the rows, so it is fetched too
+        when they are in use.
+        """
+        extra_columns = []
+        if isinstance(self.paginator, KeysetPagination):
+            ordering = DeviceOrderingFilter().get_ordering(
+                self.request, Device.objects.none(), self
+            )
+            extra_columns = [term.lstrip("-") for term in ordering or []]
+        related_objects = None
+        user_platform = self.request.user
+        if isinstance(user_platform, UserPlatform):
+            related_objects = {"user_platform": user_platform, "platform": user_platform.platform}
+        return RowSerializer(
+            self.get_serializer(), extra_columns=extra_columns, related_objects=related_objects
+        )
+
+    def list_rows(self, request):
+        """
+        List devices through the row serializer; same output as ListModelMixin.list.
+        """
+        row_serializer = self.get_row_serializer()
+        rows = row_serializer.get_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(row_serializer.serialize(page))
+        return Response(row_serializer.serialize(rows))
+
+    @query_budget(3)
+    def list(self, request, *args, **kwargs):
+        """
+        List devices from the per-user response cache, answering conditional
+        requests from the collection version stamp before the page is queried.
+        """
+        list_devices = functools.partial(self.list_rows, request)
+        user_platform = request.user
+        if not isinstance(user_platform, UserPlatform):
+            return list_devices()
+
+        def build():
+            etag, last_modified = collection_validators(request, user_platform)
+            return conditional_response(request, etag, last_modified, list_devices)
+
+        return device_response_cache.respond(request, user_platform, build)
+
+    @query_budget(1)
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Return a device, answering conditional requests from its updated_at.
+        """
+        instance = self.get_object()
+        etag, last_modified = instance_validators(request, instance)
+        return conditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
+    @query_budget(3)
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @query_budget(4)
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    @query_budget(5)
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """
         Set user_platform when creating a device.
@@ -57,10 +182,55 @@ class DeviceViewSet(viewsets.ModelViewSet):
         else:
             serializer.save()
 
-    @action(detail=False, methods=["get"])
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer],
+    )
+    @query_budget(2)
     def my_devices(self, request):
         """
         Custom endpoint to get current user's devices.
+        With `Accept: application/x-ndjson` or `?stream=1` the devices are
+        streamed in chunks instead of being serialized in memory; other
+        responses go through the per-user response cache. Conditional requests
+        are answered from the collection version stamp.
+        """
+        user_platform = request.user
+        if not isinstance(user_platform, UserPlatform):
+            return Response(
+                {"error": "Usuario no válido."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        devices = self.get_queryset()
+
+        ndjson = request.accepted_renderer.format == NDJSONRenderer.format
+        stream = ndjson or request.query_params.get("stream") in ("1", "true")
+
+        row_serializer = self.get_row_serializer()
+
+        def serialize():
+            if stream:
+                rows = row_serializer.iter_serialized(devices)
+                return streaming_response(rows, ndjson=ndjson)
+
+            return Response(row_serializer.serialize(row_serializer.get_queryset(devices)))
+
+        def build():
+            etag, last_modified = collection_validators(request, user_platform)
+            return conditional_response(request, etag, last_modified, serialize)
+
+        if stream:
+            return build()
+        return device_response_cache.respond(request, user_platform, build)
+
+    @action(detail=False, methods=["get"])
+    @query_budget(2)
+    def changes(self, request):
+        """
+        Delta sync: devices created or updated since ?since=<token>, ids of
+        devices deleted since then, and the token for the next call.
         """
         user_platform = request.user
         if not isinstance(user_platform, UserPlatform):
@@ -69,23 +239,341 @@ class DeviceViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        devices = Device.objects.filter(
-            user_platform=user_platform,
-            user_platform__platform=user_platform.platform,
+        changes = get_changes(self.get_queryset(), user_platform, request.query_params.get("since"))
+        row_serializer = self.get_row_serializer()
+        changed = row_serializer.get_queryset(changes["changed"])
+        return Response(
+            {
+                "token": changes["token"],
+                "reset": changes["reset"],
+                "changed": row_serializer.serialize(changed),
+                "deleted": changes["deleted"],
+            }
+        )
+
+    @action(detail=False, methods=["get"])
+    @query_budget(1)
+    def stats(self, request):
+        """
+        Total and active device counts of the user and of their platform,
+        read from the denormalized counters instead of COUNT(*) queries.
+        """
+        user_platform = request.user
+        if not isinstance(user_platform, UserPlatform):
+            return Response(
+                {"error": "Usuario no válido."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        counters = (
+            UserPlatform.objects.filter(pk=user_platform.pk)
+            .values(
+                "devices_total",
+                "devices_active",
+                "platform__devices_total",
+                "platform__devices_active",
+            )
+            .get()
+        )
+        return Response(
+            {
+                "user": {
+                    "total": counters["devices_total"],
+                    "active": counters["devices_active"],
+                },
+                "platform": {
+                    "total": counters["platform__devices_total"],
+                    "active": counters["platform__devices_active"],
+                },
+            }
+        )
+
+    @action(detail=False, methods=["get"])
+    @query_budget(2)
+    def reachability(self, request):
+        """
+        reachable and last_seen of the user's devices, with the list filters
+        and pagination. last_seen moves on every probe without notifying
+        clients, so it is kept out of the cached, ETag-validated and
+        delta-synced device representation and always read from the
+        database here.
+        """
+        user_platform = request.user
+        if not isinstance(user_platform, UserPlatform):
+            return Response(
+                {"error": "Usuario no válido."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Plus the owner columns and those keyset pages may be keyed on.
+        devices = self.filter_queryset(Device.objects.for_user_platform(user_platform)).only(
+            "reachable",
+            "last_seen",
+            "user_platform",
+            "platform",
+            "name",
+            "ip_int",
+            "created_at",
+            "updated_at",
+        )
+        page = self.paginate_queryset(devices)
+        return self.get_paginated_response(
+            [
+                {"id": device.pk, "reachable": device.reachable, "last_seen": device.last_seen}
+                for device in page
+            ]
         )
-        serializer = self.get_serializer(devices, many=True)
-        return Response(serializer.data)
 
     @action(detail=True, methods=["patch"])
+    @query_budget(3)
     def toggle_active(self, request, pk=None):
         """
-        Toggle device active status.
+        Toggle device active status with a single conditional UPDATE
+        returning the new row.
         """
-        device = self.get_object()
         user_platform = request.user
-        if isinstance(user_platform, UserPlatform):
-            device.updated_by = user_platform
-        device.is_active = not device.is_active
-        device.save()
+        if not isinstance(user_platform, UserPlatform):
+            user_platform = None
+        try:
+            devices = self.get_queryset().filter(pk=pk).toggle_active(updated_by=user_platform)
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        if not devices:
+            raise Http404
+        device = devices[0]
+        if user_platform is not None:
+            device.user_platform = user_platform
+            device.platform = user_platform.platform
         serializer = self.get_serializer(device)
         return Response(serializer.data)
+
+    @action(detail=False, methods=["post"])
+    @query_budget(3)
+    def set_active(self, request):
+        """
+        Activate or deactivate, in one UPDATE, every device matching the
+        current filters (?search=, ?cidr=, ?ip_from=/?ip_to=).
+        Returns the number of devices changed.
+        """
+        user_platform = request.user
+        if not isinstance(user_platform, UserPlatform):
+            return Response(
+                {"error": "Usuario no válido."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = DeviceSetActiveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = self.filter_queryset(self.get_queryset())
+        updated = queryset.set_active(
+            serializer.validated_data["is_active"], updated_by=user_platform
+        )
+        return Response({"updated": updated})
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_file(self, request):
+        """
+        Upsert devices from an uploaded CSV or JSON lines file (`file`,
+        optionally gzipped), matching existing devices on ?key=name (default)
+        or ?key=ip_address. The file is parsed and written in batches; invalid
+        rows are skipped and reported by row number.
+        """
+        user_platform = request.user
+        if not isinstance(user_platform, UserPlatform):
+            return Response(
+                {"error": "Usuario no válido."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": ["Se requiere un archivo."]})
+        file_format = request.query_params.get("format") or detect_format(upload.name)
+        if file_format not in IMPORT_FORMATS:
+            raise ValidationError(
+                {"format": [f"Formato no soportado. Opciones: {', '.join(IMPORT_FORMATS)}."]}
+            )
+        key = request.query_params.get("key", "name")
+        if key not in IMPORT_KEYS:
+            raise ValidationError(
+                {"key": [f"Clave no soportada. Opciones: {', '.join(IMPORT_KEYS)}."]}
+            )
+
+        records = iter_records(upload, file_format, compressed=upload.name.endswith(".gz"))
+        report = import_devices(
+            user_platform, records, key=key, context=self.get_serializer_context()
+        )
+        return Response(report.as_dict())
+
+    def get_bulk_items(self, request):
+        """
+        Return the list payload of a bulk request, enforcing the size limit.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({"detail": "Se esperaba una lista de dispositivos."})
+        max_items = getattr(settings, "DEVICES_BULK_MAX_ITEMS", 500)
+        if not items or len(items) > max_items:
+            raise ValidationError(
+                {"detail": f"Se permiten entre 1 y {max_items} dispositivos por petición."}
+            )
+        return items
+
+    @action(detail=False, methods=["post", "patch", "delete"])
+    def bulk(self, request):
+        """
+        Create (POST), update (PATCH, items with `id`) or delete (DELETE, list
+        of ids) many devices in one transaction. Validation errors are returned
+        per item, aligned with the request payload.
+        """
+        user_platform = request.user
+        if not isinstance(user_platform, UserPlatform):
+            return Response(
+                {"error": "Usuario no válido."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        items = self.get_bulk_items(request)
+        context = self.get_serializer_context()
+
+        if request.method == "DELETE":
+            deleted = bulk_delete_devices(self.get_queryset(), items)
+            return Response({"deleted": deleted})
+
+        if request.method == "PATCH":
+            devices = bulk_update_devices(self.get_queryset(), user_platform, items, context)
+            response_status = status.HTTP_200_OK
+        else:
+            devices = bulk_create_devices(user_platform, items, context)
+            response_status = status.HTTP_201_CREATED
+
+        for device in devices:
+            device.user_platform = user_platform
+        serializer = self.get_serializer(devices, many=True)
+        return Response(serializer.data, status=response_status)
+
+
+def authenticate_request(request):
+    """
+    Authenticate a plain Django request with the API's authentication classes.
+    Returns the UserPlatform or None.
+    """
+    authenticators = [cls() for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    try:
+        user = Request(request, authenticators=authenticators).user
+    except APIException:
+        return None
+    return user if isinstance(user, UserPlatform) else None
+
+
+async def device_events(request):
+    """
+    Server-Sent Events feed of the authenticated user's device changes
+    (created, updated, toggled, deleted). Async so an idle connection holds
+    no thread; serve the project under ASGI to use it.
+    """
+    if request.method != "GET":
+        return JsonResponse({"detail": "Método no permitido."}, status=405)
+    user_platform = await sync_to_async(authenticate_request)(request)
+    if user_platform is None:
+        return JsonResponse(
+            {"detail": "Las credenciales de autenticación no se proveyeron o no son válidas."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+
+    token = encode_token(timezone.now())
+    response = StreamingHttpResponse(
+        event_stream(get_event_broker(), user_platform.pk, token),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def staff_get_error(request):
+    """
+    Return the error response of a platform-wide staff endpoint for a
+    request that is not a GET from a staff user of the admin session, or None.
+    """
+    if request.method != "GET":
+        return JsonResponse({"detail": "Método no permitido."}, status=405)
+    if not request.user.is_authenticated:
+        return JsonResponse(
+            {"detail": "Las credenciales de autenticación no se proveyeron."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    if not request.user.is_staff:
+        return JsonResponse(
+            {"detail": "No tiene permiso para realizar esta acción."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    return None
+
+
+def export_platform_devices(request, platform_id):
+    """
+    Stream every device of a platform, across all its users, as CSV
+    (?format=csv, default) or JSON lines (?format=jsonl), optionally gzipped
+    (?gzip=1). Restricted to staff users authenticated with the admin session.
+    """
+    error = staff_get_error(request)
+    if error is not None:
+        return error
+
+    file_format = request.GET.get("format", "csv")
+    if file_format not in FORMATS:
+        return JsonResponse(
+            {"format": [f"Formato no soportado. Opciones: {', '.join(FORMATS)}."]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if not Platform.objects.filter(pk=platform_id).exists():
+        return JsonResponse({"detail": "No encontrado."}, status=status.HTTP_404_NOT_FOUND)
+
+    gzip = request.GET.get("gzip") in ("1", "true")
+    response = StreamingHttpResponse(
+        export_stream(platform_id, file_format, gzip=gzip),
+        content_type="application/gzip" if gzip else FORMATS[file_format][0],
+    )
+    filename = export_filename(platform_id, file_format, gzip=gzip)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def platform_ip_conflicts(request, platform_id):
+    """
+    Report the IP addresses shared by several devices of a platform, across
+    all its users, with the devices holding each one. At most ?limit=
+    (DEVICES_IP_CONFLICTS_LIMIT) addresses are listed. Restricted to staff
+    users authenticated with the admin session.
+    """
+    error = staff_get_error(request)
+    if error is not None:
+        return error
+
+    default_limit = getattr(settings, "DEVICES_IP_CONFLICTS_LIMIT", 1000)
+    try:
+        limit = int(request.GET.get("limit", default_limit))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= default_limit:
+        return JsonResponse(
+            {"limit": [f"Debe ser un número entre 1 y {default_limit}."]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    unique_device_ips = (
+        Platform.objects.filter(pk=platform_id).values_list("unique_device_ips", flat=True).first()
+    )
+    if unique_device_ips is None:
+        return JsonResponse({"detail": "No encontrado."}, status=status.HTTP_404_NOT_FOUND)
+
+    # One more than the limit tells whether the report was cut short.
+    conflicts = find_ip_conflicts(platform_id, limit=limit + 1)
+    return JsonResponse(
+        {
+            "platform_id": platform_id,
+            "unique_device_ips": unique_device_ips,
+            "truncated": len(conflicts) > limit,
+            "conflicts": conflicts[:limit],
+        }
+    )
@@ -12,10 +12,10 @@ class PlatformAdmin(admin.ModelAdmin):
     Admin configuration for Platform model.
     """
 
-    list_display = ["name", "description", "is_active", "created_at"]
-    list_filter = ["is_active", "created_at"]
+    list_display = ["name", "description", "is_active", "unique_device_ips", "created_at"]
+    list_filter = ["is_active", "unique_device_ips", "created_at"]
     search_fields = ["name", "description"]
-    readonly_fields = ["created_at", "updated_at", "created_by", "updated_by"]
+    readonly_fields = ["unique_device_ips", "created_at", "updated_at", "created_by", "updated_by"]
 
 
 @admin.register(UserPlatform)
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:49
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def backfill_devices_changed_at(apps, schema_editor):
+    UserPlatform = apps.get_model("platforms", "UserPlatform")
+    Device = apps.get_model("devices", "Device")
+    latest = (
+        Device.objects.filter(user_platform=OuterRef("pk"))
+        .order_by()
+        .values("user_platform")
+        .annotate(latest=Max("updated_at"))
+        .values("latest")
+    )
+    UserPlatform.objects.update(devices_changed_at=Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("devices", "0005_device_ip_int"),
+        ("platforms", "0002_alter_platform_created_by_alter_platform_updated_by_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userplatform",
+            name="devices_changed_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Última modificación de dispositivos",
+            ),
+        ),
+        migrations.AddField(
+            model_name="userplatform",
+            name="devices_version",
+            field=models.PositiveBigIntegerField(
+                default=0, editable=False, verbose_name="Versión de dispositivos"
+            ),
+        ),
+        migrations.RunPython(backfill_devices_changed_at, migrations.RunPython.noop),
+    ]
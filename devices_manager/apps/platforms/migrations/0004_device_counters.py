@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_device_counters(apps, schema_editor):
+    Device = apps.get_model("devices", "Device")
+    UserPlatform = apps.get_model("platforms", "UserPlatform")
+    Platform = apps.get_model("platforms", "Platform")
+
+    def count(outer_ref, active=False):
+        devices = Device.objects.filter(
+            Q(is_active=True) if active else Q(), **{outer_ref: OuterRef("pk")}
+        )
+        counts = devices.order_by().values(outer_ref).annotate(count=Count("pk")).values("count")
+        return Coalesce(Subquery(counts), Value(0))
+
+    for model, outer_ref in [
+        (UserPlatform, "user_platform"),
+        (Platform, "user_platform__platform"),
+    ]:
+        model.objects.update(
+            devices_total=count(outer_ref), devices_active=count(outer_ref, active=True)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("devices", "0006_devicetombstone"),
+        ("platforms", "0003_userplatform_devices_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="platform",
+            name="devices_active",
+            field=models.BigIntegerField(
+                default=0, editable=False, verbose_name="Dispositivos activos"
+            ),
+        ),
+        migrations.AddField(
+            model_name="platform",
+            name="devices_total",
+            field=models.BigIntegerField(default=0, editable=False, verbose_name="Dispositivos"),
+        ),
+        migrations.AddField(
+            model_name="userplatform",
+            name="devices_active",
+            field=models.BigIntegerField(
+                default=0, editable=False, verbose_name="Dispositivos activos"
+            ),
+        ),
+        migrations.AddField(
+            model_name="userplatform",
+            name="devices_total",
+            field=models.BigIntegerField(default=0, editable=False, verbose_name="Dispositivos"),
+        ),
+        migrations.RunPython(backfill_device_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("platforms", "0004_device_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="platform",
+            name="unique_device_ips",
+            field=models.BooleanField(
+                default=False, editable=False, verbose_name="IPs de dispositivos únicas"
+            ),
+        ),
+    ]
@@ -8,7 +8,37 @@ from django.core.validators import EmailValidator
 from django.db import models
 
 
-class Platform(BaseModel):
+class DeviceCountersModel(models.Model):
+    """
+    Abstract model with denormalized device counters.
+
+    The counters, and any other field listed in `denormalized_fields`, are
+    only changed with F() expressions when devices are written (see
+    apps.devices.signals), so save() never writes them back from a possibly
+    stale instance; reconcile_device_counters repairs any drift.
+    """
+
+    devices_total = models.BigIntegerField(default=0, editable=False, verbose_name="Dispositivos")
+    devices_active = models.BigIntegerField(
+        default=0, editable=False, verbose_name="Dispositivos activos"
+    )
+
+    denormalized_fields = {"devices_total", "devices_active"}
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.denormalized_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class Platform(BaseModel, DeviceCountersModel):
     """
     Platform model representing different platforms in the system.
     """
@@ -16,6 +46,11 @@ class Platform(BaseModel):
     name = models.CharField(max_length=100, unique=True, verbose_name="Nombre")
     description = models.TextField(blank=True, verbose_name="Descripción")
     is_active = models.BooleanField(default=True, verbose_name="Activa")
+    # Changed only through apps.devices.ip_conflicts.set_unique_device_ips,
+    # which copies it onto the platform's devices.
+    unique_device_ips = models.BooleanField(
+        default=False, editable=False, verbose_name="IPs de dispositivos únicas"
+    )
 
     class Meta:
         verbose_name = "Plataforma"
@@ -26,7 +61,7 @@ class Platform(BaseModel):
         return self.name
 
 
-class UserPlatform(BaseModel):
+class UserPlatform(BaseModel, DeviceCountersModel):
     """
     Relationship model between User and Platform.
     Allows the same user (email) to be registered in multiple platforms.
@@ -48,6 +83,18 @@ class UserPlatform(BaseModel):
     password = models.CharField(max_length=128, verbose_name="Contraseña")
     is_active = models.BooleanField(default=True, verbose_name="Activo")
     last_login = models.DateTimeField(null=True, blank=True, verbose_name="Último acceso")
+    devices_version = models.PositiveBigIntegerField(
+        default=0, editable=False, verbose_name="Versión de dispositivos"
+    )
+    devices_changed_at = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="Última modificación de dispositivos"
+    )
+
+    denormalized_fields = {
+        *DeviceCountersModel.denormalized_fields,
+        "devices_version",
+        "devices_changed_at",
+    }
 
     class Meta:
         verbose_name = "Usuario de Plataforma"
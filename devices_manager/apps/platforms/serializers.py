@@ -2,16 +2,25 @@
 Platform serializers.
 """
 
+from apps.core.fieldsets import SparseFieldsetSerializerMixin
 from apps.platforms.models import Platform
 from rest_framework import serializers
 
 
-class PlatformSerializer(serializers.ModelSerializer):
+class PlatformSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Platform model.
     """
 
     class Meta:
         model = Platform
-        fields = ["id", "name", "description", "is_active", "created_at", "updated_at"]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        fields = [
+            "id",
+            "name",
+            "description",
+            "is_active",
+            "unique_device_ips",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["id", "unique_device_ips", "created_at", "updated_at"]
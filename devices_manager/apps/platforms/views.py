@@ -2,17 +2,22 @@
 Platform views.
 """
 
+from apps.core.fieldsets import SparseFieldsetMixin
 from apps.platforms.models import Platform
 from apps.platforms.serializers import PlatformSerializer
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
 
 
-class PlatformViewSet(viewsets.ReadOnlyModelViewSet):
+class PlatformViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Platform model (read-only).
+    Supports ?fields= and ?omit= sparse fieldsets.
     """
 
     queryset = Platform.objects.filter(is_active=True)
     serializer_class = PlatformSerializer
     permission_classes = [AllowAny]
+
+    def get_queryset(self):
+        return self.prune_queryset(super().get_queryset())
@@ -2,6 +2,7 @@
 Base settings for devices_manager project.
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -89,9 +90,21 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# JSON is encoded and decoded with orjson when it is installed (stdlib json
+# otherwise); MessagePack (Accept: application/msgpack) is offered when msgpack
+# is installed
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": ("apps.authentication.backends.PlatformJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": (
+        "apps.core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_FILTER_BACKENDS": (
@@ -100,6 +113,9 @@ REST_FRAMEWORK = {
     ),
 }
 
+if find_spec("msgpack") is not None:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append("apps.core.renderers.MessagePackRenderer")
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
@@ -116,6 +132,100 @@ SIMPLE_JWT = {
     "USER_ID_CLAIM": "user_id",
 }
 
+# Principal cache used by PlatformJWTAuthentication (seconds / entries, 0 disables it)
+AUTH_PRINCIPAL_CACHE_TTL = 60
+AUTH_PRINCIPAL_CACHE_MAX_SIZE = 10000
+
+# Trusted claims mode: build principals from the JWT claims without a DB lookup.
+# Revocations propagate within AUTH_REVOCATION_REFRESH_INTERVAL seconds.
+AUTH_TRUSTED_CLAIMS = False
+AUTH_REVOCATION_REFRESH_INTERVAL = 30
+
+# Password hashing pool: worker processes (0 hashes inline), admitted hashes
+# before answering 503, seconds to wait for a hash and Retry-After value.
+AUTH_HASHING_WORKERS = 2
+AUTH_HASHING_MAX_PENDING = 16
+AUTH_HASHING_TIMEOUT = 10
+AUTH_HASHING_RETRY_AFTER = 1
+
+# last_login write-behind: seconds between flushes (0 writes on every login)
+# and users per UPDATE statement.
+AUTH_LAST_LOGIN_FLUSH_INTERVAL = 5
+AUTH_LAST_LOGIN_BATCH_SIZE = 500
+
+# Rows fetched per database round trip when streaming device collections
+DEVICES_STREAM_CHUNK_SIZE = 500
+
+# Rows per block (and per server-side cursor fetch) in device exports
+DEVICES_EXPORT_CHUNK_SIZE = 2000
+
+# Device ?search= backend: "auto" (FTS5 on SQLite, trigram-indexed icontains on
+# PostgreSQL) or the dotted path of a backend class
+DEVICES_SEARCH_BACKEND = "auto"
+
+# Maximum number of devices accepted by the bulk endpoints
+DEVICES_BULK_MAX_ITEMS = 500
+
+# Device file imports: rows validated and upserted per transaction, and row
+# errors kept in the import report
+DEVICES_IMPORT_BATCH_SIZE = 1000
+DEVICES_IMPORT_MAX_ERRORS = 1000
+
+# Delta sync: seconds re-scanned before each since token, and days tombstones
+# are kept (older tokens get a full resync)
+DEVICES_CHANGES_GRACE_PERIOD = 5
+DEVICES_TOMBSTONE_RETENTION_DAYS = 30
+
+# SSE device feed: broker class (LocalEventBroker for one process,
+# RedisEventBroker with DEVICES_EVENTS_REDIS_URL for several), queued events
+# per connection before it is told to resync, heartbeat seconds and client
+# reconnection delay
+DEVICES_EVENTS_BROKER = "apps.devices.events.LocalEventBroker"
+DEVICES_EVENTS_REDIS_URL = None
+DEVICES_EVENTS_REDIS_CHANNEL = "devices:events"
+DEVICES_EVENTS_MAX_QUEUE = 100
+DEVICES_EVENTS_HEARTBEAT = 15
+DEVICES_EVENTS_RETRY_MS = 3000
+
+# Reachability prober (manage.py probe_devices): TCP ports tried per device
+# (a refused connection also counts as reachable), seconds per probe, probes
+# in flight, devices per batch, seconds between probes of a reachable device
+# (doubled per consecutive failure up to the maximum) and seconds the worker
+# sleeps at most between passes
+DEVICES_PROBE_PORTS = [22, 80, 443]
+DEVICES_PROBE_TIMEOUT = 2
+DEVICES_PROBE_CONCURRENCY = 500
+DEVICES_PROBE_BATCH_SIZE = 2000
+DEVICES_PROBE_INTERVAL = 300
+DEVICES_PROBE_MAX_INTERVAL = 3600
+DEVICES_PROBE_POLL_INTERVAL = 30
+
+# Maximum number of duplicated IP addresses listed by a conflict report.
+DEVICES_IP_CONFLICTS_LIMIT = 1000
+
+# Local-memory cache for a single node; prod.py switches to Redis when
+# REDIS_URL is set so every node shares cache invalidations.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "devices-manager",
+        # The default 300 entries are soon culled once each user caches a
+        # few pages of responses.
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    }
+}
+
+# Per-user device response cache: cache alias, seconds an entry lives (0
+# disables it), lock lifetime and how long concurrent misses wait for the
+# request rebuilding an entry
+DEVICES_RESPONSE_CACHE_ALIAS = "default"
+DEVICES_RESPONSE_CACHE_TIMEOUT = 60
+DEVICES_RESPONSE_CACHE_LOCK_TIMEOUT = 10
+DEVICES_RESPONSE_CACHE_LOCK_WAIT = 2
+
+# Views decorated with @query_budget raise when over budget if strict, log otherwise
+QUERY_BUDGET_STRICT = False
+
 CORS_ALLOWED_ORIGINS = []
 CORS_ALLOW_CREDENTIALS = True
 
@@ -17,6 +17,8 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+QUERY_BUDGET_STRICT = True
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,